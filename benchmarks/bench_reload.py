@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        bench_reload
+# Purpose:     Замеры поиска изменённых модулей и перезагрузки на синтетическом
+#              дереве модулей
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Набор замеров для функций поиска и перезагрузки модулей.
+
+Скрипт генерирует синтетическое дерево, похожее на Proto: N модулей во
+вложенных пакетах, заданное число импортов из каждого модуля, модули-"ядра",
+которые импортируют все, циклические импорты, файлы в utf-8 и cp1251 (часть
+файлов cp1251 - без объявления кодировки, как старые скрипты Proto).
+Для каждой функции замеряется время, число открытых на чтение файлов и
+пиковое потребление памяти (tracemalloc).
+
+Скрипт работает без mebel.exe: пакет k3 подменяется заглушкой из
+tests/conftest.py.
+
+python benchmarks/bench_reload.py --modules 500 --fan-out 4 --cycles 10
+"""
+
+import argparse
+import builtins
+import contextlib
+import importlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+try:
+    import k3  # type: ignore # noqa: F401
+except ImportError:
+    # Заглушка k3 из тестов
+    sys.path.insert(0, os.path.join(ROOT_DIR, 'tests'))
+    import conftest  # noqa: F401
+
+from dev_reload_utilites import (auto_reload_manager, fingerprint, import_index, import_parser, journal,
+                                 source_reader)
+
+frp = importlib.import_module('dev_reload_utilites.find_recent_py_files')
+
+
+BenchResult = namedtuple('BenchResult', 'name seconds reads peak_kb')
+
+PACKAGE = 'bench_proto'
+
+
+# ------------------------------------------------------------------------------
+# Генерация дерева
+# ------------------------------------------------------------------------------
+
+def generate_tree(root_dir: str, modules: int = 200, fan_out: int = 3, hubs: int = 2,
+                  cycles: int = 5, depth: int = 3, cp1251_share: float = 0.3,
+                  seed: int = 0, no_cookie_share: float = 0.5) -> List[str]:
+    """
+    Сгенерировать синтетическое дерево модулей.
+
+    Args:
+        root_dir (str): Директория, в которой создаётся пакет PACKAGE
+        modules (int): Количество модулей
+        fan_out (int): Количество импортов из каждого модуля
+        hubs (int): Количество модулей-"ядер", которые импортирует каждый модуль (fan-in)
+        cycles (int): Количество циклических импортов
+        depth (int): Глубина вложенности пакетов
+        cp1251_share (float): Доля файлов в кодировке cp1251
+        seed (int): Начальное значение генератора случайных чисел
+        no_cookie_share (float): Доля файлов cp1251 без объявления кодировки.
+            Такие файлы (старые скрипты Proto) интерпретатор не импортирует, их
+            читают только поиск и разбор импортов, поэтому они получают имена
+            script_N, никем не импортируются и не входят в циклы
+
+    Returns:
+        List[str]: Имена модулей в порядке создания (ядра первыми)
+    """
+    rnd = random.Random(seed)
+    names = []
+    encodings = []
+    packages = set()
+    for i in range(modules):
+        level = i % (depth + 1)
+        parts = [PACKAGE] + [f'p{(i // (depth + 1) + k) % 4}_{k}' for k in range(level)]
+        for k in range(1, len(parts) + 1):
+            packages.add(tuple(parts[:k]))
+        encoding = 'cp1251' if rnd.random() < cp1251_share else 'utf-8'
+        script = encoding == 'cp1251' and i >= hubs and rnd.random() < no_cookie_share
+        encodings.append((encoding, not script))
+        names.append('.'.join(parts + [f'script_{i}' if script else f'mod_{i}']))
+    importable = [i for i, name in enumerate(names) if is_importable(name)]
+
+    for parts in packages:
+        pkg_dir = os.path.join(root_dir, *parts)
+        os.makedirs(pkg_dir, exist_ok=True)
+        with open(os.path.join(pkg_dir, '__init__.py'), 'w', encoding='utf-8') as f:
+            f.write('')
+
+    back_edges = {}
+    count = len(importable)
+    for _ in range(cycles):
+        if count < 2:
+            break
+        low = rnd.randrange(min(hubs, count - 1), count - 1) if count - 1 > hubs else 0
+        high = rnd.randrange(low + 1, count)
+        back_edges.setdefault(importable[low], []).append(importable[high])
+
+    for i, name in enumerate(names):
+        imports = set(names[:min(hubs, i)])
+        candidates = [candidate for candidate in names[hubs:i] if is_importable(candidate)]
+        if candidates:
+            imports.update(rnd.sample(candidates, min(fan_out, len(candidates))))
+        encoding, cookie = encodings[i]
+        lines = []
+        if encoding == 'cp1251' and cookie:
+            lines.append('# -*- coding: cp1251 -*-')
+        lines.append(f'"""Синтетический модуль {i} для замеров перезагрузки."""')
+        lines.extend(f'import {imported}' for imported in sorted(imports))
+        lines.append(f'VALUE = {i}')
+        lines.append('')
+        lines.append('def total():')
+        lines.append(f'    return VALUE + {len(imports)}')
+        for target in back_edges.get(i, ()):
+            # Обратное ребро внутри функции: цикл есть в графе, но не мешает импорту
+            lines.append('')
+            lines.append(f'def _cycle_{target}():')
+            lines.append(f'    import {names[target]}')
+            lines.append(f'    return {names[target]}.VALUE')
+        path = os.path.join(root_dir, *name.split('.')) + '.py'
+        with open(path, 'w', encoding=encoding) as f:
+            f.write('\n'.join(lines) + '\n')
+    return names
+
+
+def is_importable(name: str) -> bool:
+    """Можно ли импортировать модуль сгенерированного дерева (не скрипт cp1251 без объявления)."""
+    return not name.rpartition('.')[2].startswith('script_')
+
+
+# ------------------------------------------------------------------------------
+# Замеры
+# ------------------------------------------------------------------------------
+
+class _ReadCounter:
+    """Подсчёт файлов, открытых на чтение через builtins.open."""
+
+    def __init__(self):
+        self.reads = 0
+        self._original = builtins.open
+
+    def _open(self, file, mode='r', *args, **kwargs):
+        if 'r' in mode and not any(flag in mode for flag in 'wa+'):
+            self.reads += 1
+        return self._original(file, mode, *args, **kwargs)
+
+    def __enter__(self):
+        self.reads = 0
+        builtins.open = self._open
+        return self
+
+    def __exit__(self, *exc):
+        builtins.open = self._original
+
+
+def measure(name: str, func: Callable[[], object], setup: Optional[Callable[[], None]] = None,
+            memory: bool = True) -> BenchResult:
+    """
+    Замерить время, число прочитанных файлов и пиковую память одного вызова.
+
+    Время замеряется без tracemalloc, память - отдельным повторным вызовом.
+
+    Args:
+        name (str): Имя замера
+        func (Callable): Замеряемая функция
+        setup (Callable, optional): Подготовка состояния перед каждым вызовом
+        memory (bool): Замерять пиковую память
+
+    Returns:
+        BenchResult: Результат замера
+    """
+    sink = io.StringIO()
+    if setup is not None:
+        setup()
+    with contextlib.redirect_stdout(sink), _ReadCounter() as counter:
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+    peak_kb = 0.0
+    if memory:
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(sink):
+                func()
+            peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+    return BenchResult(name, seconds, counter.reads, peak_kb)
+
+
+def run_benchmarks(modules: int = 200, fan_out: int = 3, hubs: int = 2, cycles: int = 5,
+                   depth: int = 3, cp1251_share: float = 0.3, seed: int = 0,
+                   memory: bool = True, no_cookie_share: float = 0.5) -> List[BenchResult]:
+    """
+    Сгенерировать дерево и выполнить все замеры.
+
+    Returns:
+        List[BenchResult]: Результаты замеров
+    """
+    temp_dir = tempfile.mkdtemp(prefix='bench_reload_')
+    saved_index = import_index._index
+    saved_journal = journal._journal
+    saved_store = fingerprint._store
+    saved_snapshot_file = frp.SNAPSHOT_FILE
+    saved_snapshots = dict(frp._snapshots)
+    # Журнал перезагрузок и отпечатки файлов замеров не смешиваются с сеансом пользователя
+    journal._journal = journal.ReloadJournal(os.path.join(temp_dir, '.reload_journal'))
+    fingerprint._store = fingerprint.FingerprintStore()
+    sys.path.insert(0, temp_dir)
+    results = []
+    try:
+        names = generate_tree(temp_dir, modules, fan_out, hubs, cycles, depth, cp1251_share, seed,
+                              no_cookie_share)
+        root_dir = os.path.join(temp_dir, PACKAGE)
+        index_file = os.path.join(temp_dir, '.import_index')
+        frp.SNAPSHOT_FILE = os.path.join(temp_dir, '.dir_snapshot')
+
+        def cold_discovery():
+            frp._snapshots.clear()
+            if os.path.exists(frp.SNAPSHOT_FILE):
+                os.remove(frp.SNAPSHOT_FILE)
+
+        def cold_parse():
+            import_parser.clear_cache()
+            source_reader.clear_cache()
+
+        def cold_index():
+            cold_parse()
+            if os.path.exists(index_file):
+                os.remove(index_file)
+            import_index._index = import_index.ImportIndex(index_file)
+
+        results.append(measure('find_recent_py_files',
+                               lambda: frp.find_recent_py_files(root_dir), None, memory))
+        results.append(measure('find_recent_py_files (снимок, холодный)',
+                               lambda: frp.find_recent_py_files(root_dir, trust_dir_mtime=True),
+                               cold_discovery, memory))
+        results.append(measure('find_recent_py_files (снимок, тёплый)',
+                               lambda: frp.find_recent_py_files(root_dir, trust_dir_mtime=True),
+                               None, memory))
+        results.append(measure('get_import_names',
+                               lambda: frp.get_import_names(root_dir), None, memory))
+
+        paths = [path for path, _ in frp.iter_py_files(root_dir)]
+        results.append(measure('extract_imports (холодный)',
+                               lambda: [import_parser.extract_imports(path) for path in paths],
+                               cold_parse, memory))
+
+        for name in names:
+            if is_importable(name):
+                importlib.import_module(name)
+        hub = names[0]
+
+        results.append(measure('_find_dependent_modules (холодный)',
+                               lambda: auto_reload_manager._find_dependent_modules(hub),
+                               cold_index, memory))
+        results.append(measure('_find_dependent_modules (тёплый)',
+                               lambda: auto_reload_manager._find_dependent_modules(hub),
+                               None, memory))
+        results.append(measure('auto_reload_module',
+                               lambda: auto_reload_manager.auto_reload_module(hub, force=True),
+                               None, memory))
+        results.append(measure('reload_module_with_dependencies',
+                               lambda: auto_reload_manager.reload_module_with_dependencies(
+                                   PACKAGE, force=True),
+                               None, memory))
+        results.append(measure('selective_reload',
+                               lambda: auto_reload_manager.selective_reload(PACKAGE, force=True),
+                               None, memory))
+        results.append(measure('selective_reload (graph)',
+                               lambda: auto_reload_manager.selective_reload(
+                                   PACKAGE, force=True, order='graph'),
+                               None, memory))
+    finally:
+        sys.path.remove(temp_dir)
+        for name in [name for name in sys.modules if name.split('.')[0] == PACKAGE]:
+            del sys.modules[name]
+        import_index._index = saved_index
+        journal._journal = saved_journal
+        fingerprint._store = saved_store
+        frp.SNAPSHOT_FILE = saved_snapshot_file
+        frp._snapshots.clear()
+        frp._snapshots.update(saved_snapshots)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return results
+
+
+def format_results(results: List[BenchResult]) -> str:
+    """Оформить результаты замеров в виде таблицы."""
+    width = max(len(result.name) for result in results)
+    lines = [f"{'замер':<{width}}  {'время, мс':>10}  {'чтений':>7}  {'пик, КБ':>9}"]
+    for result in results:
+        lines.append(f"{result.name:<{width}}  {result.seconds * 1000:>10.1f}  "
+                     f"{result.reads:>7}  {result.peak_kb:>9.1f}")
+    return '\n'.join(lines)
+
+
+def main(argv: List[str] = None) -> Dict[str, dict]:
+    parser = argparse.ArgumentParser(description='Замеры поиска и перезагрузки модулей')
+    parser.add_argument('--modules', type=int, default=200, help='количество модулей')
+    parser.add_argument('--fan-out', type=int, default=3, help='импортов из каждого модуля')
+    parser.add_argument('--hubs', type=int, default=2, help='модулей, которые импортирует каждый')
+    parser.add_argument('--cycles', type=int, default=5, help='количество циклических импортов')
+    parser.add_argument('--depth', type=int, default=3, help='глубина вложенности пакетов')
+    parser.add_argument('--cp1251', type=float, default=0.3, help='доля файлов в cp1251')
+    parser.add_argument('--no-cookie', type=float, default=0.5,
+                        help='доля файлов cp1251 без объявления кодировки')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='не замерять память')
+    parser.add_argument('--json', action='store_true', help='вывести результаты в JSON')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.modules, args.fan_out, args.hubs, args.cycles, args.depth,
+                             args.cp1251, args.seed, not args.no_memory, args.no_cookie)
+    data = {result.name: result._asdict() for result in results}
+    if args.json:
+        print(json.dumps(data, ensure_ascii=False, indent=2))
+    else:
+        print(format_results(results))
+    return data
+
+
+if __name__ == '__main__':
+    main()
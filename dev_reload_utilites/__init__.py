@@ -1,34 +1,65 @@
 """
 dev_reload_utilites - Утилита для централизованного управления перезагрузкой модулей
 в приложении K3-Mebel 8.1.
-"""
 
-__version__ = "0.1.0"
-__author__ = "Aleksandr Dragunkin"
+Функции и классы пакета загружаются при первом обращении (PEP 562):
+импорт пакета не импортирует k3, loguru и механизм перезагрузки, поэтому
+модули поиска и графа зависимостей можно использовать вне mebel.exe.
 
-# Импортируем основные функции для удобного доступа
-from .auto_reload_manager import (
-    auto_reload_module,
-    reload_module_with_dependencies,
-    selective_reload,
-    SetVar,
-    Title,
-    WString
-)
+Функции поиска изменённых модулей импортируются сразу: функция
+find_recent_py_files называется так же, как её модуль, и после импорта
+любого подмодуля ленивый атрибут пакета был бы заменён самим модулем.
+"""
+
+import importlib
 
 from .find_recent_py_files import (
     find_recent_py_files,
-    get_import_names
+    get_import_names,
+    iter_import_names,
+    iter_recent_py_files,
 )
 
+__version__ = "0.1.0"
+__author__ = "Aleksandr Dragunkin"
+
+# Имя атрибута пакета -> модуль, из которого он загружается при первом обращении
+_LAZY_ATTRS = {
+    "auto_reload_module": "auto_reload_manager",
+    "reload_module_with_dependencies": "auto_reload_manager",
+    "selective_reload": "auto_reload_manager",
+    "estimate_strategies": "auto_reload_manager",
+    "ReloadValidationError": "validation",
+    "SetVar": "dialogs",
+    "Title": "dialogs",
+    "WString": "dialogs",
+}
+
 # Определяем, что будет доступно при импорте *
 __all__ = [
     "auto_reload_module",
     "reload_module_with_dependencies",
     "selective_reload",
+    "estimate_strategies",
+    "ReloadValidationError",
     "SetVar",
     "Title",
     "WString",
     "find_recent_py_files",
-    "get_import_names"
-]
\ No newline at end of file
+    "get_import_names",
+    "iter_recent_py_files",
+    "iter_import_names"
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+Запуск командной строки пакета: python -m dev_reload_utilites --help
+"""
+
+import sys
+
+from dev_reload_utilites.cli import main
+
+sys.exit(main())
@@ -28,228 +28,52 @@ __version__ = '0.1.00'
 - auto_reload_module: Перезагрузка модуля и его зависимостей
 - reload_module_with_dependencies: Перезагрузка модуля и зависимых от него модулей
 - selective_reload: Перезагрузка модулей по префиксу имени
+- estimate_strategies: План и оценка времени всех функций перезагрузки (dry_run)
 
-Классы для работы с диалогами:
+Классы для работы с диалогами (модуль dialogs):
 - SetVar: Основной класс для создания диалоговых окон
 - Title: Титульная часть диалога
 - WString: Виджет для ввода строк
+
+k3, loguru и классы диалогов загружаются при первом обращении, значения
+defModuleName и defReloadFunction читаются из файла тоже при первом
+обращении. Поэтому механизм перезагрузки можно импортировать вне mebel.exe.
 """
 
-from itertools import chain
 import os
 import pickle
 import sys
-import importlib
 
-import k3 # type: ignore
-from loguru import logger
+from dev_reload_utilites.fingerprint import get_fingerprint_store
 from dev_reload_utilites.find_recent_py_files import get_import_names
-
-
-
-class key:
-    """Ключи к3"""
-    left = k3.k_left
-    right = k3.k_right
-    center = k3.k_center
-    auto = k3.k_auto
-    size = k3.k_size
-    done = k3.k_done
-    lst = k3.k_list
-    listonly = k3.k_listonly
-    current = k3.k_current
-
-
-class _Children:
-    """Класс для наследования.
-    Реализует атрибут children у наследников.
-
-    При присвоении атрибута children удаляет из последовательностей _children None
-    """
-
-    def __init__(self):
-        self._children = []
-
-    @property
-    def children(self):
-        return self._children
-
-    @children.setter
-    def children(self, items):
-        self._children.extend(chain(*items))
-        self._children = tuple(child for child in self._children if child is not None)
-
-    def __iter__(self):
-        return iter(self._children)
-
-
-class Title(_Children):
-    """Титульная часть диалога
-    ____________________________
-
-
-    Именованные аргументы:
-
-     - title - <str> заголовок окна
-     - picfile - <str> Путь к файлу рисунка
-     - pos - <key.left,key.right,key.center> вариант позиционирования текста по умолчанию слева.
-
-    Далее последовательность строк подсказки
-
-    t = Title('Ввод параметров', 'Параметры:', pos=key.left)
-    print(t.children)
-    t = Title('Ввод параметров', 'Параметры:')
-    print(t.children)
-    t = Title('Ввод параметров', 'Параметры:', 'Ещё какая то строка',
-                picfile=r'c:\PKM74\Data\PKM\Pictures\1 вариант.jpg',
-                pos=key.right)
-    print(t.children)
-    for e in t:
-        print(e)
-
-    >>>('Ввод параметров', 'Параметры:', <Ключ: done(17002)>)
-       ('Ввод параметров', 'Параметры:', <Ключ: done(17002)>)
-       ('Ввод параметров', 'c:\\PKM74\\Data\\PKM\\Pictures\\1 вариант.jpg', 'Параметры:', 'Ещё какая то строка', <Ключ: done(17002)>)
-       Ввод параметров
-       c:\PKM74\Data\PKM\Pictures\1 вариант.jpg
-       Параметры:
-       Ещё какая то строка
-       <Ключ: done(17002)>
-
-    """
-
-    def __init__(self, title, *w,
-                 picfile="",
-                 pos=None):
-
-        super(Title, self).__init__()
-
-        if isinstance(pos, k3.Keyword):
-            if len(w):
-                tuple(chain((pos, ), (w, )))
-
-        self.children = (title, picfile, ), w, (key.done, )
-
-
-class DialogWidget(_Children):
-
-    def __init__(self):
-        super(DialogWidget, self).__init__()
-        self._value = k3.Var()
-
-    @property
-    def value(self):
-        return self._value
-
-
-class WString(DialogWidget):
-    def __init__(self, prompt, *v, defval=None, size=key.auto, lst=None):
-
-        super(WString, self).__init__()
-        self._size = size
-        self.default = defval
-
-        if v:
-            if lst is None:
-                self._children = (k3.k_string, self.size,
-                                  k3.k_default, self.default, key.lst, v, k3.k_done,
-                                  prompt, self._value,
-                                  )
-            else:
-                i_current = v.index(lst)
-                if i_current:
-                    v = list(v)
-                    v.insert(i_current, key.current)
-                self._children = (k3.k_string, self.size,
-                                  key.listonly, v, k3.k_done,
-                                  prompt, self._value,
-                                  )
-
-        else:
-            self._children = (k3.k_string, self.size,
-                              k3.k_default, self.default,
-                              prompt, self._value,
-                              )
-
-    @property
-    def size(self):
-        if isinstance(self._size, (int, float)):
-            return (key.size, self._size)
-        else:
-            if isinstance(self._size, k3.Keyword):
-                return self._size
-            else:
-                if self._size > 120:
-                    self._size = 120
-                elif self._size <1:
-                    self._size = 1
-            return self._size
-
-    @property
-    def value(self):
-        return self._value.value
-
-
-class SetVar(_Children):
-    """Ввод параметров в диалоговом окне
-    _____________________________________
-
-    example:
-
-    >>>
-       dlg = SetVar()
-       dlg.promt = Title('Введите парметры', 'Параметры:')
-       dlg.widgets.extend([
-           WDigit('Введите число', defval=100),
-           WDigit('Выберите число', 1, 2, 3, 4, 5, defval=100),
-           WDigit('Выберите число', 100, 200, 300, 400, 500, lst=300),
-           WBool('Риторический вопрос', defval=True),
-           WString('Строку введите пожлста', defval='fff'),
-           WString('Выберите строку пожалуйста', 'раз', 'два', 'три', defval='fff'),
-           WString('Выберите строку пожалуйста', 'раз', 'два', 'три', lst='два'),
-           WGuidesLismat(f'Выберите направляющую',prop_ ='guide',id_ = 10622,defvalue = 21050)
-       ])
-       res = dlg.view()
-       for w in dlg.widgets:
-           print(w.value)
-
-    """
-
-    def __init__(self):
-        super(SetVar, self).__init__()
-        self.promt = None
-        self.widgets = []
-        pass
-
-    def view(self):
-        """Отображает  диалог с именем name и структурой widget.lst_params
-        на экране. """
-        self.children = self.widgets
-        ok_flag = k3.setvar(
-            self.promt.children,
-            self.children,
-            k3.k_done)
-        self.ok_flag = ok_flag[0]
-        return ok_flag[0]
-
-    @property
-    def value(self):
-        res = []
-        for w in self.widgets:
-            if isinstance(w.value, k3.Var):
-                res.append(w.value.value)
-            else:
-                res.append(w.value)
-        return res
-
+from dev_reload_utilites.import_index import get_index
+from dev_reload_utilites.memory_guard import configure_memory_guard, get_memory_guard, memory_guard
+from dev_reload_utilites.module_graph import get_module_graph
+from dev_reload_utilites.patcher import reference_patching
+from dev_reload_utilites.profiler import ReloadProfiler
+from dev_reload_utilites.reload_planner import (
+    ReloadEstimate,
+    dependency_closure,
+    execute_plan,
+    order_modules,
+    plan_reload,
+)
+from dev_reload_utilites.scan_scope import get_scan_scope
+from dev_reload_utilites.transaction import reload_transaction
+from dev_reload_utilites.validation import validate_batch
+
+
+# Имена, загружаемые из модуля dialogs при первом обращении (импортирует k3)
+_DIALOG_NAMES = ('key', 'SetVar', 'Title', 'WString', 'DialogWidget', '_Children')
 
 
 def _find_dependent_modules(module_name):
     """
     Найти все модули, которые зависят от указанного модуля.
     
-    Эта функция сканирует все загруженные модули и проверяет их содержимое
-    на наличие импортов указанного модуля. Поддерживаются различные кодировки файлов.
+    Зависимости берутся из обратного индекса импортов (import_index). Индекс
+    сохраняется на диск и обновляется только для файлов, у которых изменились
+    время модификации или размер, поэтому повторный вызов почти не читает файлы.
     
     Args:
         module_name (str): Имя модуля, для которого нужно найти зависимости
@@ -257,150 +81,329 @@ def _find_dependent_modules(module_name):
     Returns:
         list: Список имен модулей, которые зависят от указанного модуля
     """
-    dependent_modules = []
-    for name, module in sys.modules.items():
-        if hasattr(module, '__file__') and module.__file__:
-            try:
-                # Попробуем сначала UTF-8, затем другие кодировки
-                encodings = ['utf-8', 'cp1251', 'latin1']
-                content = None
-                for encoding in encodings:
-                    try:
-                        with open(module.__file__, 'r', encoding=encoding) as f:
-                            content = f.read()
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                
-                # Если ни одна кодировка не сработала, пропускаем файл
-                if content is None:
-                    continue
-                    
-                if f'import {module_name}' in content or f'from {module_name}' in content:
-                    dependent_modules.append(name)
-            except (IOError, OSError):
-                pass
-    return dependent_modules
+    index = get_index()
+    index.refresh()
+    index.save()
+    return index.dependents(module_name)
 
 
 def _get_package_dependencies(package):
-    assert(hasattr(package, "__package__"))
-    fn = package.__file__
-    fn_dir = os.path.dirname(fn) + os.sep
-    node_set = {fn}  # набор имен файлов модулей
-    node_depth_dict = {fn:0} # отслеживает наибольшую глубину, которую мы видели для каждого узла
-    node_pkg_dict = {fn:package} # сопоставление имен файлов модуля с объектами модуля
-    link_set = set() # кортеж (имя файла родительского модуля, имя файла дочернего модуля)
-    del fn
-
-    def dependency_traversal_recursive(module, depth):
-        for module_child in vars(module).values():
-
-            # skip anything that isn't a module
-            if not isinstance(module_child, types.ModuleType):
-                continue
-
-            fn_child = getattr(module_child, "__file__", None)
-
-            # пропустить что-либо без имени файла или вне пакета
-            if (fn_child is None) or (not fn_child.startswith(fn_dir)):
-                continue
-
-            # мы видели этот модуль раньше? если нет, то добавьте в базу
-            if not fn_child in node_set:
-                node_set.add(fn_child)
-                node_depth_dict[fn_child] = depth
-                node_pkg_dict[fn_child] = module_child
-
-            # установите глубину как самую глубокую глубину, с которой мы столкнулись в узле
-            node_depth_dict[fn_child] = max(depth, node_depth_dict[fn_child])
-
-            # посещали ли мы этот дочерний модуль из этого родительского модуля раньше?
-            if not ((module.__file__, fn_child) in link_set):
-                link_set.add((module.__file__, fn_child))
-                dependency_traversal_recursive(module_child, depth+1)
-            else:
-                print(f"В графе зависимостей {module_child} обнаружен цикл!")
-                continue
+    """
+    Найти модули пакета, на которые ссылается package, и их глубину.
+    
+    Используется общий для сеанса граф модулей (module_graph.ModuleGraph),
+    поэтому повторный вызов не обходит пространства имён модулей заново.
+    
+    Args:
+        package (module): Корневой модуль или пакет
+        
+    Returns:
+        tuple: (имя файла -> модуль, имя файла -> глубина)
+    """
+    return get_module_graph().package_dependencies(package)
 
-                # raise ValueError("В графе зависимостей обнаружен цикл!")
 
+def _auto_reload_plan(module_name, force):
+    """План auto_reload_module или None, если модуль не изменился."""
+    module = sys.modules.get(module_name)
+    if force or module is None or get_fingerprint_store().is_module_dirty(module):
+        return plan_reload(module_name)
+    return None
 
-def auto_reload_module(module_name):
+def auto_reload_module(module_name, force=False, log=False, dry_run=False, transactional=False,
+                       patch_references=False):
     """
     Автоматически перезагрузить модуль и все его зависимости.
     
-    Эта функция перезагружает указанный модуль, а затем находит и перезагружает
-    все модули, которые зависят от него. Это обеспечивает целостную перезагрузку
-    модуля со всеми его зависимостями.
+    Эта функция перезагружает указанный модуль, а затем все модули, которые
+    зависят от него прямо или косвенно. Каждый модуль перезагружается ровно
+    один раз, поставщики раньше потребителей, а циклические импорты
+    перезагружаются единым шагом (см. reload_planner.plan_reload).
+    
+    Если содержимое файла модуля не изменилось с последней перезагрузки
+    (изменилось только время модификации), перезагрузка пропускается.
     
     Args:
         module_name (str): Имя модуля для перезагрузки
+        force (bool): Перезагрузить, даже если содержимое файла не изменилось
+        log (bool): Записать сводку отчёта через loguru
+        dry_run (bool): Только построить план и оценить время, ничего не перезагружая
+        transactional (bool): При ошибке восстановить пространства имён всех
+            модулей пакета (transaction.ReloadTransaction) и пробросить ошибку
+        patch_references (bool): После успешной перезагрузки обновить живые
+            экземпляры старых классов и код старых функций (patcher)
+        
+    Returns:
+        ReloadReport: Отчёт о перезагрузке с замерами времени
+            (ReloadEstimate при dry_run=True)
+        
+    Raises:
+        ReloadValidationError: Если в модулях пакета есть синтаксические ошибки.
+            В этом случае ни один модуль не перезагружается.
     """
-    # Сначала перезагружаем сам модуль
-    if module_name in sys.modules:
-        importlib.reload(sys.modules[module_name])
-        print(f"Перезагружен модуль {module_name}")
-    
-    # Находим и перезагружаем все зависимые модули
-    dependent_modules = _find_dependent_modules(module_name)
-    for dep_module in dependent_modules:
-        if dep_module in sys.modules:
-            importlib.reload(sys.modules[dep_module])
-            print(f"Перезагружен зависимый модуль {dep_module}")
-
-def reload_module_with_dependencies(module_name):
+    if dry_run:
+        plan = _auto_reload_plan(module_name, force)
+        return ReloadEstimate('auto_reload_module', module_name,
+                              plan.modules if plan is not None else (), plan is None)
+    profiler = ReloadProfiler('auto_reload_module', module_name, log)
+    try:
+        with profiler.discovery():
+            plan = _auto_reload_plan(module_name, force)
+        if plan is not None:
+            execute_plan(plan, profiler, transactional, patch_references)
+        else:
+            print(f"Модуль {module_name} не изменился, перезагрузка не требуется")
+            profiler.skip()
+    finally:
+        profiler.finish()
+    return profiler.report
+
+def reload_module_with_dependencies(module_name, force=False, log=False, dry_run=False,
+                                    transactional=False, patch_references=False):
     """
     Перезагрузить модуль и все модули, которые зависят от него.
     
-    Другой вариант auto_reload_module. Эта функция перезагружает указанный модуль,
-    а затем находит и перезагружает все модули, которые зависят от него.
-    Отличие от auto_reload_module в том, что она использует функцию
-    _get_package_dependencies для определения зависимостей.
+    Другой вариант auto_reload_module. Эта функция обходит граф ссылок
+    между модулями пакета (_get_package_dependencies) и перезагружает
+    модули от самых глубоких к корневому. После перезагрузки узел графа
+    сбрасывается, остальная часть графа используется повторно.
+    
+    Если содержимое ни одного файла пакета не изменилось с последней
+    перезагрузки, перезагрузка пропускается.
     
     Args:
         module_name (str): Имя модуля для перезагрузки
+        force (bool): Перезагрузить, даже если содержимое файлов не изменилось
+        log (bool): Записать сводку отчёта через loguru
+        dry_run (bool): Только построить план и оценить время, ничего не перезагружая
+        transactional (bool): При ошибке восстановить пространства имён всех
+            модулей пакета (transaction.ReloadTransaction) и пробросить ошибку
+        patch_references (bool): После успешной перезагрузки обновить живые
+            экземпляры старых классов и код старых функций (patcher)
+        
+    Returns:
+        ReloadReport: Отчёт о перезагрузке с замерами времени
+            (ReloadEstimate при dry_run=True)
+        
+    Raises:
+        ReloadValidationError: Если в модулях пакета есть синтаксические ошибки.
+            В этом случае ни один модуль не перезагружается.
     """
-    # Если модуль загружен, перезагружаем его
-    if module_name in sys.modules:
-        module = sys.modules[module_name]
-        # Получаем зависимости модуля
-        try:
-            node_pkg_dict, node_depth_dict = _get_package_dependencies(module)
-            # Перезагружаем в обратном порядке
-            for (d, v) in sorted([(d, v) for v, d in node_depth_dict.items()], reverse=True):
-                if v in node_pkg_dict:
-                    importlib.reload(node_pkg_dict[v])
-                    print(f"Перезагружен {v}")
-        except:
-            # Если не удалось получить зависимости, просто перезагружаем модуль
-            importlib.reload(module)
-            print(f"Перезагружен модуль {module_name}")
-
-def selective_reload(module_name_prefix):
+    if dry_run:
+        order = []
+        if module_name in sys.modules:
+            module = sys.modules[module_name]
+            try:
+                order = _package_reload_order(module, force)
+            except Exception:
+                order = [(module.__file__, module)]
+        return ReloadEstimate('reload_module_with_dependencies', module_name,
+                              [m.__name__ for _, m in order or ()], order is None)
+    profiler = ReloadProfiler('reload_module_with_dependencies', module_name, log)
+    try:
+        # Если модуль загружен, перезагружаем его
+        if module_name in sys.modules:
+            _reload_package_modules(module_name, force, profiler, transactional, patch_references)
+    finally:
+        profiler.finish()
+    return profiler.report
+
+def _package_reload_order(module, force):
     """
-    Перезагрузить все модули с указанным префиксом.
+    Модули пакета в порядке перезагрузки: от самых глубоких к корневому.
     
-    Механизм полной очистки кэша импортов. Можно адаптировать его для перезагрузки
-    только определенных модулей, которые начинаются с указанного префикса.
+    Returns:
+        list: Пары (имя файла, модуль) или None, если ни один файл не изменился
+    """
+    store = get_fingerprint_store()
+    node_pkg_dict, node_depth_dict = _get_package_dependencies(module)
+    if not (force or any(store.is_module_dirty(m) for m in node_pkg_dict.values())):
+        return None
+    return [(v, node_pkg_dict[v])
+            for (d, v) in sorted([(d, v) for v, d in node_depth_dict.items()], reverse=True)
+            if v in node_pkg_dict]
+
+def _reload_package_modules(module_name, force, profiler, transactional=False,
+                            patch_references=False):
+    module = sys.modules[module_name]
+    graph = get_module_graph()
+    store = get_fingerprint_store()
+    # Получаем зависимости модуля
+    try:
+        with profiler.discovery():
+            order = _package_reload_order(module, force)
+    except Exception as e:
+        # Если не удалось получить зависимости, просто перезагружаем модуль
+        print(f"Не удалось получить зависимости модуля {module_name}: {e}")
+        validate_batch([module], profiler)
+        with memory_guard([module], profiler), \
+                reference_patching([module], patch_references), \
+                reload_transaction([module], transactional, profiler):
+            profiler.reload(module)
+        graph.invalidate(module_name)
+        store.mark_modules_clean([module])
+        print(f"Перезагружен модуль {module_name}")
+        return
+    if order is None:
+        print(f"Модуль {module_name} и его зависимости не изменились, перезагрузка не требуется")
+        profiler.skip()
+        return
+    modules = [m for _, m in order]
+    validate_batch(modules, profiler)
+    # Перезагружаем в обратном порядке
+    with memory_guard(modules, profiler), \
+            reference_patching(modules, patch_references), \
+            reload_transaction(modules, transactional, profiler):
+        for v, m in order:
+            profiler.reload(m)
+            graph.invalidate(m.__name__)
+            store.mark_modules_clean([m])
+            print(f"Перезагружен {v}")
+
+def _graph_ordered_modules(modules, force, store):
+    """
+    Выбрать модули для перезагрузки по префиксу и упорядочить их по графу импортов.
+    
+    Выбираются изменённые модули и модули набора, зависящие от них прямо
+    или косвенно (в том числе через модули вне набора). Поставщики идут
+    раньше потребителей, циклические импорты стоят рядом.
     
     Args:
-        module_name_prefix (str): Префикс имени модулей для перезагрузки
+        modules (dict): Имя модуля -> модуль для всех модулей с префиксом
+        force (bool): Выбрать все модули набора
+        store (FingerprintStore): Хранилище отпечатков
+        
+    Returns:
+        list: Пары (имя модуля, модуль) в порядке перезагрузки
+    """
+    index = get_index()
+    index.refresh()
+    index.save()
+    if force:
+        dirty = set(modules)
+        selected = dirty
+    else:
+        dirty = {name for name, module in modules.items() if store.is_module_dirty(module)}
+        selected = dependency_closure(dirty, index) & set(modules) if dirty else set()
+    return [(name, modules[name])
+            for group in order_modules(selected, index, dirty)
+            for name in group]
+
+def _prefix_reload_order(module_name_prefix, force, order):
     """
+    Модули с префиксом в порядке перезагрузки.
+    
+    Returns:
+        tuple: (список пар (имя модуля, модуль), нужна ли перезагрузка)
+    """
+    store = get_fingerprint_store()
     modules_to_reload = []
-    for module_name, module in sys.modules.items():
+    for module_name, module in get_scan_scope().iter_modules():
         if module_name.startswith(module_name_prefix):
             modules_to_reload.append((module_name, module))
     
-    # Сортируем по имени модуля для обеспечения правильного порядка перезагрузки
+    if order == 'graph':
+        modules_to_reload = _graph_ordered_modules(dict(modules_to_reload), force, store)
+        return modules_to_reload, bool(modules_to_reload)
+    
+    changed = force or not modules_to_reload \
+        or any(store.is_module_dirty(module) for _, module in modules_to_reload)
+    # Сортируем по имени модуля
     modules_to_reload.sort()
+    return modules_to_reload, changed
+
+def selective_reload(module_name_prefix, force=False, log=False, order='name', dry_run=False,
+                     transactional=False, patch_references=False):
+    """
+    Перезагрузить все модули с указанным префиксом.
     
-    for module_name, module in modules_to_reload:
-        try:
-            importlib.reload(module)
-            print(f"Перезагружен модуль {module_name}")
-        except Exception as e:
-            print(f"Ошибка перезагрузки модуля {module_name}: {e}")
+    Механизм полной очистки кэша импортов. Можно адаптировать его для перезагрузки
+    только определенных модулей, которые начинаются с указанного префикса.
+    Рассматриваются только модули пользовательского кода (см. scan_scope).
+    
+    По умолчанию (order='name') перезагружаются все модули набора в
+    алфавитном порядке, как в первой версии пакета. В режиме order='graph'
+    перезагружаются только изменённые модули и зависящие от них модули
+    набора, поставщики раньше потребителей, за один проход. Если содержимое
+    ни одного из модулей не изменилось с последней перезагрузки,
+    перезагрузка пропускается.
+    
+    Args:
+        module_name_prefix (str): Префикс имени модулей для перезагрузки
+        force (bool): Перезагрузить, даже если содержимое файлов не изменилось
+        log (bool): Записать сводку отчёта через loguru
+        order (str): Порядок перезагрузки: 'name' (по умолчанию) или 'graph'
+        dry_run (bool): Только построить план и оценить время, ничего не перезагружая
+        transactional (bool): При ошибке восстановить пространства имён всех
+            модулей пакета (transaction.ReloadTransaction) и пробросить ошибку
+        patch_references (bool): После успешной перезагрузки обновить живые
+            экземпляры старых классов и код старых функций (patcher)
+        
+    Returns:
+        ReloadReport: Отчёт о перезагрузке с замерами времени
+            (ReloadEstimate при dry_run=True)
+        
+    Raises:
+        ReloadValidationError: Если в модулях пакета есть синтаксические ошибки.
+            В этом случае ни один модуль не перезагружается.
+    """
+    if order not in ('graph', 'name'):
+        raise ValueError(f"Неизвестный порядок перезагрузки: {order}")
+    if dry_run:
+        modules_to_reload, changed = _prefix_reload_order(module_name_prefix, force, order)
+        return ReloadEstimate('selective_reload', module_name_prefix,
+                              [name for name, _ in modules_to_reload] if changed else (),
+                              not changed)
+    profiler = ReloadProfiler('selective_reload', module_name_prefix, log)
+    graph = get_module_graph()
+    store = get_fingerprint_store()
+    try:
+        with profiler.discovery():
+            modules_to_reload, changed = _prefix_reload_order(module_name_prefix, force, order)
+        
+        if not changed:
+            print(f"Модули {module_name_prefix}* не изменились, перезагрузка не требуется")
+            profiler.skip()
+            return profiler.report
+        
+        modules = [module for _, module in modules_to_reload]
+        validate_batch(modules, profiler)
+        with memory_guard(modules, profiler), \
+                reference_patching(modules, patch_references), \
+                reload_transaction(modules, transactional, profiler):
+            for module_name, module in modules_to_reload:
+                try:
+                    profiler.reload(module, module_name)
+                    graph.invalidate(module_name)
+                    store.mark_modules_clean([module])
+                    print(f"Перезагружен модуль {module_name}")
+                except Exception as e:
+                    print(f"Ошибка перезагрузки модуля {module_name}: {e}")
+                    if transactional:
+                        raise
+    finally:
+        profiler.finish()
+    return profiler.report
+
+def estimate_strategies(module_name, force=False, order='name'):
+    """
+    Оценить все функции перезагрузки для модуля, ничего не перезагружая.
+    
+    Args:
+        module_name (str): Имя модуля (для selective_reload - префикс)
+        force (bool): Оценить перезагрузку, даже если содержимое файлов не изменилось
+        order (str): Порядок перезагрузки selective_reload: 'name' или 'graph'
+        
+    Returns:
+        list: ReloadEstimate для auto_reload_module, reload_module_with_dependencies
+            и selective_reload
+    """
+    return [auto_reload_module(module_name, force, dry_run=True),
+            reload_module_with_dependencies(module_name, force, dry_run=True),
+            selective_reload(module_name, force, order=order, dry_run=True)]
+
+# Сколько самых "молодых" модулей предлагать в диалоге
+DIALOG_MODULES_LIMIT = 15
 
 # Файл для сохранения последнего значения defModuleName и def_reload_fun
 DEF_MODULE_NAME_FILE = os.path.join(os.path.dirname(__file__), '.def_module_name')
@@ -446,10 +449,28 @@ def load_def_module_name():
         print(f"Ошибка загрузки defModuleName: {e}")
     return ('MyModule', 'auto_reload_module')  # Значения по умолчанию
 
-# Загружаем имя модуля и имя функции перезагрузки
-defModuleData = load_def_module_name()
-defModuleName = defModuleData[0]
-defReloadFunction = defModuleData[1]
+
+def __getattr__(name):
+    """
+    Ленивые атрибуты модуля (PEP 562).
+
+    Классы диалогов импортируются из dialogs (вместе с k3), значения
+    defModuleData, defModuleName и defReloadFunction читаются из
+    DEF_MODULE_NAME_FILE. Загруженное значение сохраняется в модуле.
+    """
+    if name in _DIALOG_NAMES:
+        from dev_reload_utilites import dialogs
+        value = getattr(dialogs, name)
+    elif name in ('defModuleData', 'defModuleName', 'defReloadFunction'):
+        data = globals().get('defModuleData')
+        if data is None:
+            data = globals()['defModuleData'] = load_def_module_name()
+        value = {'defModuleData': data, 'defModuleName': data[0], 'defReloadFunction': data[1]}[name]
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
 
 def safe_call_local(function_name, *args, **kwargs):
     """
@@ -481,10 +502,33 @@ def safe_call_local(function_name, *args, **kwargs):
         raise NameError(f"Функция {function_name} не найдена")
 
 if __name__ == '__main__':
+    from loguru import logger
+    from dev_reload_utilites.dialogs import SetVar, Title, WString
+    from dev_reload_utilites.watcher import get_watcher
+
+    # Загружаем имя модуля и имя функции перезагрузки
+    defModuleName, defReloadFunction = load_def_module_name()
     reload_functions =('auto_reload_module', 'reload_module_with_dependencies', 'selective_reload')
-    import_names = get_import_names(minutes=30)
+    # Диалог перезагружает модули по префиксу в порядке графа зависимостей
+    selective_order = 'graph'
+    watcher = get_watcher()
+    if watcher is not None:
+        # Поток отслеживания уже знает изменённые модули, обход директории не нужен
+        import_names = watcher.recent_import_names(minutes=30, limit=DIALOG_MODULES_LIMIT)
+    else:
+        import_names = get_import_names(minutes=30, limit=DIALOG_MODULES_LIMIT, changed_only=True)
     print(f"\nИмена модулей для импорта: {import_names}")
 
+    # Оценка функций перезагрузки для модуля по умолчанию
+    estimates = []
+    if import_names:
+        defModuleName = import_names[0]
+    if defModuleName in sys.modules:
+        try:
+            estimates = [estimate.header() for estimate in estimate_strategies(defModuleName, order=selective_order)]
+        except Exception as e:
+            print(f'Не удалось оценить перезагрузку {defModuleName}: {e}')
+
     dlg = SetVar()
     dlg.promt = Title('Централизованный механизм перезагрузки',
                       'Автоматически перезагружает модуль и все','его зависимости','...',
@@ -492,27 +536,52 @@ if __name__ == '__main__':
                       'По умалчанию показан самый "молодой" модуль из списка.',
                       'Выберите при необходимости другой модуль для перезагрузки.',
                       'Во втором поле можно выбрать функцию перезагрузки.', 
-                      'Если нет острой необходимости оставьте значение по умолчанию auto_reload_module.')
-    if import_names:
-        defModuleName = import_names[0]
+                      'Если нет острой необходимости оставьте значение по умолчанию auto_reload_module.',
+                      *([f'Оценка для {defModuleName}:'] + estimates if estimates else []))
     dlg.widgets.extend([
         WString('Выберите имя модуля:', *import_names, lst=defModuleName),
         WString('Укажите функцию перезагрузки:', *reload_functions, lst=defReloadFunction),
+        WString('Показать план перед перезагрузкой:', 'нет', 'да', lst='нет'),
+        WString('Контроль памяти:', 'нет', 'да', lst='да' if get_memory_guard().enabled else 'нет'),
     ])
     res = dlg.view()
     defModuleName = dlg.widgets[0].value
     defReloadFunction = dlg.widgets[1].value
+    options = {'order': selective_order} if defReloadFunction == 'selective_reload' else {}
+    use_memory_guard = dlg.widgets[3].value == 'да'
+    if res and dlg.widgets[2].value == 'да':
+        # План выбранной функции: порядок модулей и последнее время перезагрузки
+        estimate = safe_call_local(defReloadFunction, defModuleName, dry_run=True, **options)
+        print(estimate.summary())
+        plan_dlg = SetVar()
+        plan_dlg.promt = Title('План перезагрузки', estimate.header(),
+                               *estimate.lines(limit=DIALOG_MODULES_LIMIT))
+        plan_dlg.widgets.append(WString('Выполнить перезагрузку:', 'да', 'нет', lst='да'))
+        res = plan_dlg.view() and plan_dlg.widgets[0].value == 'да'
     if res:
         save_def_module_name(defModuleName, defReloadFunction)  # Сохраняем новое значение имени модуля и функции перезагрузки
         logger.debug(f'defModuleName = {defModuleName}, defReloadFunction = {defReloadFunction}')
+        if not use_memory_guard:
+            get_memory_guard().enabled = False
+        elif not get_memory_guard().enabled:
+            # Контроль памяти общий для сеанса: история замеров сохраняется между запусками диалога
+            configure_memory_guard(collect=True, clear_caches=True)
 
         try:
-            safe_call_local(defReloadFunction, defModuleName)
+            safe_call_local(defReloadFunction, defModuleName, log=True, transactional=True,
+                            patch_references=True, **options)
+            if watcher is not None:
+                watcher.mark_reloaded([defModuleName])
+            if get_memory_guard().enabled:
+                objects, traced = get_memory_guard().session_growth()
+                print(f'Рост памяти за сеанс: объектов {objects:+d}'
+                      + (f', память {traced / 1024:+.0f} КБ' if traced is not None else ''))
         except Exception as e:
             print(f'Ошибка: {e}')
         # Возможные варианты использования:
         # auto_reload_module(defModuleName)
         # reload_module_with_dependencies(defModuleName)
         # selective_reload(defModuleName)
+        # auto_reload_module(defModuleName, dry_run=True).summary()
     else:
         print('Отмена')
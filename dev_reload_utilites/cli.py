@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        cli
+# Purpose:     Командная строка: поиск изменённых модулей, зависимости, план
+#              перезагрузки и отслеживание изменений без k3
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Командная строка пакета (python -m dev_reload_utilites).
+
+Диалог auto_reload_manager работает только внутри mebel.exe. Командная
+строка использует те же функции поиска (get_import_names, scan_py_files)
+и планирования (dependency_closure, plan_reload), но строит индекс
+импортов по файлам директории, а не по sys.modules, поэтому работает в
+обычном Python без k3:
+
+python -m dev_reload_utilites scan --minutes 60
+python -m dev_reload_utilites graph my_package.core
+python -m dev_reload_utilites plan my_package.core --json
+python -m dev_reload_utilites watch --plan
+python -m dev_reload_utilites send reload my_package.core
+
+Команда watch работает до прерывания (Ctrl+C) и при каждом изменении
+выводит набор изменённых модулей. На Linux изменения приходят через
+inotify, задержка - десятки миллисекунд; опрос директории выполняется раз
+в WATCH_INTERVAL секунд.
+
+Индекс импортов командной строки хранится в отдельном файле
+(CLI_INDEX_FILE), чтобы не перезаписывать индекс сеанса mebel.exe
+(import_index.INDEX_FILE). Другой файл задаётся ключом --index-file.
+
+Команда send передаёт reload, plan, notify или status серверу команд (server),
+запущенному внутри mebel.exe, - например, из внешнего редактора.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dev_reload_utilites.find_recent_py_files import (
+    find_proto_path,
+    get_import_names,
+    path_to_module_name,
+    scan_py_files,
+)
+from dev_reload_utilites.fingerprint import get_fingerprint_store
+from dev_reload_utilites.import_index import INDEX_FILE, ImportIndex
+from dev_reload_utilites.reload_planner import ReloadPlan, dependency_closure, plan_reload
+from dev_reload_utilites.server import DEFAULT_HOST, DEFAULT_PORT, STRATEGIES, ReloadClient
+from dev_reload_utilites.watcher import _make_backend
+
+
+# Период ожидания изменений командой watch, секунды. При опросе каждый
+# период обходит всё дерево, поэтому меньше 0.5 секунды не задаётся
+WATCH_INTERVAL = 0.5
+
+# Индекс импортов командной строки: рядом с индексом сеанса mebel.exe, но в своём файле
+CLI_INDEX_FILE = INDEX_FILE + '_cli'
+
+ChangeBatch = namedtuple('ChangeBatch', 'time changed removed dirty plan latency')
+ChangeBatch.__doc__ = """Изменения, обнаруженные командой watch за один шаг.
+
+ - time - <float> время обнаружения (time.time())
+ - changed - <tuple> имена изменённых и добавленных модулей
+ - removed - <tuple> имена удалённых модулей
+ - dirty - <tuple> все модули, изменённые с начала отслеживания
+ - plan - <ReloadPlan или None> план перезагрузки изменённых модулей
+ - latency - <float> секунды от последнего сохранения файла до обнаружения
+"""
+
+
+def _module_names(root_dir: str, paths: Iterator[str]) -> Iterator[Tuple[str, str]]:
+    for path in paths:
+        name = path_to_module_name(os.path.relpath(path, root_dir))
+        if name is not None:
+            yield name, path
+
+
+def source_modules(root_dir: str = None) -> List[Tuple[str, str]]:
+    """
+    Перечислить модули директории по файлам, без импорта.
+
+    Args:
+        root_dir (str): Корневая директория. По умолчанию директория Proto.
+
+    Returns:
+        List[Tuple[str, str]]: Пары (имя модуля, абсолютный путь к файлу)
+    """
+    snapshot, _ = scan_py_files(root_dir)
+    return sorted(_module_names(snapshot.root_dir, snapshot.files))
+
+
+def build_index(modules: List[Tuple[str, str]], index: ImportIndex = None,
+                index_file: str = None) -> ImportIndex:
+    """
+    Обновить индекс импортов по файлам модулей и сохранить его на диск.
+
+    Args:
+        modules (List[Tuple[str, str]]): Пары (имя модуля, путь)
+        index (ImportIndex, optional): Индекс. По умолчанию загружается из index_file.
+        index_file (str, optional): Файл индекса. По умолчанию CLI_INDEX_FILE.
+
+    Returns:
+        ImportIndex: Индекс, в котором перечитаны только изменённые файлы
+    """
+    if index is None:
+        index = ImportIndex(CLI_INDEX_FILE if index_file is None else index_file)
+        index.load()
+    index.refresh(modules)
+    index.save()
+    return index
+
+
+def watch_changes(root_dir: str = None, interval: float = WATCH_INTERVAL, backend: str = 'auto',
+                  with_plan: bool = False, stop_event: Optional[threading.Event] = None,
+                  index_file: str = None) -> Iterator[ChangeBatch]:
+    """
+    Отслеживать изменения .py файлов и отдавать их пачками.
+
+    Начальный обход выполняется при первом обращении к итератору; файлы,
+    изменённые до него, не считаются изменёнными. При обходе и после каждой
+    пачки записываются отпечатки содержимого файлов (fingerprint), поэтому
+    файл, у которого изменилось только время модификации, пропускается.
+
+    Args:
+        root_dir (str): Корневая директория. По умолчанию директория Proto.
+        interval (float): Период ожидания изменений в секундах
+        backend (str): 'auto', 'inotify' или 'polling'
+        with_plan (bool): Строить план перезагрузки изменённых модулей
+        stop_event (threading.Event, optional): Событие остановки
+        index_file (str, optional): Файл индекса импортов. По умолчанию CLI_INDEX_FILE.
+
+    Returns:
+        Iterator[ChangeBatch]: Пачки изменений
+    """
+    if root_dir is None:
+        root_dir = find_proto_path()
+    root_dir = os.path.abspath(root_dir)
+    store = get_fingerprint_store()
+    source = _make_backend(root_dir, backend)
+    index = None
+    try:
+        files: Dict[str, float] = source.start()
+        for path in files:
+            store.mark_clean(path)
+        if with_plan:
+            index = build_index(list(_module_names(root_dir, files)), index_file=index_file)
+        dirty: Dict[str, str] = {}
+        while stop_event is None or not stop_event.is_set():
+            changes = source.wait(interval)
+            if not changes:
+                continue
+            changed, removed = [], []
+            for name, path in _module_names(root_dir, list(changes)):
+                mtime = changes[path]
+                if mtime is None:
+                    files.pop(path, None)
+                    dirty.pop(name, None)
+                    removed.append(name)
+                    continue
+                if path in files and not store.is_dirty(path):
+                    files[path] = mtime
+                    continue
+                files[path] = mtime
+                store.mark_clean(path)
+                dirty[name] = path
+                changed.append(name)
+            if not changed and not removed:
+                continue
+            now = time.time()
+            mtimes = [changes[path] for path in changes if changes[path] is not None]
+            latency = max(0.0, now - max(mtimes)) if mtimes else 0.0
+            plan = None
+            if index is not None:
+                index = build_index(list(_module_names(root_dir, files)), index)
+                plan = plan_reload(changed, index) if changed else ReloadPlan((), ())
+            yield ChangeBatch(now, tuple(sorted(changed)), tuple(sorted(removed)),
+                              tuple(sorted(dirty)), plan, latency)
+    finally:
+        source.close()
+
+
+def _plan_lines(plan: ReloadPlan) -> List[str]:
+    lines = []
+    for i, group in enumerate(plan.groups, 1):
+        suffix = ' (циклический импорт)' if len(group) > 1 else ''
+        lines.append(f"{i:>4}. {', '.join(group)}{suffix}")
+    return lines
+
+
+def _command_scan(args) -> dict:
+    names = get_import_names(args.root, args.minutes, limit=args.limit,
+                             changed_only=args.changed_only)
+    return {'modules': list(names)}
+
+
+def _command_graph(args) -> dict:
+    index = build_index(source_modules(args.root), index_file=args.index_file)
+    closure = dependency_closure(args.modules, index)
+    return {'roots': args.modules, 'modules': sorted(closure)}
+
+
+def _command_plan(args) -> dict:
+    index = build_index(source_modules(args.root), index_file=args.index_file)
+    plan = plan_reload(args.modules, index)
+    return {'roots': list(plan.roots), 'groups': [list(group) for group in plan.groups]}
+
+
+def _print_result(command: str, data: dict, as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(data, ensure_ascii=False))
+    elif command == 'plan':
+        print(f"План перезагрузки {', '.join(data['roots'])}:")
+        print('\n'.join(_plan_lines(ReloadPlan(data['roots'], data['groups']))))
+    else:
+        print('\n'.join(data['modules']))
+
+
+def _command_watch(args) -> int:
+    if not args.json:
+        print(f"Отслеживание изменений в {os.path.abspath(args.root or find_proto_path())} (Ctrl+C - выход)")
+    batches = 0
+    try:
+        for batch in watch_changes(args.root, args.interval, args.backend, args.plan,
+                                   index_file=args.index_file):
+            if args.json:
+                data = batch._asdict()
+                data['plan'] = None if batch.plan is None else [list(group) for group in batch.plan.groups]
+                print(json.dumps(data, ensure_ascii=False), flush=True)
+            else:
+                stamp = time.strftime('%H:%M:%S', time.localtime(batch.time))
+                parts = []
+                if batch.changed:
+                    parts.append(f"изменены: {', '.join(batch.changed)}")
+                if batch.removed:
+                    parts.append(f"удалены: {', '.join(batch.removed)}")
+                print(f"[{stamp}] {'; '.join(parts)} (задержка {batch.latency * 1000:.0f} мс)")
+                print(f"  изменённые модули: {', '.join(batch.dirty) or '-'}")
+                if batch.plan is not None:
+                    print('\n'.join(_plan_lines(batch.plan)), flush=True)
+            batches += 1
+            if args.count and batches >= args.count:
+                break
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _command_send(args) -> int:
+    client = ReloadClient(args.host, args.port)
+    params = {}
+    if args.action != 'status':
+        if not args.modules:
+            print(f"Для команды {args.action} нужно имя модуля")
+            return 2
+        if args.action == 'notify':
+            params = {'modules': args.modules}
+        else:
+            params = {'module': args.modules[0], 'strategy': args.strategy, 'force': args.force}
+    try:
+        result = client.request(args.action, **params)
+    except (OSError, RuntimeError) as e:
+        print(f"Ошибка: {e}")
+        return 1
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    elif args.action == 'notify':
+        print(f"Ожидают перезагрузки: {', '.join(result['scheduled'])}")
+    elif args.action == 'status':
+        print(f"В очереди: {result['pending']}, выполнено: {result['served']}")
+        if result['last_report'] is not None:
+            print(result['last_report']['summary'])
+    else:
+        print(result['summary'])
+    return 0 if result.get('ok', True) else 1
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """Разбор аргументов командной строки python -m dev_reload_utilites."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--root', help='корневая директория, по умолчанию директория Proto')
+    common.add_argument('--json', action='store_true', help='вывод в JSON (watch - по строке на изменение)')
+    common.add_argument('--index-file', help='файл индекса импортов, по умолчанию CLI_INDEX_FILE')
+    parser = argparse.ArgumentParser(
+        prog='python -m dev_reload_utilites',
+        description='Поиск изменённых модулей, зависимости и план перезагрузки без k3')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    scan = commands.add_parser('scan', parents=[common], help='недавно изменённые модули')
+    scan.add_argument('--minutes', type=int, default=30, help='за сколько минут')
+    scan.add_argument('--limit', type=int, help='не больше limit самых "молодых" модулей')
+    scan.add_argument('--changed-only', action='store_true',
+                      help='пропускать модули, содержимое которых не изменилось')
+
+    graph = commands.add_parser('graph', parents=[common], help='модули, зависящие от указанных (транзитивно)')
+    graph.add_argument('modules', nargs='+', help='имена модулей')
+
+    plan = commands.add_parser('plan', parents=[common], help='план перезагрузки указанных модулей')
+    plan.add_argument('modules', nargs='+', help='имена изменённых модулей')
+
+    watch = commands.add_parser('watch', parents=[common], help='отслеживать изменения до Ctrl+C')
+    watch.add_argument('--interval', type=float, default=WATCH_INTERVAL, help='период ожидания, секунды')
+    watch.add_argument('--backend', choices=('auto', 'inotify', 'polling'), default='auto')
+    watch.add_argument('--plan', action='store_true', help='выводить план перезагрузки')
+    watch.add_argument('--count', type=int, default=0, help='выйти после count изменений')
+
+    send = commands.add_parser('send', parents=[common], help='отправить команду серверу в mebel.exe')
+    send.add_argument('action', choices=('reload', 'plan', 'notify', 'status'))
+    send.add_argument('modules', nargs='*', help='имя модуля (для notify - имена изменённых модулей)')
+    send.add_argument('--strategy', default=STRATEGIES[0], choices=STRATEGIES)
+    send.add_argument('--force', action='store_true', help='перезагрузить без проверки изменений')
+    send.add_argument('--host', default=DEFAULT_HOST)
+    send.add_argument('--port', type=int, default=DEFAULT_PORT)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Точка входа командной строки.
+
+    Args:
+        argv (List[str], optional): Аргументы. По умолчанию sys.argv[1:].
+
+    Returns:
+        int: Код возврата
+    """
+    args = make_parser().parse_args(argv)
+    if args.command == 'watch':
+        return _command_watch(args)
+    if args.command == 'send':
+        return _command_send(args)
+    command = {'scan': _command_scan, 'graph': _command_graph, 'plan': _command_plan}[args.command]
+    _print_result(args.command, command(args), args.json)
+    return 0
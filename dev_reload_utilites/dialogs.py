@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        dialogs
+# Purpose:     Классы диалогов k3 для окна перезагрузки
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Классы для работы с диалогами k3.
+
+Модуль импортирует k3 и поэтому работает только внутри mebel.exe (или с
+заглушкой k3 из тестов). Механизм перезагрузки его не импортирует:
+auto_reload_manager и пакет dev_reload_utilites загружают диалоги при
+первом обращении к SetVar, Title, WString или key.
+
+- SetVar: Основной класс для создания диалоговых окон
+- Title: Титульная часть диалога
+- WString: Виджет для ввода строк
+
+dlg = SetVar()
+dlg.promt = Title('Ввод параметров', 'Параметры:')
+dlg.widgets.append(WString('Строка:', defval='abc'))
+if dlg.view():
+    print(dlg.value)
+"""
+
+from itertools import chain
+
+import k3 # type: ignore
+
+
+class key:
+    """Ключи к3"""
+    left = k3.k_left
+    right = k3.k_right
+    center = k3.k_center
+    auto = k3.k_auto
+    size = k3.k_size
+    done = k3.k_done
+    lst = k3.k_list
+    listonly = k3.k_listonly
+    current = k3.k_current
+
+
+class _Children:
+    """Класс для наследования.
+    Реализует атрибут children у наследников.
+
+    При присвоении атрибута children удаляет из последовательностей _children None
+    """
+
+    def __init__(self):
+        self._children = []
+
+    @property
+    def children(self):
+        return self._children
+
+    @children.setter
+    def children(self, items):
+        self._children.extend(chain(*items))
+        self._children = tuple(child for child in self._children if child is not None)
+
+    def __iter__(self):
+        return iter(self._children)
+
+
+class Title(_Children):
+    """Титульная часть диалога
+    ____________________________
+
+
+    Именованные аргументы:
+
+     - title - <str> заголовок окна
+     - picfile - <str> Путь к файлу рисунка
+     - pos - <key.left,key.right,key.center> вариант позиционирования текста по умолчанию слева.
+
+    Далее последовательность строк подсказки
+
+    t = Title('Ввод параметров', 'Параметры:', pos=key.left)
+    print(t.children)
+    t = Title('Ввод параметров', 'Параметры:')
+    print(t.children)
+    t = Title('Ввод параметров', 'Параметры:', 'Ещё какая то строка',
+                picfile=r'c:\PKM74\Data\PKM\Pictures\1 вариант.jpg',
+                pos=key.right)
+    print(t.children)
+    for e in t:
+        print(e)
+
+    >>>('Ввод параметров', 'Параметры:', <Ключ: done(17002)>)
+       ('Ввод параметров', 'Параметры:', <Ключ: done(17002)>)
+       ('Ввод параметров', 'c:\\PKM74\\Data\\PKM\\Pictures\\1 вариант.jpg', 'Параметры:', 'Ещё какая то строка', <Ключ: done(17002)>)
+       Ввод параметров
+       c:\PKM74\Data\PKM\Pictures\1 вариант.jpg
+       Параметры:
+       Ещё какая то строка
+       <Ключ: done(17002)>
+
+    """
+
+    def __init__(self, title, *w,
+                 picfile="",
+                 pos=None):
+
+        super(Title, self).__init__()
+
+        if isinstance(pos, k3.Keyword):
+            if len(w):
+                tuple(chain((pos, ), (w, )))
+
+        self.children = (title, picfile, ), w, (key.done, )
+
+
+class DialogWidget(_Children):
+
+    def __init__(self):
+        super(DialogWidget, self).__init__()
+        self._value = k3.Var()
+
+    @property
+    def value(self):
+        return self._value
+
+
+class WString(DialogWidget):
+    def __init__(self, prompt, *v, defval=None, size=key.auto, lst=None):
+
+        super(WString, self).__init__()
+        self._size = size
+        self.default = defval
+
+        if v:
+            if lst is None:
+                self._children = (k3.k_string, self.size,
+                                  k3.k_default, self.default, key.lst, v, k3.k_done,
+                                  prompt, self._value,
+                                  )
+            else:
+                i_current = v.index(lst)
+                if i_current:
+                    v = list(v)
+                    v.insert(i_current, key.current)
+                self._children = (k3.k_string, self.size,
+                                  key.listonly, v, k3.k_done,
+                                  prompt, self._value,
+                                  )
+
+        else:
+            self._children = (k3.k_string, self.size,
+                              k3.k_default, self.default,
+                              prompt, self._value,
+                              )
+
+    @property
+    def size(self):
+        if isinstance(self._size, (int, float)):
+            return (key.size, self._size)
+        else:
+            if isinstance(self._size, k3.Keyword):
+                return self._size
+            else:
+                if self._size > 120:
+                    self._size = 120
+                elif self._size <1:
+                    self._size = 1
+            return self._size
+
+    @property
+    def value(self):
+        return self._value.value
+
+
+class SetVar(_Children):
+    """Ввод параметров в диалоговом окне
+    _____________________________________
+
+    example:
+
+    >>>
+       dlg = SetVar()
+       dlg.promt = Title('Введите парметры', 'Параметры:')
+       dlg.widgets.extend([
+           WDigit('Введите число', defval=100),
+           WDigit('Выберите число', 1, 2, 3, 4, 5, defval=100),
+           WDigit('Выберите число', 100, 200, 300, 400, 500, lst=300),
+           WBool('Риторический вопрос', defval=True),
+           WString('Строку введите пожлста', defval='fff'),
+           WString('Выберите строку пожалуйста', 'раз', 'два', 'три', defval='fff'),
+           WString('Выберите строку пожалуйста', 'раз', 'два', 'три', lst='два'),
+           WGuidesLismat(f'Выберите направляющую',prop_ ='guide',id_ = 10622,defvalue = 21050)
+       ])
+       res = dlg.view()
+       for w in dlg.widgets:
+           print(w.value)
+
+    """
+
+    def __init__(self):
+        super(SetVar, self).__init__()
+        self.promt = None
+        self.widgets = []
+        pass
+
+    def view(self):
+        """Отображает  диалог с именем name и структурой widget.lst_params
+        на экране. """
+        self.children = self.widgets
+        ok_flag = k3.setvar(
+            self.promt.children,
+            self.children,
+            k3.k_done)
+        self.ok_flag = ok_flag[0]
+        return ok_flag[0]
+
+    @property
+    def value(self):
+        res = []
+        for w in self.widgets:
+            if isinstance(w.value, k3.Var):
+                res.append(w.value.value)
+            else:
+                res.append(w.value)
+        return res
@@ -12,7 +12,13 @@ __version__ = '0.1.00'
 
 import os
 import datetime
-from typing import List, Tuple
+import fnmatch
+import heapq
+import pickle
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dev_reload_utilites.fingerprint import get_fingerprint_store
 
 
 def find_proto_path() -> str:
@@ -53,92 +59,484 @@ def find_proto_path() -> str:
     return proto_path
 
 
-def find_recent_py_files(root_dir: str = None, minutes: int = 30) -> List[Tuple[str, datetime.datetime]]:
+# Файл снимка дерева хранится рядом с DEF_MODULE_NAME_FILE
+SNAPSHOT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.dir_snapshot')
+
+# Версия формата файла снимка. При изменении формата старый снимок отбрасывается
+_SNAPSHOT_VERSION = 1
+
+# Директории, которые не сканируются по умолчанию. Первая версия пакета обходила
+# все директории; служебные каталоги VCS, виртуальных окружений и кэша байт-кода
+# не содержат модулей Proto и только замедляют обход
+DEFAULT_EXCLUDE = ('__pycache__', '.git', '.hg', '.svn', '.venv', 'venv', '.tox', '*.egg-info')
+
+SnapshotDiff = namedtuple('SnapshotDiff', 'added modified removed')
+SnapshotDiff.__doc__ = """Изменения между двумя снимками дерева.
+
+ - added - <tuple> пути новых .py файлов
+ - modified - <tuple> пути файлов с изменившимся временем модификации
+ - removed - <tuple> пути удалённых файлов
+"""
+
+
+class DirSnapshot:
+    """Снимок дерева директорий
+    ____________________________
+
+     - root_dir - <str> корневая директория
+     - dirs - <dict> путь директории -> (mtime, кортеж поддиректорий, кортеж .py файлов)
+     - files - <dict> путь .py файла -> mtime
     """
-    Поиск последних изменённых py-файлов за указанное количество минут.
+
+    def __init__(self, root_dir: str, dirs: Dict[str, tuple] = None,
+                 files: Dict[str, float] = None):
+        self.root_dir = root_dir
+        self.dirs = dirs if dirs is not None else {}
+        self.files = files if files is not None else {}
+
+    def __len__(self):
+        return len(self.files)
+
+
+def _diff_files(old: Dict[str, float], new: Dict[str, float]) -> SnapshotDiff:
+    added = tuple(sorted(path for path in new if path not in old))
+    modified = tuple(sorted(path for path, mtime in new.items()
+                            if path in old and old[path] != mtime))
+    removed = tuple(sorted(path for path in old if path not in new))
+    return SnapshotDiff(added, modified, removed)
+
+
+def _is_excluded(name: str, exclude: Tuple[str, ...]) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in exclude)
+
+
+def _list_dir(directory: str, exclude: Tuple[str, ...]) -> Tuple[list, tuple, Dict[str, float]]:
+    """Прочитать директорию через os.scandir, используя DirEntry.stat()."""
+    subdirs = []
+    py_files = []
+    files = {}
+    with os.scandir(directory) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not _is_excluded(entry.name, exclude):
+                        subdirs.append((entry.path, entry.stat(follow_symlinks=False).st_mtime))
+                elif entry.name.endswith('.py'):
+                    files[entry.path] = entry.stat().st_mtime
+                    py_files.append(entry.path)
+            except OSError as e:
+                # Пропускаем файлы, к которым нет доступа
+                print(f"Не удалось получить время модификации файла {entry.path}: {e}")
+    return subdirs, tuple(py_files), files
+
+
+_DirScan = namedtuple('_DirScan', 'directory record files subdirs')
+
+
+def _scan_dir(directory: str, dir_mtime: float, snapshot: DirSnapshot,
+              trust_dir_mtime: bool, exclude: Tuple[str, ...]) -> Optional[_DirScan]:
+    """Просканировать одну директорию, используя предыдущий снимок."""
+    previous = snapshot.dirs.get(directory)
+    # Без trust_dir_mtime файлы неизменённой директории всё равно проверяются, а
+    # os.scandir с DirEntry.stat() не дороже os.stat каждого файла: снимок
+    # используется, только если он действительно избавляет от чтения директории
+    if (trust_dir_mtime and previous is not None and previous[0] == dir_mtime
+            and all(path in snapshot.files for path in previous[2])):
+        _, subdir_paths, py_files = previous
+        files = {path: snapshot.files[path] for path in py_files}
+        subdirs = []
+        for path in subdir_paths:
+            if _is_excluded(os.path.basename(path), exclude):
+                continue
+            try:
+                subdirs.append((path, os.stat(path).st_mtime))
+            except OSError:
+                continue
+    else:
+        try:
+            subdirs, py_files, files = _list_dir(directory, exclude)
+        except OSError as e:
+            print(f"Ошибка при обходе директории {directory}: {e}")
+            return None
+    record = (dir_mtime, tuple(path for path, _ in subdirs), py_files)
+    return _DirScan(directory, record, files, subdirs)
+
+
+def _iter_dirs(root_dir: str, snapshot: DirSnapshot, trust_dir_mtime: bool,
+               workers: int, exclude: Tuple[str, ...]) -> Iterator[_DirScan]:
+    """
+    Перечислить результаты сканирования директорий по мере готовности.
+    
+    При workers > 1 поддиректории распределяются по пулу потоков,
+    результаты отдаются в порядке завершения.
+    """
+    root = (root_dir, os.stat(root_dir).st_mtime)
+    if workers <= 1:
+        stack = [root]
+        while stack:
+            result = _scan_dir(*stack.pop(), snapshot, trust_dir_mtime, exclude)
+            if result is None:
+                continue
+            yield result
+            stack.extend(result.subdirs)
+        return
+
+    # concurrent.futures импортируется только при параллельном обходе
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(_scan_dir, *root, snapshot, trust_dir_mtime, exclude)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result is None:
+                        continue
+                    for path, mtime in result.subdirs:
+                        pending.add(executor.submit(
+                            _scan_dir, path, mtime, snapshot, trust_dir_mtime, exclude))
+                    yield result
+        finally:
+            # Генератор могли закрыть досрочно - отменяем ещё не начатые задачи
+            for future in pending:
+                future.cancel()
+
+
+def iter_py_files(root_dir: str = None, workers: int = 0,
+                  exclude: Tuple[str, ...] = DEFAULT_EXCLUDE) -> Iterator[Tuple[str, float]]:
+    """
+    Потоково перечислить .py файлы дерева вместе с временем модификации.
+    
+    Args:
+        root_dir (str): Корневая директория. По умолчанию директория Proto.
+        workers (int): Число потоков сканирования. 0 или 1 - последовательный обход.
+        exclude (Tuple[str, ...]): Шаблоны имён пропускаемых директорий
+        
+    Returns:
+        Iterator[Tuple[str, float]]: Пары (абсолютный путь, mtime) в порядке обхода
+    """
+    if root_dir is None:
+        root_dir = find_proto_path()
+    root_dir = os.path.abspath(root_dir)
+    for result in _iter_dirs(root_dir, DirSnapshot(root_dir), False, workers, tuple(exclude)):
+        for item in result.files.items():
+            yield item
+
+
+def scan_py_files(root_dir: str = None, snapshot: DirSnapshot = None,
+                  trust_dir_mtime: bool = False, workers: int = 0,
+                  exclude: Tuple[str, ...] = DEFAULT_EXCLUDE) -> Tuple[DirSnapshot, SnapshotDiff]:
+    """
+    Инкрементально просканировать дерево .py файлов.
+    
+    Директория читается через os.scandir, время модификации файлов берётся
+    из DirEntry.stat(). Время модификации директории меняется только при
+    создании, удалении и переименовании файлов, поэтому по умолчанию каждая
+    директория перечитывается: иначе пришлось бы проверять её файлы через
+    os.stat, что не дешевле. При trust_dir_mtime=True директория, время
+    модификации которой не изменилось с предыдущего снимка, не перечитывается:
+    её состав и время модификации файлов берутся из снимка. Это подходит для
+    редакторов, которые сохраняют файл через переименование временного.
+    
+    При workers > 1 директории сканируются пулом потоков. Результат не
+    зависит от числа потоков.
+    
+    Args:
+        root_dir (str): Корневая директория. По умолчанию директория Proto.
+        snapshot (DirSnapshot, optional): Предыдущий снимок этой же директории
+        trust_dir_mtime (bool): Брать неизменённые директории из снимка, не проверяя их файлы
+        workers (int): Число потоков сканирования. 0 или 1 - последовательный обход.
+        exclude (Tuple[str, ...]): Шаблоны имён пропускаемых директорий
+        
+    Returns:
+        Tuple[DirSnapshot, SnapshotDiff]: Новый снимок и изменения относительно предыдущего
+    """
+    if root_dir is None:
+        root_dir = find_proto_path()
+    root_dir = os.path.abspath(root_dir)
+    if snapshot is None or snapshot.root_dir != root_dir:
+        snapshot = DirSnapshot(root_dir)
+
+    dirs = {}
+    files = {}
+    for result in _iter_dirs(root_dir, snapshot, trust_dir_mtime, workers, tuple(exclude)):
+        dirs[result.directory] = result.record
+        files.update(result.files)
+
+    new_snapshot = DirSnapshot(root_dir, dirs, files)
+    return new_snapshot, _diff_files(snapshot.files, files)
+
+
+# Снимки, полученные в текущем сеансе: корневая директория -> DirSnapshot
+_snapshots: Dict[str, DirSnapshot] = {}
+
+
+def load_snapshots(snapshot_file: str = None) -> Dict[str, DirSnapshot]:
+    """
+    Загрузить сохранённые снимки деревьев.
+    
+    Args:
+        snapshot_file (str): Путь к файлу снимков. По умолчанию SNAPSHOT_FILE.
+        
+    Returns:
+        Dict[str, DirSnapshot]: Корневая директория -> снимок
+    """
+    if snapshot_file is None:
+        snapshot_file = SNAPSHOT_FILE
+    try:
+        if os.path.exists(snapshot_file):
+            with open(snapshot_file, 'rb') as f:
+                data = pickle.load(f)
+            if isinstance(data, dict) and data.get('version') == _SNAPSHOT_VERSION:
+                return {root: DirSnapshot(root, dirs, files)
+                        for root, (dirs, files) in data['snapshots'].items()}
+    except Exception as e:
+        print(f"Ошибка загрузки снимка директорий: {e}")
+    return {}
+
+
+def save_snapshots(snapshots: Dict[str, DirSnapshot], snapshot_file: str = None) -> None:
+    """
+    Сохранить снимки деревьев на диск.
+    
+    Args:
+        snapshots (Dict[str, DirSnapshot]): Корневая директория -> снимок
+        snapshot_file (str): Путь к файлу снимков. По умолчанию SNAPSHOT_FILE.
+    """
+    if snapshot_file is None:
+        snapshot_file = SNAPSHOT_FILE
+    tmp_file = snapshot_file + '.tmp'
+    try:
+        with open(tmp_file, 'wb') as f:
+            pickle.dump({'version': _SNAPSHOT_VERSION,
+                         'snapshots': {root: (snapshot.dirs, snapshot.files)
+                                       for root, snapshot in snapshots.items()}}, f)
+        os.replace(tmp_file, snapshot_file)
+    except Exception as e:
+        print(f"Ошибка сохранения снимка директорий: {e}")
+
+
+def _previous_snapshot(root_dir: str) -> Optional[DirSnapshot]:
+    if not _snapshots:
+        _snapshots.update(load_snapshots())
+    return _snapshots.get(root_dir)
+
+
+def _store_snapshot(previous: Optional[DirSnapshot], snapshot: DirSnapshot) -> None:
+    _snapshots[snapshot.root_dir] = snapshot
+    if previous is None or previous.files != snapshot.files or previous.dirs != snapshot.dirs:
+        save_snapshots(_snapshots)
+
+
+def get_snapshot(root_dir: str = None, workers: int = 0,
+                 trust_dir_mtime: bool = False) -> Tuple[DirSnapshot, SnapshotDiff]:
+    """
+    Обновить общий для сеанса снимок дерева и вернуть его вместе с изменениями.
+    
+    При первом обращении снимок загружается из файла SNAPSHOT_FILE,
+    после обновления изменённый снимок сохраняется обратно.
+    
+    Args:
+        root_dir (str): Корневая директория. По умолчанию директория Proto.
+        workers (int): Число потоков сканирования. 0 или 1 - последовательный обход.
+        trust_dir_mtime (bool): Брать неизменённые директории из снимка (см. scan_py_files)
+        
+    Returns:
+        Tuple[DirSnapshot, SnapshotDiff]: Снимок и изменения с предыдущего сканирования
+    """
+    if root_dir is None:
+        root_dir = find_proto_path()
+    root_dir = os.path.abspath(root_dir)
+    previous = _previous_snapshot(root_dir)
+    snapshot, diff = scan_py_files(root_dir, previous, trust_dir_mtime, workers)
+    _store_snapshot(previous, snapshot)
+    return snapshot, diff
+
+
+def _iter_snapshot_files(root_dir: str, workers: int,
+                         trust_dir_mtime: bool) -> Iterator[Tuple[str, float]]:
+    """
+    Потоково перечислить файлы дерева.
+    
+    При trust_dir_mtime=True директории, время модификации которых не
+    изменилось, берутся из общего снимка дерева, а обновлённый снимок
+    сохраняется, если генератор исчерпан полностью. Без trust_dir_mtime
+    снимок не экономит ни одного чтения директории, поэтому не загружается
+    и не сохраняется.
+    """
+    if not trust_dir_mtime:
+        yield from iter_py_files(root_dir, workers)
+        return
+    previous = _previous_snapshot(root_dir)
+    base = previous if previous is not None else DirSnapshot(root_dir)
+    dirs = {}
+    files = {}
+    for result in _iter_dirs(root_dir, base, True, workers, DEFAULT_EXCLUDE):
+        dirs[result.directory] = result.record
+        files.update(result.files)
+        yield from result.files.items()
+    _store_snapshot(previous, DirSnapshot(root_dir, dirs, files))
+
+
+def iter_recent_py_files(root_dir: str = None, minutes: int = 30, workers: int = 0,
+                         changed_only: bool = False,
+                         trust_dir_mtime: bool = False) -> Iterator[Tuple[str, datetime.datetime]]:
+    """
+    Потоково перечислить py-файлы, изменённые за указанное количество минут.
+    
+    Файлы отдаются по мере обнаружения, без сортировки, поэтому перебор
+    можно прервать в любой момент.
     
     Args:
         root_dir (str): Корневая директория для поиска. По умолчанию директория Proto.
         minutes (int): Количество минут для поиска. По умолчанию 30.
+        workers (int): Число потоков сканирования. 0 или 1 - последовательный обход.
+        changed_only (bool): Пропускать файлы, содержимое которых не изменилось
+            с последней перезагрузки модуля (см. fingerprint)
+        trust_dir_mtime (bool): Не перечитывать директории, время модификации
+            которых не изменилось с прошлого обхода (снимок SNAPSHOT_FILE)
         
     Returns:
-        List[Tuple[str, datetime.datetime]]: Список кортежей с путями к файлам и временем их изменения.
+        Iterator[Tuple[str, datetime.datetime]]: Пары (относительный путь, время изменения)
     """
     # Если директория не указана, ищем директорию Proto
     if root_dir is None:
         root_dir = find_proto_path()
-    
-    # Проверяем, является ли путь абсолютным, если нет - преобразуем
-    if not os.path.isabs(root_dir):
-        root_dir = os.path.abspath(root_dir)
+    root_dir = os.path.abspath(root_dir)
     
     # Вычисляем время, до которого нужно искать файлы
     time_threshold = datetime.datetime.now() - datetime.timedelta(minutes=minutes)
+    threshold = time_threshold.timestamp()
     
-    recent_files = []
+    store = get_fingerprint_store() if changed_only else None
     
-    # Рекурсивно проходим по всем файлам в директории
+    for file_path, mod_time in _iter_snapshot_files(root_dir, workers, trust_dir_mtime):
+        # Проверяем, был ли файл изменён в заданный период
+        if mod_time > threshold:
+            # Пропускаем файлы, у которых изменилось только время модификации
+            if store is not None and not store.is_dirty(file_path):
+                continue
+            # Сохраняем относительный путь для удобства отображения
+            relative_path = os.path.relpath(file_path, root_dir)
+            yield relative_path, datetime.datetime.fromtimestamp(mod_time)
+
+
+def find_recent_py_files(root_dir: str = None, minutes: int = 30, workers: int = 0,
+                         limit: int = None, changed_only: bool = False,
+                         trust_dir_mtime: bool = False) -> List[Tuple[str, datetime.datetime]]:
+    """
+    Поиск последних изменённых py-файлов за указанное количество минут.
+    
+    По умолчанию каждая директория читается заново. При trust_dir_mtime=True
+    директории, время модификации которых не изменилось, берутся из
+    сохранённого снимка дерева (SNAPSHOT_FILE); это безопасно для редакторов,
+    которые сохраняют файл через переименование временного. Если указан limit,
+    самые "молодые" файлы отбираются кучей (heapq) без сортировки всего списка.
+    
+    Args:
+        root_dir (str): Корневая директория для поиска. По умолчанию директория Proto.
+        minutes (int): Количество минут для поиска. По умолчанию 30.
+        workers (int): Число потоков сканирования. 0 или 1 - последовательный обход.
+        limit (int, optional): Вернуть не более limit самых "молодых" файлов
+        changed_only (bool): Пропускать файлы, содержимое которых не изменилось
+            с последней перезагрузки модуля (см. fingerprint)
+        trust_dir_mtime (bool): Не перечитывать неизменённые директории (см. выше)
+        
+    Returns:
+        List[Tuple[str, datetime.datetime]]: Список кортежей с путями к файлам и временем их изменения.
+    """
     try:
-        for root, dirs, files in os.walk(root_dir):
-            for file in files:
-                # Проверяем только .py файлы
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    
-                    try:
-                        # Получаем время последней модификации файла
-                        mod_time = os.path.getmtime(file_path)
-                        mod_datetime = datetime.datetime.fromtimestamp(mod_time)
-                        
-                        # Проверяем, был ли файл изменён в заданный период
-                        if mod_datetime > time_threshold:
-                            # Сохраняем относительный путь для удобства отображения
-                            relative_path = os.path.relpath(file_path, root_dir)
-                            recent_files.append((relative_path, mod_datetime))
-                    except OSError as e:
-                        # Пропускаем файлы, к которым нет доступа
-                        print(f"Не удалось получить время модификации файла {file_path}: {e}")
-                        continue
+        recent_files = iter_recent_py_files(root_dir, minutes, workers, changed_only, trust_dir_mtime)
+        if limit is not None:
+            return heapq.nlargest(limit, recent_files, key=lambda x: x[1])
+        # Сортируем по времени модификации (новые первыми)
+        return sorted(recent_files, key=lambda x: x[1], reverse=True)
     except Exception as e:
         print(f"Ошибка при обходе директории {root_dir}: {e}")
         return []
+
+
+def path_to_module_name(relative_path: str) -> Optional[str]:
+    """
+    Преобразовать относительный путь к .py файлу в имя модуля для импорта.
+    
+    Файл __init__.py соответствует самому пакету: 'pkg/__init__.py' -> 'pkg'.
+    Первая версия пакета возвращала 'pkg.__init__', и такой модуль
+    импортировался второй копией пакета.
+    
+    Args:
+        relative_path (str): Путь к файлу относительно корневой директории
+        
+    Returns:
+        Optional[str]: Имя модуля или None, если файл не является .py файлом
+    """
+    # Убираем расширение .py
+    if not relative_path.endswith('.py'):
+        return None
+    module_path = relative_path[:-3]
+    # Заменяем разделители пути на точки
+    module_name = module_path.replace(os.sep, '.')
+    # Файл __init__.py соответствует самому пакету
+    if module_name.endswith('.__init__'):
+        module_name = module_name[:-len('.__init__')]
+    return module_name
+
+
+def iter_import_names(root_dir: str = None, minutes: int = 30, workers: int = 0,
+                      limit: int = None) -> Iterator[str]:
+    """
+    Потоково перечислить имена недавно изменённых модулей.
     
-    # Сортируем по времени модификации (новые первыми)
-    recent_files.sort(key=lambda x: x[1], reverse=True)
+    Без limit имена отдаются по мере обнаружения файлов. С limit отдаются
+    не более limit самых "молодых" модулей, новые первыми.
     
-    return recent_files
+    Args:
+        root_dir (str): Корневая директория для поиска. По умолчанию директория Proto.
+        minutes (int): Количество минут для поиска. По умолчанию 30.
+        workers (int): Число потоков сканирования. 0 или 1 - последовательный обход.
+        limit (int, optional): Количество самых "молодых" модулей
+        
+    Returns:
+        Iterator[str]: Имена модулей
+    """
+    if limit is None:
+        recent_files = iter_recent_py_files(root_dir, minutes, workers)
+    else:
+        recent_files = find_recent_py_files(root_dir, minutes, workers, limit)
+    for file_path, _ in recent_files:
+        module_name = path_to_module_name(file_path)
+        if module_name is not None:
+            yield module_name
 
 
-def get_import_names(root_dir: str = None, minutes: int = 30) -> Tuple[str, ...]:
+def get_import_names(root_dir: str = None, minutes: int = 30, workers: int = 0,
+                     limit: int = None, changed_only: bool = False,
+                     trust_dir_mtime: bool = False) -> Tuple[str, ...]:
     """
     Получить кортеж с именами модулей в формате, пригодном для импорта.
     
     Args:
         root_dir (str): Корневая директория для поиска. По умолчанию директория Proto.
         minutes (int): Количество минут для поиска. По умолчанию 30.
+        workers (int): Число потоков сканирования. 0 или 1 - последовательный обход.
+        limit (int, optional): Вернуть не более limit самых "молодых" модулей
+        changed_only (bool): Пропускать модули, содержимое которых не изменилось
+            с последней перезагрузки
+        trust_dir_mtime (bool): Не перечитывать директории, время модификации
+            которых не изменилось (см. find_recent_py_files)
         
     Returns:
         Tuple[str, ...]: Кортеж с именами модулей, отсортированными по времени изменения.
     """
-    # Если директория не указана, ищем директорию Proto
-    if root_dir is None:
-        root_dir = find_proto_path()
-    
-    # Проверяем, является ли путь абсолютным, если нет - преобразуем
-    if not os.path.isabs(root_dir):
-        root_dir = os.path.abspath(root_dir)
-    
     # Получаем список последних изменённых файлов
-    recent_files = find_recent_py_files(root_dir, minutes)
+    recent_files = find_recent_py_files(root_dir, minutes, workers, limit, changed_only,
+                                        trust_dir_mtime)
     
     # Формируем список имён модулей
     import_names = []
     for file_path, _ in recent_files:
-        # Убираем расширение .py
-        if file_path.endswith('.py'):
-            module_path = file_path[:-3]
-            # Заменяем разделители пути на точки
-            module_name = module_path.replace(os.sep, '.')
+        module_name = path_to_module_name(file_path)
+        if module_name is not None:
             import_names.append(module_name)
     
     return tuple(import_names)
@@ -172,8 +570,9 @@ def print_recent_py_files(root_dir: str = None, minutes: int = 30) -> None:
     for file_path, mod_time in recent_files:
         print(f"  {mod_time.strftime('%Y-%m-%d %H:%M:%S')} - {file_path}")
     
-    # Выводим имена модулей для импорта
-    import_names = get_import_names(root_dir, minutes)
+    # Выводим имена модулей для импорта (без повторного обхода директории)
+    import_names = tuple(name for name in (path_to_module_name(file_path)
+                                           for file_path, _ in recent_files) if name)
     print(f"\nИмена модулей для импорта: {import_names}")
 
 
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        fingerprint
+# Purpose:     Отпечатки содержимого исходных файлов
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Отпечатки содержимого исходных файлов.
+
+IDE, git checkout и форматтеры часто перезаписывают файл, не меняя его
+содержимого. Время модификации при этом меняется, и модуль ошибочно
+считается изменённым. Хранилище отпечатков сравнивает хэш байтов файла
+с хэшем, записанным при последней перезагрузке модуля. Хэш кэшируется
+по (путь, mtime, размер), поэтому файл читается только после изменения.
+
+Чтобы touch сразу после запуска mebel.exe (например, git checkout) не
+вызывал перезагрузку, отпечаток загруженного модуля записывается уже при
+первом его обнаружении (observe_module): при первом обновлении индекса
+импортов, в том числе при запуске потока отслеживания. Если файл новее
+байт-кода модуля (__cached__), содержимое могло измениться после загрузки,
+и отпечаток не записывается; без байт-кода (PYTHONDONTWRITEBYTECODE)
+отпечаток записывается только после перезагрузки. Модуль, для которого
+отпечаток ещё не записан, всегда считается изменённым.
+"""
+
+import hashlib
+import os
+import threading
+import types
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def module_source_path(module: types.ModuleType) -> Optional[str]:
+    """
+    Получить абсолютный путь к исходному .py файлу модуля.
+
+    Args:
+        module (types.ModuleType): Модуль
+
+    Returns:
+        Optional[str]: Путь или None, если у модуля нет исходного файла
+    """
+    path = getattr(module, '__file__', None)
+    if isinstance(path, str) and path.endswith('.py'):
+        return os.path.abspath(path)
+    return None
+
+
+class FingerprintStore:
+    """Хранилище отпечатков содержимого файлов
+    ___________________________________________
+
+    store = FingerprintStore()
+    if store.is_dirty(path):
+        importlib.reload(module)
+        store.mark_clean(path)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # путь -> (mtime, размер, отпечаток)
+        self._cache: Dict[str, Tuple[float, int, bytes]] = {}
+        # путь -> отпечаток при последней перезагрузке
+        self._baseline: Dict[str, bytes] = {}
+        # Количество прочитанных и хэшированных файлов
+        self.reads = 0
+
+    def fingerprint(self, path: str, stat: Optional[os.stat_result] = None) -> Optional[bytes]:
+        """
+        Получить отпечаток содержимого файла.
+
+        Args:
+            path (str): Путь к файлу
+            stat (os.stat_result, optional): Уже полученный результат os.stat
+
+        Returns:
+            Optional[bytes]: Отпечаток или None, если файл недоступен
+        """
+        try:
+            if stat is None:
+                stat = os.stat(path)
+            with self._lock:
+                cached = self._cache.get(path)
+            if cached is not None and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+                return cached[2]
+            with open(path, 'rb') as f:
+                digest = _digest(f.read())
+        except OSError:
+            return None
+        with self._lock:
+            self._cache[path] = (stat.st_mtime, stat.st_size, digest)
+            self.reads += 1
+        return digest
+
+    def is_dirty(self, path: str, stat: Optional[os.stat_result] = None) -> bool:
+        """
+        Проверить, изменилось ли содержимое файла с последней перезагрузки.
+
+        Args:
+            path (str): Путь к файлу
+            stat (os.stat_result, optional): Уже полученный результат os.stat
+
+        Returns:
+            bool: True, если отпечаток не записан или содержимое изменилось
+        """
+        with self._lock:
+            baseline = self._baseline.get(path)
+        if baseline is None:
+            return True
+        return self.fingerprint(path, stat) != baseline
+
+    def mark_clean(self, path: str) -> None:
+        """
+        Записать текущее содержимое файла как загруженное.
+
+        Args:
+            path (str): Путь к файлу
+        """
+        digest = self.fingerprint(path)
+        with self._lock:
+            if digest is None:
+                self._baseline.pop(path, None)
+            else:
+                self._baseline[path] = digest
+
+    def observe_module(self, module: types.ModuleType) -> bool:
+        """
+        Записать отпечаток загруженного модуля, если он ещё не записан.
+
+        Отпечаток записывается, только если файл модуля не новее его
+        байт-кода (__cached__): тогда содержимое файла совпадает с загруженным.
+
+        Args:
+            module (types.ModuleType): Загруженный модуль
+
+        Returns:
+            bool: True, если отпечаток записан
+        """
+        path = module_source_path(module)
+        cached = getattr(module, '__cached__', None)
+        if path is None or not isinstance(cached, str):
+            return False
+        with self._lock:
+            if path in self._baseline:
+                return False
+        try:
+            stat = os.stat(path)
+            if stat.st_mtime > os.stat(cached).st_mtime:
+                return False
+        except OSError:
+            return False
+        digest = self.fingerprint(path, stat)
+        if digest is None:
+            return False
+        with self._lock:
+            self._baseline.setdefault(path, digest)
+        return True
+
+    def forget(self, path: str) -> None:
+        """Удалить сведения о файле."""
+        with self._lock:
+            self._cache.pop(path, None)
+            self._baseline.pop(path, None)
+
+    def is_module_dirty(self, module: types.ModuleType) -> bool:
+        """
+        Проверить, изменился ли исходный файл модуля с последней перезагрузки.
+
+        Модуль без исходного .py файла считается изменённым.
+        """
+        path = module_source_path(module)
+        return path is None or self.is_dirty(path)
+
+    def mark_modules_clean(self, modules: Iterable[types.ModuleType]) -> None:
+        """Записать текущее содержимое файлов модулей как загруженное."""
+        for module in modules:
+            path = module_source_path(module)
+            if path is not None:
+                self.mark_clean(path)
+
+
+_store = None
+
+
+def get_fingerprint_store() -> FingerprintStore:
+    """
+    Получить общее для сеанса хранилище отпечатков.
+
+    Returns:
+        FingerprintStore: Хранилище отпечатков
+    """
+    global _store
+    if _store is None:
+        _store = FingerprintStore()
+    return _store
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        import_index
+# Purpose:     Обратный индекс импортов (импортируемый модуль -> импортёры)
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Обратный индекс импортов загруженных модулей.
+
+Индекс строится один раз, а затем обновляется только для файлов, у которых
+изменились время модификации или размер. Ключом служит путь к файлу, поэтому
+индекс переживает перезапуск mebel.exe: он сохраняется рядом с файлом
+.def_module_name и при "тёплой" перезагрузке с диска почти ничего не читается.
+"""
+
+import os
+import pickle
+import sys
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from dev_reload_utilites.fingerprint import get_fingerprint_store, module_source_path
+from dev_reload_utilites.import_parser import extract_imports, module_package
+from dev_reload_utilites.scan_scope import ScanScope, get_scan_scope, is_reloadable
+
+
+# Файл индекса хранится рядом с DEF_MODULE_NAME_FILE
+INDEX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.import_index')
+
+# Версия формата файла индекса. При изменении формата старый индекс отбрасывается
+_INDEX_VERSION = 2
+
+
+def iter_loaded_modules(scope: Optional[ScanScope] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Перечислить загруженные модули пользовательского кода, у которых есть исходный .py файл.
+
+    Модули стандартной библиотеки, site-packages и скомпилированные модули
+    не могут импортировать модули из Proto и пропускаются (см. scan_scope).
+    Пропускаются и модули, которые нельзя перезагрузить: __main__ и модули
+    с __spec__ = None (scan_scope.is_reloadable).
+
+    Args:
+        scope (ScanScope, optional): Область поиска. По умолчанию общая для сеанса.
+
+    Returns:
+        Iterator[Tuple[str, str]]: Пары (имя модуля, абсолютный путь к файлу)
+    """
+    if scope is None:
+        scope = get_scan_scope()
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if isinstance(path, str) and path.endswith('.py') and is_reloadable(name, module) \
+                and scope.is_included_path(path):
+            yield name, os.path.abspath(path)
+
+
+class ImportIndex:
+    """
+    Обратный индекс импортов, привязанный к путям файлов.
+
+    - _entries: путь -> (mtime, size, пакет модуля, кортеж импортируемых имён)
+    - _reverse: импортируемое имя -> множество путей импортёров
+    - _path_names: путь -> имя модуля в текущем сеансе
+
+    index = ImportIndex()
+    index.load()
+    index.refresh()
+    print(index.dependents('my_module'))
+    index.save()
+    """
+
+    def __init__(self, index_file: str = None):
+        self.index_file = INDEX_FILE if index_file is None else index_file
+        self._entries: Dict[str, Tuple[float, int, str, Tuple[str, ...]]] = {}
+        self._reverse: Dict[str, Set[str]] = {}
+        self._path_names: Dict[str, str] = {}
+        self._name_paths: Dict[str, str] = {}
+        self._dirty = False
+        # Количество файлов, прочитанных при последнем обновлении
+        self.last_reads = 0
+
+    def _link(self, path: str, imports: Iterable[str]) -> None:
+        # Только точные имена: 'from pkg import X' уже даёт прямую связь с 'pkg', а
+        # импортёр 'pkg.b' не зависит от остальных подмодулей, которые
+        # реэкспортирует пакет 'pkg'
+        for name in imports:
+            self._reverse.setdefault(name, set()).add(path)
+
+    def _unlink(self, path: str) -> None:
+        entry = self._entries.get(path)
+        if entry is None:
+            return
+        for name in entry[3]:
+            paths = self._reverse.get(name)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self._reverse[name]
+
+    def load(self) -> bool:
+        """
+        Загрузить индекс с диска.
+
+        Returns:
+            bool: True, если индекс загружен, иначе False
+        """
+        try:
+            if not os.path.exists(self.index_file):
+                return False
+            with open(self.index_file, 'rb') as f:
+                data = pickle.load(f)
+            if not isinstance(data, dict) or data.get('version') != _INDEX_VERSION:
+                return False
+            self._entries = dict(data['entries'])
+        except Exception as e:
+            print(f"Ошибка загрузки индекса импортов: {e}")
+            self._entries = {}
+            return False
+        self._reverse = {}
+        for path, (_, _, _, imports) in self._entries.items():
+            self._link(path, imports)
+        self._dirty = False
+        return True
+
+    def save(self) -> None:
+        """Сохранить индекс на диск, если он изменился с момента загрузки."""
+        if not self._dirty:
+            return
+        tmp_file = self.index_file + '.tmp'
+        try:
+            with open(tmp_file, 'wb') as f:
+                pickle.dump({'version': _INDEX_VERSION, 'entries': self._entries}, f)
+            os.replace(tmp_file, self.index_file)
+            self._dirty = False
+        except Exception as e:
+            print(f"Ошибка сохранения индекса импортов: {e}")
+
+    def update_file(self, path: str, package: str = '',
+                    stat: Optional[os.stat_result] = None) -> bool:
+        """
+        Обновить запись индекса для одного файла, если он изменился.
+
+        Args:
+            path (str): Абсолютный путь к файлу модуля
+            package (str): Пакет модуля для разрешения относительных импортов
+            stat (os.stat_result, optional): Уже полученный результат os.stat
+
+        Returns:
+            bool: True, если файл был прочитан заново
+        """
+        if stat is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self.forget(path)
+                return False
+        entry = self._entries.get(path)
+        if entry is not None and entry[:3] == (stat.st_mtime, stat.st_size, package):
+            return False
+        try:
+            imports = extract_imports(path, package, stat)
+        except (IOError, OSError):
+            self.forget(path)
+            return False
+        self._unlink(path)
+        self._entries[path] = (stat.st_mtime, stat.st_size, package, imports)
+        self._link(path, imports)
+        self._dirty = True
+        return True
+
+    def forget(self, path: str) -> None:
+        """Удалить файл из индекса."""
+        if path in self._entries:
+            self._unlink(path)
+            del self._entries[path]
+            self._dirty = True
+
+    def refresh(self, modules: Optional[Iterable[Tuple[str, str]]] = None) -> int:
+        """
+        Привести индекс в соответствие с набором модулей.
+
+        Перечитываются только файлы, у которых изменились mtime или размер.
+        Для загруженных модулей, впервые попавших в индекс, записывается
+        отпечаток содержимого (fingerprint.FingerprintStore.observe_module).
+
+        Args:
+            modules (Iterable[Tuple[str, str]], optional): Пары (имя модуля, путь).
+                По умолчанию загруженные модули пользовательского кода из sys.modules.
+
+        Returns:
+            int: Количество прочитанных файлов
+        """
+        if modules is None:
+            modules = iter_loaded_modules()
+        store = get_fingerprint_store()
+        path_names = {}
+        reads = 0
+        for name, path in modules:
+            path_names[path] = name
+            if self.update_file(path, module_package(name, path)):
+                reads += 1
+            module = sys.modules.get(name)
+            if module is not None and module_source_path(module) == path:
+                store.observe_module(module)
+        self._path_names = path_names
+        self._name_paths = {name: path for path, name in path_names.items()}
+        self.last_reads = reads
+        return reads
+
+    def dependents(self, module_name: str) -> List[str]:
+        """
+        Найти модули текущего сеанса, которые импортируют указанный модуль.
+
+        Args:
+            module_name (str): Имя модуля
+
+        Returns:
+            List[str]: Отсортированный список имён зависимых модулей
+        """
+        result = set()
+        for path in self._reverse.get(module_name, ()):
+            name = self._path_names.get(path)
+            if name is not None and name != module_name:
+                result.add(name)
+        return sorted(result)
+
+    def imports_of(self, module_name: str) -> FrozenSet[str]:
+        """
+        Получить имена модулей, импортируемых указанным модулем.
+
+        Args:
+            module_name (str): Имя модуля
+
+        Returns:
+            FrozenSet[str]: Множество импортируемых имён (пустое, если модуль не проиндексирован)
+        """
+        path = self._name_paths.get(module_name)
+        if path is None or path not in self._entries:
+            return frozenset()
+        return frozenset(self._entries[path][3])
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_index = None
+
+
+def get_index() -> ImportIndex:
+    """
+    Получить общий для сеанса индекс импортов, загрузив его с диска при первом обращении.
+
+    Returns:
+        ImportIndex: Индекс импортов
+    """
+    global _index
+    if _index is None:
+        _index = ImportIndex()
+        _index.load()
+    return _index
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        import_parser
+# Purpose:     Извлечение импортов из исходного кода с помощью ast
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Извлечение рёбер импорта из исходных файлов с помощью модуля ast.
+
+В отличие от поиска подстроки 'import foo' разбор синтаксического дерева
+не путает 'foo' с 'foo_bar', не реагирует на комментарии и строки и понимает
+'import a, foo', относительные импорты, 'from x import y' и импорты внутри
+функций. Результаты разбора кэшируются по (путь, mtime, размер), поэтому
+неизменённый файл повторно не разбирается. Файл читается один раз через
+source_reader, файлы без слова import не разбираются вовсе.
+"""
+
+import ast
+import os
+from collections import namedtuple
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from dev_reload_utilites.source_reader import SourceFile, decode_source, may_import, read_source
+
+
+ImportEdge = namedtuple('ImportEdge', 'module names level lineno')
+ImportEdge.__doc__ = """Один оператор импорта.
+
+ - module - <str> имя модуля ('' для 'from . import x')
+ - names - <tuple> импортируемые имена для 'from ... import ...', иначе пустой кортеж
+ - level - <int> уровень относительного импорта (0 - абсолютный)
+ - lineno - <int> номер строки
+"""
+
+# Кэш разбора: путь -> (mtime, размер, кортеж рёбер, результат проверки синтаксиса).
+# Результат проверки: None - синтаксис верен, строка - текст ошибки,
+# _UNCHECKED - файл не разбирался (в нём нет слова import)
+_parse_cache: Dict[str, Tuple[float, int, Tuple[ImportEdge, ...], object]] = {}
+
+_UNCHECKED = object()
+
+
+def _parse_source(source: SourceFile, path: str) -> ast.AST:
+    """
+    Разобрать исходный код файла.
+
+    Если кодировка определена по BOM или объявлению (PEP 263), разбираются
+    сами байты: ast.parse декодирует их без промежуточной строки. Байты
+    файлов, для которых кодировка подобрана (cp1251 без объявления),
+    декодируются явно.
+    """
+    if source.fallback:
+        return ast.parse(decode_source(source), path)
+    return ast.parse(source.data, path)
+
+
+def _collect_edges(tree: ast.AST) -> Tuple[ImportEdge, ...]:
+    edges = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                edges.append(ImportEdge(alias.name, (), 0, node.lineno))
+        elif isinstance(node, ast.ImportFrom):
+            names = tuple(alias.name for alias in node.names)
+            edges.append(ImportEdge(node.module or '', names, node.level, node.lineno))
+    edges.sort(key=lambda edge: edge.lineno)
+    return tuple(edges)
+
+
+def _format_error(e: Exception, path: str) -> str:
+    if isinstance(e, SyntaxError):
+        return f"{e.filename or path}:{e.lineno}: {e.msg}"
+    return f"{path}: {e}"
+
+
+def _salvage_edges(source: SourceFile) -> Tuple[ImportEdge, ...]:
+    """
+    Извлечь импорты из файла с синтаксической ошибкой построчно.
+
+    Каждая строка, начинающаяся с import или from, разбирается отдельно.
+    Так модуль с ошибкой не теряет рёбра импорта, попадает в план
+    перезагрузки и отклоняется проверкой синтаксиса.
+    """
+    edges = []
+    try:
+        text = decode_source(source)
+    except (UnicodeDecodeError, LookupError):
+        return ()
+    for lineno, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if not stripped.startswith(('import ', 'from ')):
+            continue
+        try:
+            tree = ast.parse(stripped)
+        except (SyntaxError, ValueError):
+            continue
+        edges.extend(edge._replace(lineno=lineno) for edge in _collect_edges(tree))
+    return tuple(edges)
+
+
+def _parse_file(path: str, stat: os.stat_result, check: bool) -> Tuple[Tuple[ImportEdge, ...], object]:
+    source = read_source(path, stat)
+    if not check and not may_import(source.data):
+        return (), _UNCHECKED
+    try:
+        return _collect_edges(_parse_source(source, path)), None
+    except (SyntaxError, ValueError) as e:
+        return _salvage_edges(source), _format_error(e, path)
+
+
+def parse_imports(path: str, stat: Optional[os.stat_result] = None) -> Tuple[ImportEdge, ...]:
+    """
+    Получить операторы импорта файла, используя кэш разбора.
+
+    Args:
+        path (str): Путь к файлу модуля
+        stat (os.stat_result, optional): Уже полученный результат os.stat
+
+    Returns:
+        Tuple[ImportEdge, ...]: Операторы импорта в порядке следования.
+            Для файла с синтаксической ошибкой импорты извлекаются построчно.
+
+    Raises:
+        OSError: Если файл не удалось прочитать
+    """
+    if stat is None:
+        stat = os.stat(path)
+    cached = _parse_cache.get(path)
+    if cached is not None and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        return cached[2]
+
+    edges, status = _parse_file(path, stat, check=False)
+    _parse_cache[path] = (stat.st_mtime, stat.st_size, edges, status)
+    return edges
+
+
+def check_syntax(path: str, stat: Optional[os.stat_result] = None) -> Optional[str]:
+    """
+    Проверить синтаксис файла, используя кэш разбора.
+
+    Файл, уже разобранный при поиске импортов, повторно не разбирается.
+
+    Args:
+        path (str): Путь к файлу модуля
+        stat (os.stat_result, optional): Уже полученный результат os.stat
+
+    Returns:
+        Optional[str]: Текст синтаксической ошибки ('путь:строка: сообщение') или None
+
+    Raises:
+        OSError: Если файл не удалось прочитать
+    """
+    if stat is None:
+        stat = os.stat(path)
+    cached = _parse_cache.get(path)
+    if cached is not None and cached[0] == stat.st_mtime and cached[1] == stat.st_size \
+            and cached[3] is not _UNCHECKED:
+        return cached[3]
+
+    edges, status = _parse_file(path, stat, check=True)
+    _parse_cache[path] = (stat.st_mtime, stat.st_size, edges, status)
+    return status
+
+
+def module_package(module_name: str, path: str) -> str:
+    """
+    Определить пакет, относительно которого разрешаются импорты модуля.
+
+    Args:
+        module_name (str): Имя модуля
+        path (str): Путь к файлу модуля
+
+    Returns:
+        str: Имя пакета ('' для модуля верхнего уровня)
+    """
+    if os.path.splitext(os.path.basename(path))[0] == '__init__':
+        return module_name
+    return module_name.rpartition('.')[0]
+
+
+def _resolve_base(edge: ImportEdge, package: str) -> Optional[str]:
+    if not edge.level:
+        return edge.module
+    parts = package.split('.') if package else []
+    if edge.level > len(parts):
+        # Относительный импорт за пределы пакета верхнего уровня
+        return None
+    base_parts = parts[:len(parts) - (edge.level - 1)]
+    if edge.module:
+        base_parts.append(edge.module)
+    return '.'.join(base_parts)
+
+
+def resolve_imports(edges: Iterable[ImportEdge], package: str = '') -> Set[str]:
+    """
+    Преобразовать операторы импорта в абсолютные имена модулей.
+
+    Для 'from x import y' в результат попадают и 'x', и 'x.y', так как 'y'
+    может оказаться подмодулем пакета 'x'.
+
+    Args:
+        edges (Iterable[ImportEdge]): Операторы импорта
+        package (str): Пакет импортирующего модуля (для относительных импортов)
+
+    Returns:
+        Set[str]: Множество абсолютных имён модулей
+    """
+    names = set()
+    for edge in edges:
+        base = _resolve_base(edge, package)
+        if base is None:
+            continue
+        names.add(base)
+        for name in edge.names:
+            if name != '*':
+                names.add(f'{base}.{name}')
+    return names
+
+
+def extract_imports(path: str, package: str = '',
+                    stat: Optional[os.stat_result] = None) -> Tuple[str, ...]:
+    """
+    Извлечь абсолютные имена модулей, импортируемых файлом.
+
+    Args:
+        path (str): Путь к файлу модуля
+        package (str): Пакет модуля для разрешения относительных импортов
+        stat (os.stat_result, optional): Уже полученный результат os.stat
+
+    Returns:
+        Tuple[str, ...]: Отсортированный кортеж имён импортируемых модулей
+    """
+    return tuple(sorted(resolve_imports(parse_imports(path, stat), package)))
+
+
+def clear_cache() -> None:
+    """Очистить кэш разбора."""
+    _parse_cache.clear()
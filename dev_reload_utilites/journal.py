@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        journal
+# Purpose:     Журнал перезагрузок с ротацией по размеру и запросами
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Журнал перезагрузок.
+
+Каждый завершённый запуск перезагрузки (ReloadProfiler.finish) дописывает
+одну строку JSON в файл .reload_journal рядом с файлом .def_module_name:
+время, функцию перезагрузки, модуль или префикс, время каждого модуля и
+результат. Когда файл превышает max_bytes, он переименовывается в
+.reload_journal.1 (старые копии сдвигаются), хранится backups копий.
+
+Запросы читают файлы построчно, от старых к новым, не загружая журнал в
+память целиком.
+
+journal = get_journal()
+print(journal.top_slow_modules(10, days=7))
+print(journal.most_reloaded(10))
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from collections import Counter, namedtuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Журнал хранится рядом с DEF_MODULE_NAME_FILE
+JOURNAL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.reload_journal')
+
+# Размер файла журнала, после которого выполняется ротация
+MAX_BYTES = 1024 * 1024
+
+# Количество хранимых старых файлов журнала
+BACKUPS = 3
+
+JournalEntry = namedtuple('JournalEntry', 'time strategy target modules total_seconds outcome')
+JournalEntry.__doc__ = """Одна запись журнала.
+
+ - time - <float> время начала перезагрузки (time.time())
+ - strategy - <str> имя функции перезагрузки
+ - target - <str> имя модуля или префикс
+ - modules - <tuple> кортежи (имя модуля, секунды, текст ошибки или None)
+ - total_seconds - <float> общее время
+ - outcome - <'ok', 'error', 'skipped', 'rolled_back'> результат
+"""
+
+
+def _outcome(report) -> str:
+    if getattr(report, 'rolled_back', False):
+        return 'rolled_back'
+    if report.skipped:
+        return 'skipped'
+    return 'ok' if report.ok else 'error'
+
+
+class ReloadJournal:
+    """Журнал перезагрузок в формате JSON lines
+    ___________________________________________
+
+    Именованные аргументы:
+
+     - max_bytes - <int> размер файла, после которого выполняется ротация
+     - backups - <int> количество хранимых старых файлов
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = MAX_BYTES, backups: int = BACKUPS):
+        self.path = path if path is not None else JOURNAL_FILE
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def _files(self) -> List[str]:
+        """Файлы журнала от самого старого к текущему."""
+        files = [f"{self.path}.{i}" for i in range(self.backups, 0, -1)]
+        files.append(self.path)
+        return [path for path in files if os.path.exists(path)]
+
+    def _rotate(self) -> None:
+        for i in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def append(self, report) -> None:
+        """
+        Дописать отчёт о перезагрузке в журнал.
+
+        Args:
+            report (ReloadReport): Отчёт профилировщика
+        """
+        record = {
+            't': round(report.started, 3),
+            's': report.strategy,
+            'target': report.target,
+            'm': [[timing.name, round(timing.seconds, 6), timing.error] for timing in report.modules],
+            'total': round(report.total_seconds, 6),
+            'r': _outcome(report),
+        }
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            try:
+                if os.path.getsize(self.path) + len(line) > self.max_bytes:
+                    self._rotate()
+            except OSError:
+                pass
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+    def iter_entries(self, since: Optional[float] = None) -> Iterator[JournalEntry]:
+        """
+        Перечислить записи журнала от старых к новым, читая файлы построчно.
+
+        Повреждённые строки пропускаются.
+
+        Args:
+            since (float, optional): Только записи не раньше этого времени (time.time())
+
+        Returns:
+            Iterator[JournalEntry]: Записи журнала
+        """
+        for path in self._files():
+            try:
+                f = open(path, encoding='utf-8')
+            except OSError:
+                continue
+            with f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        entry = JournalEntry(record['t'], record['s'], record['target'],
+                                             tuple(tuple(item) for item in record['m']),
+                                             record['total'], record['r'])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if since is None or entry.time >= since:
+                        yield entry
+
+    @staticmethod
+    def _since(days: Optional[float]) -> Optional[float]:
+        return None if days is None else time.time() - days * 86400
+
+    def top_slow_modules(self, n: int = 10, days: Optional[float] = None) -> List[Tuple[str, float, int]]:
+        """
+        Самые медленные при перезагрузке модули.
+
+        Args:
+            n (int): Количество модулей
+            days (float, optional): Учитывать только последние days суток
+
+        Returns:
+            List[Tuple[str, float, int]]: (имя модуля, среднее время в секундах,
+                количество перезагрузок), самые медленные первыми
+        """
+        totals: Dict[str, List[float]] = {}
+        for entry in self.iter_entries(self._since(days)):
+            for name, seconds, error in entry.modules:
+                if error is None:
+                    stat = totals.setdefault(name, [0.0, 0])
+                    stat[0] += seconds
+                    stat[1] += 1
+        averages = ((total / count, name, count) for name, (total, count) in totals.items())
+        return [(name, seconds, count) for seconds, name, count in heapq.nlargest(n, averages)]
+
+    def most_reloaded(self, n: int = 10, days: Optional[float] = None) -> List[Tuple[str, int]]:
+        """
+        Чаще всего перезагружаемые модули.
+
+        Args:
+            n (int): Количество модулей
+            days (float, optional): Учитывать только последние days суток
+
+        Returns:
+            List[Tuple[str, int]]: (имя модуля, количество перезагрузок)
+        """
+        counter = Counter()
+        for entry in self.iter_entries(self._since(days)):
+            counter.update(name for name, _, _ in entry.modules)
+        return counter.most_common(n)
+
+
+_journal = None
+
+
+def get_journal() -> ReloadJournal:
+    """
+    Получить общий для сеанса журнал перезагрузок.
+
+    Returns:
+        ReloadJournal: Журнал
+    """
+    global _journal
+    if _journal is None:
+        _journal = ReloadJournal()
+    return _journal
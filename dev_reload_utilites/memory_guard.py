@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        memory_guard
+# Purpose:     Контроль памяти, удерживаемой после повторных перезагрузок
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Контроль роста памяти при перезагрузке модулей.
+
+После importlib.reload старые функции, классы и кэши модуля живут, пока на
+них есть ссылки. За долгий сеанс с сотнями перезагрузок 32-битный
+mebel.exe упирается в предел адресного пространства 2 ГБ. Включённый
+контроль памяти замеряет до и после каждого пакета перезагрузки:
+
+ - число объектов сборщика мусора (gc.get_objects);
+ - занятую память по tracemalloc, если он включён, и её прирост по
+   каждому модулю (ReloadReport.memory_growth).
+
+Дополнительно можно очищать кэши functools.lru_cache старых функций
+перезагруженных модулей (clear_caches) и вызывать gc.collect после
+пакета (collect).
+
+По умолчанию контроль памяти выключен: gc.get_objects обходит все объекты
+интерпретатора и на большом сеансе стоит дороже самой перезагрузки.
+Включается через configure_memory_guard или в диалоге перезагрузки.
+
+configure_memory_guard(collect=True, clear_caches=True)
+report = auto_reload_module('my_module')
+print(report.memory)
+print(get_memory_guard().session_growth())
+"""
+
+import contextlib
+import gc
+import tracemalloc
+import types
+from collections import deque, namedtuple
+from typing import Iterable, List, Optional, Tuple
+
+
+# Сколько последних замеров хранить для оценки роста за сеанс
+HISTORY_SIZE = 200
+
+
+class MemoryReport(namedtuple('MemoryReport', 'objects_before objects_after traced_before traced_after '
+                                             'collected caches_cleared')):
+    """Память до и после пакета перезагрузки
+    _________________________________________
+
+     - objects_before, objects_after - <int> объектов сборщика мусора
+     - traced_before, traced_after - <int или None> байт по tracemalloc
+       (None, если tracemalloc не включён)
+     - collected - <int> объектов, освобождённых gc.collect (0 без collect)
+     - caches_cleared - <int> очищенных кэшей lru_cache старых функций
+    """
+
+    __slots__ = ()
+
+    @property
+    def growth(self) -> Tuple[int, Optional[int]]:
+        """(прирост объектов, прирост байт или None)"""
+        traced = None
+        if self.traced_before is not None and self.traced_after is not None:
+            traced = self.traced_after - self.traced_before
+        return self.objects_after - self.objects_before, traced
+
+    def __str__(self):
+        objects, traced = self.growth
+        parts = [f"объектов {objects:+d}"]
+        if traced is not None:
+            parts.append(f"память {traced / 1024:+.0f} КБ")
+        if self.collected:
+            parts.append(f"собрано {self.collected}")
+        if self.caches_cleared:
+            parts.append(f"очищено кэшей {self.caches_cleared}")
+        return ', '.join(parts)
+
+
+def _is_lru_cache(value: object) -> bool:
+    return callable(getattr(value, 'cache_clear', None)) and callable(getattr(value, 'cache_info', None))
+
+
+def _module_caches(module: types.ModuleType) -> List[object]:
+    """Кэши lru_cache модуля: функции модуля и методы его классов."""
+    name = module.__name__
+    caches = []
+    for value in list(module.__dict__.values()):
+        if getattr(value, '__module__', None) != name:
+            continue
+        if _is_lru_cache(value):
+            caches.append(value)
+        elif isinstance(value, type):
+            for attr in list(value.__dict__.values()):
+                attr = getattr(attr, '__func__', attr)
+                if _is_lru_cache(attr):
+                    caches.append(attr)
+    return caches
+
+
+class MemoryGuard:
+    """Контроль памяти при перезагрузке
+    ____________________________________
+
+    Именованные аргументы:
+
+     - enabled - <bool> замерять память до и после пакета перезагрузки
+       (по умолчанию выключено)
+     - collect - <bool> вызывать gc.collect после пакета
+     - clear_caches - <bool> очищать кэши lru_cache старых функций
+       перезагруженных модулей
+     - trace - <bool> включить tracemalloc при первом пакете (замедляет
+       выполнение; без него прирост по модулям не замеряется)
+    """
+
+    def __init__(self, enabled: bool = False, collect: bool = False, clear_caches: bool = False,
+                 trace: bool = False):
+        self.enabled = enabled
+        self.collect = collect
+        self.clear_caches = clear_caches
+        self.trace = trace
+        # (объектов, байт по tracemalloc или None) после каждого пакета
+        self.history: deque = deque(maxlen=HISTORY_SIZE)
+
+    @staticmethod
+    def _measure() -> Tuple[int, Optional[int]]:
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        return len(gc.get_objects()), traced
+
+    @contextlib.contextmanager
+    def batch(self, modules: Iterable[types.ModuleType], profiler=None):
+        """
+        Контекст пакета перезагрузки: замер памяти, очистка кэшей и сборка мусора.
+
+        Args:
+            modules (Iterable[types.ModuleType]): Модули пакета перезагрузки
+            profiler (ReloadProfiler, optional): Профилировщик; результат
+                записывается в report.memory
+        """
+        if not self.enabled:
+            yield None
+            return
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        old_caches = []
+        if self.clear_caches:
+            for module in modules:
+                old_caches.extend(_module_caches(module))
+        objects_before, traced_before = self._measure()
+        try:
+            yield self
+        finally:
+            cleared = 0
+            for cache in old_caches:
+                try:
+                    if cache.cache_info().currsize:
+                        cleared += 1
+                    cache.cache_clear()
+                except Exception:
+                    pass
+            old_caches = []
+            collected = gc.collect() if self.collect else 0
+            objects_after, traced_after = self._measure()
+            report = MemoryReport(objects_before, objects_after, traced_before, traced_after,
+                                  collected, cleared)
+            self.history.append((objects_after, traced_after))
+            if profiler is not None:
+                profiler.report.memory = report
+
+    def session_growth(self) -> Tuple[int, Optional[int]]:
+        """
+        Рост памяти между первым и последним замером сеанса.
+
+        Если память продолжает расти от пакета к пакету, перезагружаемые
+        модули удерживают старые объекты.
+
+        Returns:
+            Tuple[int, Optional[int]]: (прирост объектов, прирост байт или None)
+        """
+        if len(self.history) < 2:
+            return 0, None
+        (first_objects, first_traced), (last_objects, last_traced) = self.history[0], self.history[-1]
+        traced = None
+        if first_traced is not None and last_traced is not None:
+            traced = last_traced - first_traced
+        return last_objects - first_objects, traced
+
+
+_guard = None
+
+
+def get_memory_guard() -> MemoryGuard:
+    """
+    Получить общий для сеанса контроль памяти (по умолчанию выключен).
+
+    Returns:
+        MemoryGuard: Контроль памяти
+    """
+    global _guard
+    if _guard is None:
+        _guard = MemoryGuard()
+    return _guard
+
+
+def configure_memory_guard(enabled: bool = True, collect: bool = False, clear_caches: bool = False,
+                           trace: bool = False) -> MemoryGuard:
+    """
+    Заменить общий контроль памяти новым с указанными настройками.
+
+    Общий контроль памяти по умолчанию выключен (get_memory_guard), а вызов
+    configure_memory_guard включает его, если не передано enabled=False.
+
+    Args:
+        enabled (bool): Замерять память до и после пакета перезагрузки
+        collect (bool): Вызывать gc.collect после пакета
+        clear_caches (bool): Очищать кэши lru_cache старых функций
+        trace (bool): Включить tracemalloc для замера прироста по модулям
+
+    Returns:
+        MemoryGuard: Новый контроль памяти
+    """
+    global _guard
+    _guard = MemoryGuard(enabled, collect, clear_caches, trace)
+    return _guard
+
+
+def memory_guard(modules: Iterable[types.ModuleType], profiler=None):
+    """
+    Контекст пакета перезагрузки с общим контролем памяти.
+
+    Args:
+        modules (Iterable[types.ModuleType]): Модули пакета перезагрузки
+        profiler (ReloadProfiler, optional): Профилировщик для записи результата
+
+    Returns:
+        Контекстный менеджер
+    """
+    return get_memory_guard().batch(modules, profiler)
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        module_graph
+# Purpose:     Кэшируемый граф ссылок между загруженными модулями
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Граф ссылок между загруженными модулями.
+
+Узлы графа - модули, рёбра - ссылки из пространства имён модуля на другие
+модули: импортированные модули и объекты (классы, функции), определённые
+в других модулях. Пространство имён каждого модуля обходится один раз,
+результат кэшируется и сбрасывается только для перезагруженного узла.
+importlib.reload оставляет прежний объект модуля, поэтому каждая функция
+перезагрузки должна вызывать invalidate для перезагруженных модулей.
+"""
+
+import os
+import sys
+import types
+from typing import Dict, List, Tuple
+
+
+def _referenced_module(value):
+    """Модуль, на который ссылается значение атрибута, или None."""
+    if isinstance(value, types.ModuleType):
+        return value
+    if isinstance(value, (type, types.FunctionType)):
+        module_name = getattr(value, '__module__', None)
+        if isinstance(module_name, str):
+            return sys.modules.get(module_name)
+    return None
+
+
+class ModuleGraph:
+    """Граф ссылок между модулями
+    ______________________________
+
+    graph = ModuleGraph()
+    node_pkg_dict, node_depth_dict = graph.package_dependencies(package)
+    ...
+    importlib.reload(module)
+    graph.invalidate(module.__name__)
+    """
+
+    def __init__(self):
+        # имя модуля -> (объект модуля, кортеж модулей, на которые он ссылается)
+        self._nodes: Dict[str, Tuple[types.ModuleType, Tuple[types.ModuleType, ...]]] = {}
+        # имя корневого модуля -> (поколение графа, результат package_dependencies)
+        self._results: Dict[str, Tuple[int, Tuple[dict, dict]]] = {}
+        self._generation = 0
+
+    def _walk(self, module: types.ModuleType) -> Tuple[types.ModuleType, ...]:
+        children = []
+        seen = {id(module)}
+        for value in list(vars(module).values()):
+            child = _referenced_module(value)
+            if child is not None and id(child) not in seen:
+                seen.add(id(child))
+                children.append(child)
+        return tuple(children)
+
+    def children(self, module: types.ModuleType) -> Tuple[types.ModuleType, ...]:
+        """
+        Получить модули, на которые ссылается пространство имён модуля.
+
+        Args:
+            module (types.ModuleType): Модуль
+
+        Returns:
+            Tuple[types.ModuleType, ...]: Модули-потомки узла
+        """
+        name = module.__name__
+        node = self._nodes.get(name)
+        if node is None or node[0] is not module:
+            node = (module, self._walk(module))
+            self._nodes[name] = node
+            self._generation += 1
+        return node[1]
+
+    def invalidate(self, module_name: str) -> None:
+        """
+        Сбросить кэш узла, например после перезагрузки модуля.
+
+        Args:
+            module_name (str): Имя модуля
+        """
+        if self._nodes.pop(module_name, None) is not None:
+            self._generation += 1
+
+    def clear(self) -> None:
+        """Сбросить весь граф."""
+        self._nodes.clear()
+        self._results.clear()
+        self._generation += 1
+
+    def package_dependencies(self, package: types.ModuleType) -> Tuple[dict, dict]:
+        """
+        Найти модули пакета, достижимые из package, и их глубину.
+
+        Учитываются только модули, файлы которых лежат в директории package.
+        Глубина узла - длина самого длинного пути до него от package без учёта
+        рёбер, замыкающих циклы. Повторный вызов без сброса узлов возвращает
+        сохранённый результат.
+
+        Args:
+            package (types.ModuleType): Корневой модуль или пакет
+
+        Returns:
+            Tuple[dict, dict]: (имя файла -> модуль, имя файла -> глубина)
+        """
+        assert(hasattr(package, "__package__"))
+        cached = self._results.get(package.__name__)
+        if cached is not None and cached[0] == self._generation \
+                and self._nodes.get(package.__name__, (None,))[0] is package:
+            return cached[1]
+
+        fn = package.__file__
+        fn_dir = os.path.dirname(fn) + os.sep
+        node_pkg_dict = {fn: package}  # сопоставление имен файлов модуля с объектами модуля
+        non_back_links: Dict[str, List[str]] = {}  # рёбра без рёбер, замыкающих циклы
+        state = {fn: 1}  # 1 - узел в обработке, 2 - узел обработан
+        postorder = []
+        work = [(package, iter(self.children(package)))]
+        while work:
+            module, it = work[-1]
+            parent_fn = module.__file__
+            for child in it:
+                fn_child = getattr(child, "__file__", None)
+                # пропустить что-либо без имени файла или вне пакета
+                if (not isinstance(fn_child, str)) or (not fn_child.startswith(fn_dir)):
+                    continue
+                if state.get(fn_child) == 1:
+                    print(f"В графе зависимостей {child} обнаружен цикл!")
+                    continue
+                non_back_links.setdefault(parent_fn, []).append(fn_child)
+                if fn_child not in state:
+                    state[fn_child] = 1
+                    node_pkg_dict[fn_child] = child
+                    work.append((child, iter(self.children(child))))
+                    break
+            else:
+                state[parent_fn] = 2
+                postorder.append(parent_fn)
+                work.pop()
+
+        node_depth_dict = dict.fromkeys(postorder, 0)  # наибольшая глубина для каждого узла
+        for parent_fn in reversed(postorder):
+            for fn_child in non_back_links.get(parent_fn, ()):
+                node_depth_dict[fn_child] = max(node_depth_dict[fn_child],
+                                                node_depth_dict[parent_fn] + 1)
+
+        result = (node_pkg_dict, node_depth_dict)
+        self._results[package.__name__] = (self._generation, result)
+        return result
+
+    def __len__(self):
+        return len(self._nodes)
+
+
+_graph = None
+
+
+def get_module_graph() -> ModuleGraph:
+    """
+    Получить общий для сеанса граф модулей.
+
+    Returns:
+        ModuleGraph: Граф модулей
+    """
+    global _graph
+    if _graph is None:
+        _graph = ModuleGraph()
+    return _graph
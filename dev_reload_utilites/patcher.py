@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        patcher
+# Purpose:     Обновление устаревших ссылок на классы и функции после перезагрузки
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Обновление живых объектов после перезагрузки модулей.
+
+После importlib.reload объекты, созданные до перезагрузки, продолжают
+ссылаться на старые классы и функции: открытые диалоги, сохранённые
+экземпляры SetVar, обработчики, переданные в k3. Проход обновления после
+перезагрузки:
+
+ - подменяет __code__ (и значения по умолчанию) старых функций и методов
+   на код новых, поэтому все сохранённые ссылки выполняют новый код;
+ - подменяет __class__ у живых экземпляров старых классов.
+
+Экземпляры ищутся в реестре слабых ссылок (register_instance, tracked),
+в пространствах имён загруженных модулей и в атрибутах их классов
+(scan='modules', по умолчанию). Полный обход объектов сборщика мусора
+(scan='gc') находит и экземпляры внутри списков, словарей и других
+объектов, но просматривает всю память процесса, поэтому включается только
+явно. Учитываются только классы и функции, определённые в перезагруженных
+модулях.
+
+patcher = ReferencePatcher(modules)
+for module in modules:
+    importlib.reload(module)
+print(patcher.apply())
+"""
+
+import contextlib
+import functools
+import gc
+import sys
+import types
+import weakref
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+PatchStats = namedtuple('PatchStats', 'functions classes instances failures')
+PatchStats.__doc__ = """Результат прохода обновления.
+
+ - functions - <int> функций и методов с подменённым кодом
+ - classes - <int> классов, для которых искались экземпляры
+ - instances - <int> экземпляров с подменённым __class__
+ - failures - <int> объектов, которые не удалось обновить
+"""
+
+# Где искать экземпляры старых классов по умолчанию: 'registry', 'modules' или 'gc'
+DEFAULT_SCAN = 'modules'
+
+_SCANS = ('registry', 'modules', 'gc')
+
+# Реестр экземпляров: id объекта -> объект (слабая ссылка)
+_registry = weakref.WeakValueDictionary()
+
+
+def register_instance(obj: object) -> object:
+    """
+    Зарегистрировать объект, чтобы после перезагрузки обновить его класс без обхода памяти.
+
+    Args:
+        obj (object): Объект, поддерживающий слабые ссылки
+
+    Returns:
+        object: Тот же объект
+    """
+    try:
+        _registry[id(obj)] = obj
+    except TypeError:
+        pass
+    return obj
+
+
+def tracked(cls: type) -> type:
+    """
+    Декоратор класса: все создаваемые экземпляры регистрируются в реестре.
+
+    @tracked
+    class MyDialog(SetVar):
+        ...
+    """
+    init = cls.__init__
+
+    @functools.wraps(init)
+    def __init__(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        register_instance(self)
+
+    cls.__init__ = __init__
+    return cls
+
+
+def _own_objects(module_name: str, namespace: Dict[str, object]) -> Dict[str, object]:
+    """Классы и функции, определённые в самом модуле."""
+    return {name: value for name, value in namespace.items()
+            if isinstance(value, (type, types.FunctionType))
+            and getattr(value, '__module__', None) == module_name}
+
+
+def _function_of(value: object) -> Optional[types.FunctionType]:
+    if isinstance(value, (staticmethod, classmethod)):
+        value = value.__func__
+    return value if isinstance(value, types.FunctionType) else None
+
+
+def _patch_function(old: types.FunctionType, new: types.FunctionType) -> int:
+    if old is new:
+        return 0
+    old.__code__ = new.__code__
+    old.__defaults__ = new.__defaults__
+    old.__kwdefaults__ = new.__kwdefaults__
+    old.__doc__ = new.__doc__
+    # Обёртка декоратора (functools.wraps) ссылается на старую исходную функцию
+    old_wrapped = _function_of(getattr(old, '__wrapped__', None))
+    new_wrapped = _function_of(getattr(new, '__wrapped__', None))
+    if old_wrapped is not None and new_wrapped is not None:
+        return 1 + _patch_function(old_wrapped, new_wrapped)
+    return 1
+
+
+class ReferencePatcher:
+    """Обновление ссылок на объекты перезагружаемых модулей
+    ________________________________________________________
+
+    Создаётся до перезагрузки (запоминает старые классы и функции),
+    apply вызывается после успешной перезагрузки.
+
+    Именованные аргументы:
+
+     - scan - <'registry', 'modules', 'gc'> где искать экземпляры старых
+       классов: только в реестре; ещё и в пространствах имён загруженных
+       модулей и атрибутах их классов; ещё и обходом всех объектов сборщика
+       мусора. По умолчанию DEFAULT_SCAN.
+    """
+
+    def __init__(self, modules: Iterable[types.ModuleType], scan: Optional[str] = None):
+        if scan is None:
+            scan = DEFAULT_SCAN
+        if scan not in _SCANS:
+            raise ValueError(f"Неизвестный способ поиска экземпляров: {scan}")
+        self.scan = scan
+        # (модуль, старые классы и функции модуля)
+        self._old: List[Tuple[types.ModuleType, Dict[str, object]]] = [
+            (module, _own_objects(module.__name__, module.__dict__)) for module in modules]
+
+    def _candidates(self) -> Iterable[object]:
+        """Объекты, среди которых ищутся экземпляры старых классов."""
+        yield from list(_registry.values())
+        if self.scan == 'gc':
+            yield from gc.get_objects()
+        elif self.scan == 'modules':
+            for module in list(sys.modules.values()):
+                namespace = getattr(module, '__dict__', None)
+                if not isinstance(namespace, dict):
+                    continue
+                for value in list(namespace.values()):
+                    yield value
+                    if isinstance(value, type):
+                        yield from list(value.__dict__.values())
+
+    def _instances(self, classes: Dict[type, type]) -> Iterable[object]:
+        if not classes:
+            return
+        seen = set()
+        for obj in self._candidates():
+            if type(obj) in classes and id(obj) not in seen:
+                seen.add(id(obj))
+                yield obj
+
+    def apply(self) -> PatchStats:
+        """
+        Обновить старые функции, методы и экземпляры старых классов.
+
+        Returns:
+            PatchStats: Количество обновлённых объектов
+        """
+        functions = failures = instances = 0
+        classes: Dict[type, type] = {}
+        for module, old_objects in self._old:
+            new_objects = _own_objects(module.__name__, module.__dict__)
+            for name, old in old_objects.items():
+                new = new_objects.get(name)
+                if new is None or new is old or type(new) is not type(old):
+                    continue
+                if isinstance(old, types.FunctionType):
+                    pairs = [(old, new)]
+                else:
+                    classes[old] = new
+                    pairs = [(_function_of(value), _function_of(new.__dict__.get(attr)))
+                             for attr, value in old.__dict__.items()]
+                for old_function, new_function in pairs:
+                    if old_function is None or new_function is None:
+                        continue
+                    try:
+                        functions += _patch_function(old_function, new_function)
+                    except (ValueError, TypeError):
+                        # Различается набор свободных переменных замыкания
+                        failures += 1
+        for obj in self._instances(classes):
+            try:
+                obj.__class__ = classes[type(obj)]
+                instances += 1
+            except TypeError:
+                # Несовместимое размещение в памяти (например, другие __slots__)
+                failures += 1
+        self._old = []
+        return PatchStats(functions, len(classes), instances, failures)
+
+
+@contextlib.contextmanager
+def reference_patching(modules: Iterable[types.ModuleType], enabled: bool = True):
+    """
+    Контекст перезагрузки: обновить ссылки, если перезагрузка завершилась без ошибок.
+
+    Args:
+        modules (Iterable[types.ModuleType]): Модули пакета перезагрузки
+        enabled (bool): Выполнять проход обновления
+    """
+    if not enabled:
+        yield None
+        return
+    patcher = ReferencePatcher(modules)
+    yield patcher
+    stats = patcher.apply()
+    print(f"Обновлены ссылки: функций {stats.functions}, экземпляров {stats.instances}"
+          + (f", не удалось обновить {stats.failures}" if stats.failures else ""))
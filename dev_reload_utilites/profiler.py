@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        profiler
+# Purpose:     Замер времени перезагрузки модулей
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Профилировщик перезагрузки модулей.
+
+Каждый вызов importlib.reload в функциях перезагрузки выполняется через
+ReloadProfiler. Профилировщик замеряет время каждого модуля, время поиска
+зависимостей и общее время, запоминает ошибки и возвращает отчёт
+ReloadReport. Отчёт дописывается в журнал перезагрузок (journal) и может
+быть записан в журнал через loguru.
+
+profiler = ReloadProfiler('auto_reload_module', 'my_module', log=True)
+with profiler.discovery():
+    plan = plan_reload('my_module')
+for name in plan:
+    profiler.reload(sys.modules[name])
+report = profiler.finish()
+print(report.summary())
+"""
+
+import heapq
+import importlib
+import time
+import tracemalloc
+import types
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from dev_reload_utilites.journal import get_journal
+
+
+ModuleTiming = namedtuple('ModuleTiming', 'name seconds error')
+ModuleTiming.__doc__ = """Результат перезагрузки одного модуля.
+
+ - name - <str> имя модуля
+ - seconds - <float> время перезагрузки в секундах
+ - error - <str> текст ошибки или None
+"""
+
+# Последнее измеренное время перезагрузки модулей: имя модуля -> секунды
+_last_durations: Dict[str, float] = {}
+
+_last_report = None
+
+
+class ReloadReport:
+    """Отчёт о перезагрузке
+    ________________________
+
+     - strategy - <str> имя функции перезагрузки
+     - target - <str> имя модуля или префикс, переданные функции
+     - started - <float> время начала (time.time())
+     - discovery_seconds - <float> время поиска зависимостей
+     - total_seconds - <float> общее время
+     - modules - <list> ModuleTiming в порядке перезагрузки
+     - skipped - <bool> перезагрузка не потребовалась
+     - rolled_back - <bool> после ошибки пространства имён модулей восстановлены
+     - memory - <MemoryReport или None> память до и после пакета (memory_guard)
+     - memory_growth - <dict> имя модуля -> прирост байт по tracemalloc
+       (заполняется, только если tracemalloc включён)
+    """
+
+    def __init__(self, strategy: str, target: str, started: float):
+        self.strategy = strategy
+        self.target = target
+        self.started = started
+        self.discovery_seconds = 0.0
+        self.total_seconds = 0.0
+        self.modules: List[ModuleTiming] = []
+        self.skipped = False
+        self.rolled_back = False
+        self.memory = None
+        self.memory_growth: Dict[str, int] = {}
+
+    @property
+    def reload_seconds(self) -> float:
+        """Суммарное время вызовов importlib.reload."""
+        return sum(timing.seconds for timing in self.modules)
+
+    @property
+    def reloaded(self) -> Tuple[str, ...]:
+        """Имена успешно перезагруженных модулей."""
+        return tuple(timing.name for timing in self.modules if timing.error is None)
+
+    @property
+    def failures(self) -> Tuple[ModuleTiming, ...]:
+        """Модули, перезагрузка которых завершилась ошибкой."""
+        return tuple(timing for timing in self.modules if timing.error is not None)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    def slowest(self, n: int = 5) -> List[ModuleTiming]:
+        """Самые медленные модули."""
+        return sorted(self.modules, key=lambda timing: timing.seconds, reverse=True)[:n]
+
+    def summary(self) -> str:
+        """Текстовая сводка отчёта."""
+        lines = [f"{self.strategy}({self.target!r}): "
+                 f"{len(self.reloaded)} модулей за {self.total_seconds:.3f} с "
+                 f"(поиск зависимостей {self.discovery_seconds:.3f} с, "
+                 f"перезагрузка {self.reload_seconds:.3f} с)"]
+        if self.skipped:
+            lines.append("  перезагрузка не потребовалась")
+        if self.rolled_back:
+            lines.append("  изменения отменены, состояние модулей восстановлено")
+        if self.memory is not None:
+            lines.append(f"  память: {self.memory}")
+        growth = heapq.nlargest(3, self.memory_growth.items(), key=lambda item: item[1])
+        growth = [f"{name} {size / 1024:+.0f} КБ" for name, size in growth if size > 0]
+        if growth:
+            lines.append(f"  прирост памяти: {', '.join(growth)}")
+        for timing in self.slowest():
+            lines.append(f"  {timing.seconds:.3f} с - {timing.name}")
+        for timing in self.failures:
+            lines.append(f"  ошибка {timing.name}: {timing.error}")
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return (f"<ReloadReport {self.strategy}({self.target!r}) modules={len(self.modules)} "
+                f"failures={len(self.failures)} total={self.total_seconds:.3f}s>")
+
+
+class ReloadProfiler:
+    """Замер времени одного запуска перезагрузки
+    _____________________________________________
+
+    Именованные аргументы:
+
+     - log - <bool> записать сводку отчёта через loguru при завершении
+    """
+
+    def __init__(self, strategy: str, target: str, log: bool = False):
+        self.log = log
+        self._start = time.perf_counter()
+        self.report = ReloadReport(strategy, target, time.time())
+
+    @contextmanager
+    def discovery(self):
+        """Контекст, время которого учитывается как поиск зависимостей."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.report.discovery_seconds += time.perf_counter() - start
+
+    def reload(self, module: types.ModuleType, name: Optional[str] = None) -> types.ModuleType:
+        """
+        Перезагрузить модуль с замером времени.
+
+        Ошибка перезагрузки записывается в отчёт и пробрасывается дальше.
+
+        Args:
+            module (types.ModuleType): Модуль
+            name (str, optional): Имя модуля для отчёта. По умолчанию module.__name__
+
+        Returns:
+            types.ModuleType: Перезагруженный модуль
+        """
+        if name is None:
+            name = getattr(module, '__name__', repr(module))
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        start = time.perf_counter()
+        try:
+            result = importlib.reload(module)
+        except Exception as e:
+            self.report.modules.append(ModuleTiming(name, time.perf_counter() - start, str(e)))
+            raise
+        seconds = time.perf_counter() - start
+        if traced is not None and tracemalloc.is_tracing():
+            self.report.memory_growth[name] = tracemalloc.get_traced_memory()[0] - traced
+        self.report.modules.append(ModuleTiming(name, seconds, None))
+        _last_durations[name] = seconds
+        return result
+
+    def skip(self) -> None:
+        """Отметить, что перезагрузка не потребовалась."""
+        self.report.skipped = True
+
+    def finish(self) -> ReloadReport:
+        """Завершить замер и вернуть отчёт."""
+        global _last_report
+        self.report.total_seconds = time.perf_counter() - self._start
+        _last_report = self.report
+        try:
+            get_journal().append(self.report)
+        except Exception as e:
+            print(f"Ошибка записи журнала перезагрузок: {e}")
+        if self.log:
+            # loguru импортируется только при записи сводки
+            from loguru import logger
+            if self.report.ok:
+                logger.info(self.report.summary())
+            else:
+                logger.error(self.report.summary())
+        return self.report
+
+
+def last_report() -> Optional[ReloadReport]:
+    """Отчёт последнего запуска перезагрузки (в том числе завершившегося ошибкой)."""
+    return _last_report
+
+
+def last_reload_time(module_name: str) -> Optional[float]:
+    """
+    Последнее измеренное время перезагрузки модуля.
+
+    Args:
+        module_name (str): Имя модуля
+
+    Returns:
+        Optional[float]: Секунды или None, если модуль ещё не перезагружался
+    """
+    return _last_durations.get(module_name)
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        reload_planner
+# Purpose:     План перезагрузки: транзитивное замыкание зависимых модулей
+#              в топологическом порядке
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Планировщик перезагрузки модулей.
+
+Планировщик находит полное транзитивное замыкание модулей, зависящих от
+изменённого, и упорядочивает его топологически: сначала поставщики, затем
+потребители. Циклические импорты объединяются в компоненты сильной связности,
+которые перезагружаются как единое целое. План возвращается в виде данных
+(ReloadPlan), его можно посмотреть до выполнения и выполнить функцией
+execute_plan.
+
+plan = plan_reload('my_module')
+print(plan.modules)
+execute_plan(plan)
+"""
+
+import importlib
+import sys
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from dev_reload_utilites.fingerprint import get_fingerprint_store
+from dev_reload_utilites.import_index import ImportIndex, get_index
+from dev_reload_utilites.memory_guard import memory_guard
+from dev_reload_utilites.module_graph import get_module_graph
+from dev_reload_utilites.patcher import reference_patching
+from dev_reload_utilites.profiler import ReloadProfiler, last_reload_time
+from dev_reload_utilites.transaction import reload_transaction
+from dev_reload_utilites.validation import validate_batch
+
+
+class ReloadPlan:
+    """План перезагрузки
+    _____________________
+
+     - roots - <tuple> изменённые модули, с которых начинается перезагрузка
+     - groups - <tuple> шаги перезагрузки в порядке выполнения. Каждый шаг -
+       кортеж имён модулей одной компоненты сильной связности; шаг из
+       нескольких модулей означает циклический импорт.
+    """
+
+    def __init__(self, roots: Iterable[str], groups: Iterable[Sequence[str]]):
+        self.roots = tuple(roots)
+        self.groups = tuple(tuple(group) for group in groups)
+
+    @property
+    def modules(self) -> Tuple[str, ...]:
+        """Все модули плана в порядке перезагрузки."""
+        return tuple(name for group in self.groups for name in group)
+
+    @property
+    def cycles(self) -> Tuple[Tuple[str, ...], ...]:
+        """Шаги плана, образованные циклическими импортами."""
+        return tuple(group for group in self.groups if len(group) > 1)
+
+    def __len__(self):
+        return sum(len(group) for group in self.groups)
+
+    def __iter__(self):
+        return iter(self.modules)
+
+    def __repr__(self):
+        return f"<ReloadPlan roots={self.roots} groups={self.groups}>"
+
+
+class ReloadEstimate:
+    """Оценка перезагрузки без её выполнения
+    __________________________________________
+
+     - strategy - <str> имя функции перезагрузки
+     - target - <str> имя модуля или префикс, переданные функции
+     - modules - <tuple> имена модулей в порядке перезагрузки
+     - durations - <tuple> последнее измеренное время перезагрузки каждого
+       модуля в секундах или None, если модуль ещё не перезагружался
+     - skipped - <bool> перезагрузка не потребуется
+    """
+
+    def __init__(self, strategy: str, target: str, modules: Iterable[str], skipped: bool = False):
+        self.strategy = strategy
+        self.target = target
+        self.modules = tuple(modules)
+        self.durations = tuple(last_reload_time(name) for name in self.modules)
+        self.skipped = skipped
+
+    @property
+    def estimated_seconds(self) -> float:
+        """Оценка общего времени по модулям, для которых есть замеры."""
+        return sum(seconds for seconds in self.durations if seconds is not None)
+
+    @property
+    def unmeasured(self) -> Tuple[str, ...]:
+        """Модули, для которых ещё нет замеров."""
+        return tuple(name for name, seconds in zip(self.modules, self.durations) if seconds is None)
+
+    def header(self) -> str:
+        """Одна строка с количеством модулей и оценкой времени."""
+        if self.skipped:
+            return f"{self.strategy}: перезагрузка не требуется"
+        text = f"{self.strategy}: {len(self.modules)} модулей, ~{self.estimated_seconds:.3f} с"
+        if self.unmeasured:
+            text += f" (нет замеров для {len(self.unmeasured)})"
+        return text
+
+    def lines(self, limit: Optional[int] = None) -> List[str]:
+        """Строки плана: время и имя каждого модуля в порядке перезагрузки."""
+        lines = []
+        for name, seconds in list(zip(self.modules, self.durations))[:limit]:
+            lines.append(f"{seconds:.3f} с - {name}" if seconds is not None else f"? с - {name}")
+        if limit is not None and len(self.modules) > limit:
+            lines.append(f"... ещё {len(self.modules) - limit}")
+        return lines
+
+    def summary(self) -> str:
+        """Текстовая сводка плана."""
+        return '\n'.join([self.header()] + ['  ' + line for line in self.lines()])
+
+    def __len__(self):
+        return len(self.modules)
+
+    def __iter__(self):
+        return iter(self.modules)
+
+    def __repr__(self):
+        return (f"<ReloadEstimate {self.strategy}({self.target!r}) modules={len(self.modules)} "
+                f"estimated={self.estimated_seconds:.3f}s>")
+
+
+def _as_names(module_names: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+    if isinstance(module_names, str):
+        return (module_names,)
+    return tuple(module_names)
+
+
+def _prepared_index(index: Optional[ImportIndex]) -> ImportIndex:
+    if index is None:
+        index = get_index()
+        index.refresh()
+        index.save()
+    return index
+
+
+def dependency_closure(module_names: Union[str, Iterable[str]],
+                       index: Optional[ImportIndex] = None) -> Set[str]:
+    """
+    Найти транзитивное замыкание модулей, зависящих от указанных.
+
+    Args:
+        module_names (str | Iterable[str]): Имя модуля или несколько имён
+        index (ImportIndex, optional): Индекс импортов. По умолчанию общий
+            индекс сеанса, обновлённый по sys.modules.
+
+    Returns:
+        Set[str]: Указанные модули и все их прямые и косвенные импортёры
+    """
+    index = _prepared_index(index)
+    closure = set(_as_names(module_names))
+    queue = deque(closure)
+    while queue:
+        name = queue.popleft()
+        for dependent in index.dependents(name):
+            if dependent not in closure:
+                closure.add(dependent)
+                queue.append(dependent)
+    return closure
+
+
+def strongly_connected_components(nodes: Iterable[str],
+                                  edges: Dict[str, Sequence[str]]) -> List[Tuple[str, ...]]:
+    """
+    Найти компоненты сильной связности графа (итеративный алгоритм Тарьяна).
+
+    Компоненты возвращаются в обратном топологическом порядке: компонента
+    идёт после всех компонент, до которых из неё можно дойти по рёбрам.
+    Если ребро ведёт от импортёра к импортируемому модулю, то поставщики
+    оказываются раньше потребителей.
+
+    Args:
+        nodes (Iterable[str]): Узлы графа
+        edges (Dict[str, Sequence[str]]): Смежность узел -> последователи
+
+    Returns:
+        List[Tuple[str, ...]]: Компоненты, узлы внутри компоненты отсортированы
+    """
+    index_of: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    result: List[Tuple[str, ...]] = []
+    counter = 0
+
+    for start in nodes:
+        if start in index_of:
+            continue
+        index_of[start] = lowlink[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        work = [(start, iter(edges.get(start, ())))]
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for succ in successors:
+                if succ not in index_of:
+                    index_of[succ] = lowlink[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(edges.get(succ, ()))))
+                    advanced = True
+                    break
+                elif succ in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[succ])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                result.append(tuple(sorted(component)))
+    return result
+
+
+def _provider_edges(modules: Set[str], index: ImportIndex) -> Dict[str, List[str]]:
+    """Рёбра импортёр -> импортируемый модуль внутри набора modules."""
+    edges = {}
+    for name in modules:
+        providers = set()
+        for imported in index.imports_of(name):
+            parts = imported.split('.')
+            for i in range(1, len(parts) + 1):
+                prefix = '.'.join(parts[:i])
+                if prefix in modules and prefix != name:
+                    providers.add(prefix)
+        edges[name] = sorted(providers)
+    return edges
+
+
+def order_modules(modules: Iterable[str], index: ImportIndex,
+                  roots: Iterable[str] = ()) -> List[Tuple[str, ...]]:
+    """
+    Упорядочить модули так, чтобы поставщики шли раньше потребителей.
+
+    Args:
+        modules (Iterable[str]): Имена модулей
+        index (ImportIndex): Индекс импортов
+        roots (Iterable[str]): Модули, которые ставятся первыми внутри своего цикла
+
+    Returns:
+        List[Tuple[str, ...]]: Шаги перезагрузки (компоненты сильной связности)
+    """
+    modules = set(modules)
+    roots = set(roots)
+    components = strongly_connected_components(sorted(modules), _provider_edges(modules, index))
+    return [tuple(sorted(group, key=lambda name: (name not in roots, name)))
+            for group in components]
+
+
+def plan_reload(module_names: Union[str, Iterable[str]],
+                index: Optional[ImportIndex] = None) -> ReloadPlan:
+    """
+    Построить план перезагрузки изменённых модулей и всех зависящих от них.
+
+    Args:
+        module_names (str | Iterable[str]): Имя изменённого модуля или несколько имён
+        index (ImportIndex, optional): Индекс импортов. По умолчанию общий
+            индекс сеанса, обновлённый по sys.modules.
+
+    Returns:
+        ReloadPlan: План, в котором каждый модуль встречается ровно один раз
+    """
+    roots = _as_names(module_names)
+    index = _prepared_index(index)
+    closure = dependency_closure(roots, index)
+    return ReloadPlan(roots, order_modules(closure, index, roots))
+
+
+def execute_plan(plan: ReloadPlan, profiler: Optional[ReloadProfiler] = None,
+                 transactional: bool = False, patch_references: bool = False) -> List[str]:
+    """
+    Выполнить план перезагрузки.
+
+    Модули, которых нет в sys.modules, пропускаются. Перед перезагрузкой
+    проверяется синтаксис всех модулей плана (validation). Для
+    перезагруженных модулей записывается отпечаток содержимого (fingerprint) и сбрасывается узел
+    общего графа модулей (module_graph). Если включён общий контроль
+    памяти (memory_guard), замеряется память до и после пакета.
+
+    Args:
+        plan (ReloadPlan): План перезагрузки
+        profiler (ReloadProfiler, optional): Профилировщик для замера времени
+        transactional (bool): При ошибке восстановить пространства имён всех
+            модулей плана (transaction.ReloadTransaction)
+        patch_references (bool): После успешной перезагрузки обновить живые
+            экземпляры и старые функции (patcher.ReferencePatcher)
+
+    Returns:
+        List[str]: Имена перезагруженных модулей в порядке перезагрузки
+
+    Raises:
+        ReloadValidationError: Если в модулях плана есть синтаксические ошибки.
+            В этом случае ни один модуль не перезагружается.
+    """
+    store = get_fingerprint_store()
+    graph = get_module_graph()
+    modules = [sys.modules[name] for name in plan.modules if name in sys.modules]
+    validate_batch(modules, profiler)
+    reloaded = []
+    with memory_guard(modules, profiler), \
+            reference_patching(modules, patch_references), \
+            reload_transaction(modules, transactional, profiler):
+        for group in plan.groups:
+            for name in group:
+                module = sys.modules.get(name)
+                if module is None:
+                    continue
+                if profiler is not None:
+                    profiler.reload(module, name)
+                else:
+                    importlib.reload(module)
+                graph.invalidate(name)
+                store.mark_modules_clean([module])
+                reloaded.append(name)
+                if name in plan.roots:
+                    print(f"Перезагружен модуль {name}")
+                else:
+                    print(f"Перезагружен зависимый модуль {name}")
+    return reloaded
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        scan_scope
+# Purpose:     Классификация загруженных модулей по происхождению
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Область поиска зависимостей.
+
+В sys.modules внутри mebel.exe тысячи модулей: стандартная библиотека,
+loguru, colorama, скомпилированный пакет k3. Ни один из них не может
+импортировать модули из Proto, поэтому поиск зависимых модулей и функции
+перезагрузки должны рассматривать только пользовательский код.
+
+Модуль относится к одной из областей по корню пути своего файла:
+
+ - PROTO - директория Proto (find_proto_path)
+ - USER - прочий пользовательский код вне библиотек Python
+ - STDLIB - стандартная библиотека
+ - SITE - site-packages
+ - COMPILED - встроенные, "замороженные" и скомпилированные модули без .py файла
+
+Результат классификации кэшируется по директории файла. Модули, которые
+importlib.reload перезагрузить не может (__main__ и модули с __spec__ = None),
+не перечисляются вовсе.
+
+scope = get_scan_scope()
+user_modules = [name for name, module in scope.iter_modules()]
+"""
+
+import os
+import site
+import sys
+import sysconfig
+import threading
+import types
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dev_reload_utilites.find_recent_py_files import find_proto_path
+
+
+PROTO = 'proto'
+USER = 'user'
+STDLIB = 'stdlib'
+SITE = 'site-packages'
+COMPILED = 'compiled'
+
+# Области, модули которых просматриваются по умолчанию
+USER_SCOPES = frozenset((PROTO, USER))
+
+
+def is_reloadable(name: str, module: types.ModuleType) -> bool:
+    """
+    Проверить, может ли importlib.reload перезагрузить модуль.
+
+    Скрипт, запущенный в K3 через ;macro, выполняется как __main__: его файл
+    лежит в пользовательском коде, но importlib.reload('__main__') падает
+    с ModuleNotFoundError. То же происходит с модулями, у которых
+    __spec__ равен None. Объекты без атрибута __spec__ (заглушки модулей)
+    не отбрасываются.
+
+    Args:
+        name (str): Имя модуля в sys.modules
+        module (types.ModuleType): Модуль
+
+    Returns:
+        bool: True, если модуль можно перезагрузить
+    """
+    return name != '__main__' and getattr(module, '__spec__', module) is not None
+
+
+def _normalize_dir(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path)).rstrip(os.sep) + os.sep
+
+
+def _site_dirs() -> List[str]:
+    dirs = []
+    get_site = getattr(site, 'getsitepackages', None)
+    if get_site is not None:
+        dirs.extend(get_site())
+    get_user_site = getattr(site, 'getusersitepackages', None)
+    if get_user_site is not None:
+        dirs.append(get_user_site())
+    paths = sysconfig.get_paths()
+    dirs.extend(paths[key] for key in ('purelib', 'platlib') if key in paths)
+    return dirs
+
+
+def _stdlib_dirs() -> List[str]:
+    paths = sysconfig.get_paths()
+    dirs = [paths[key] for key in ('stdlib', 'platstdlib') if key in paths]
+    # Во встроенном интерпретаторе sysconfig может указывать не туда:
+    # директория модуля os надёжно указывает на стандартную библиотеку
+    dirs.append(os.path.dirname(os.__file__))
+    return dirs
+
+
+class ScanScope:
+    """Классификация модулей по областям
+    _____________________________________
+
+    Именованные аргументы:
+
+     - proto_dir - <str> директория Proto. По умолчанию find_proto_path().
+     - include - <Iterable[str]> области, модули которых просматриваются
+     - library_dirs - <Iterable[str]> дополнительные директории, модули из
+       которых относятся к SITE
+    """
+
+    def __init__(self, proto_dir: str = None, include: Iterable[str] = USER_SCOPES,
+                 library_dirs: Iterable[str] = ()):
+        if proto_dir is None:
+            proto_dir = find_proto_path()
+            # find_proto_path возвращает '.', если Proto не найдена
+            if proto_dir == '.':
+                proto_dir = None
+        self.include = frozenset(include)
+        roots: List[Tuple[str, str]] = []
+        if proto_dir:
+            roots.append((_normalize_dir(proto_dir), PROTO))
+        roots.extend((_normalize_dir(path), SITE) for path in list(_site_dirs()) + list(library_dirs))
+        roots.extend((_normalize_dir(path), STDLIB) for path in _stdlib_dirs())
+        # Самый длинный корень проверяется первым: site-packages лежит внутри stdlib
+        self._roots = sorted(set(roots), key=lambda root: len(root[0]), reverse=True)
+        self._lock = threading.Lock()
+        self._dir_cache: Dict[str, str] = {}
+
+    def classify_path(self, path: str) -> str:
+        """
+        Определить область по пути к файлу модуля.
+
+        Args:
+            path (str): Путь к файлу
+
+        Returns:
+            str: Одна из областей PROTO, USER, STDLIB, SITE, COMPILED
+        """
+        if not path.endswith('.py'):
+            return COMPILED
+        directory = os.path.dirname(path)
+        with self._lock:
+            scope = self._dir_cache.get(directory)
+        if scope is None:
+            normalized = _normalize_dir(directory)
+            scope = USER
+            for root, root_scope in self._roots:
+                if normalized.startswith(root):
+                    scope = root_scope
+                    break
+            with self._lock:
+                self._dir_cache[directory] = scope
+        return scope
+
+    def classify(self, module: types.ModuleType) -> str:
+        """
+        Определить область модуля.
+
+        Args:
+            module (types.ModuleType): Модуль
+
+        Returns:
+            str: Одна из областей PROTO, USER, STDLIB, SITE, COMPILED
+        """
+        path = getattr(module, '__file__', None)
+        if not isinstance(path, str):
+            return COMPILED
+        return self.classify_path(path)
+
+    def is_included_path(self, path: str) -> bool:
+        """Проверить, просматривается ли файл модуля."""
+        return self.classify_path(path) in self.include
+
+    def is_included(self, module: types.ModuleType) -> bool:
+        """Проверить, просматривается ли модуль."""
+        return self.classify(module) in self.include
+
+    def iter_modules(self, modules: Optional[Dict[str, types.ModuleType]] = None
+                     ) -> Iterator[Tuple[str, types.ModuleType]]:
+        """
+        Перечислить просматриваемые модули.
+
+        Args:
+            modules (Dict[str, types.ModuleType], optional): Модули. По умолчанию sys.modules.
+
+        Returns:
+            Iterator[Tuple[str, types.ModuleType]]: Пары (имя модуля, модуль)
+        """
+        if modules is None:
+            modules = sys.modules
+        for name, module in list(modules.items()):
+            if module is not None and is_reloadable(name, module) and self.is_included(module):
+                yield name, module
+
+    def clear_cache(self) -> None:
+        """Сбросить кэш классификации директорий."""
+        with self._lock:
+            self._dir_cache.clear()
+
+
+_scope = None
+
+
+def get_scan_scope() -> ScanScope:
+    """
+    Получить общую для сеанса область поиска.
+
+    Returns:
+        ScanScope: Область поиска
+    """
+    global _scope
+    if _scope is None:
+        _scope = ScanScope()
+    return _scope
+
+
+def configure_scan_scope(proto_dir: str = None, include: Iterable[str] = USER_SCOPES,
+                         library_dirs: Iterable[str] = ()) -> ScanScope:
+    """
+    Заменить общую для сеанса область поиска.
+
+    configure_scan_scope(include=(PROTO,))  # только модули из Proto
+
+    Args:
+        proto_dir (str): Директория Proto. По умолчанию find_proto_path().
+        include (Iterable[str]): Просматриваемые области
+        library_dirs (Iterable[str]): Дополнительные директории библиотек
+
+    Returns:
+        ScanScope: Новая область поиска
+    """
+    global _scope
+    _scope = ScanScope(proto_dir, include, library_dirs)
+    return _scope
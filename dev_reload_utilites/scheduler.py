@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        scheduler
+# Purpose:     Отложенная перезагрузка: объединение пачки изменений в один план
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Планировщик отложенной перезагрузки.
+
+"Сохранить всё" в редакторе или переключение ветки меняет десятки файлов
+за доли секунды. Если каждое событие запускает свою перезагрузку, общие
+зависимые модули перезагружаются снова и снова. Планировщик собирает
+события в один набор изменённых модулей и ждёт, пока изменения не
+прекратятся на quiet секунд (но не дольше max_delay секунд от первого
+события). Затем набор перезагружается одним планом (plan_reload), в
+котором каждый модуль встречается один раз.
+
+События можно передавать из любого потока (notify). Перезагрузка
+выполняется в потоке, который вызывает run_pending (в mebel.exe - главный
+поток, например из ReloadServer.process_pending).
+
+scheduler = get_scheduler()
+scheduler.notify(['pkg.a', 'pkg.b'])
+...
+report = scheduler.run_pending()
+print(scheduler.stats())
+"""
+
+import sys
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from dev_reload_utilites.fingerprint import get_fingerprint_store
+from dev_reload_utilites.import_index import get_index
+from dev_reload_utilites.profiler import ReloadProfiler, ReloadReport
+from dev_reload_utilites.reload_planner import dependency_closure, execute_plan, plan_reload
+from dev_reload_utilites.watcher import get_watcher
+
+
+# Сколько секунд без новых событий ждать перед перезагрузкой
+QUIET_SECONDS = 0.3
+
+# Наибольшая задержка перезагрузки от первого события пачки, секунды
+MAX_DELAY_SECONDS = 5.0
+
+SchedulerStats = namedtuple('SchedulerStats', 'events batches naive_reloads reloads saved')
+SchedulerStats.__doc__ = """Счётчики планировщика с начала сеанса.
+
+ - events - <int> принятых событий (вызовов notify)
+ - batches - <int> выполненных перезагрузок (пачек событий)
+ - naive_reloads - <int> перезагрузок модулей, если бы каждое событие
+   перезагружалось отдельно
+ - reloads - <int> фактически перезагруженных модулей
+ - saved - <int> сэкономлено перезагрузок модулей (naive_reloads - reloads)
+"""
+
+
+class ReloadScheduler:
+    """Объединение событий изменения в одну перезагрузку
+    _____________________________________________________
+
+    Именованные аргументы:
+
+     - quiet - <float> сколько секунд без событий ждать перед перезагрузкой
+     - max_delay - <float> наибольшая задержка от первого события пачки
+     - transactional - <bool> откатывать пространства имён при ошибке
+     - patch_references - <bool> обновлять живые объекты после перезагрузки
+     - clock - <callable> источник времени (для тестов)
+    """
+
+    def __init__(self, quiet: float = QUIET_SECONDS, max_delay: float = MAX_DELAY_SECONDS,
+                 transactional: bool = True, patch_references: bool = False,
+                 clock: Callable[[], float] = time.monotonic):
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self.transactional = transactional
+        self.patch_references = patch_references
+        self._clock = clock
+        self._lock = threading.Lock()
+        # События текущей пачки: кортежи имён модулей
+        self._events: List[Tuple[str, ...]] = []
+        # События пачки, перезагрузка которой завершилась ошибкой: войдут в следующую пачку
+        self._retry: List[Tuple[str, ...]] = []
+        self._first = self._last = 0.0
+        self._counts = [0, 0, 0, 0]
+
+    def notify(self, module_names: Iterable[str]) -> None:
+        """
+        Добавить событие изменения модулей (из любого потока).
+
+        Args:
+            module_names (Iterable[str]): Имена изменённых модулей
+        """
+        names = tuple(module_names)
+        if not names:
+            return
+        now = self._clock()
+        with self._lock:
+            if not self._events:
+                self._first = now
+                self._events, self._retry = self._retry, []
+            self._last = now
+            self._events.append(names)
+            self._counts[0] += 1
+
+    def pending(self) -> Tuple[str, ...]:
+        """Объединённый набор изменённых модулей текущей пачки."""
+        with self._lock:
+            return tuple(sorted({name for names in self._events for name in names}))
+
+    def due_in(self) -> Optional[float]:
+        """
+        Сколько секунд осталось до перезагрузки пачки.
+
+        Returns:
+            Optional[float]: Секунды (0 - пора перезагружать) или None, если событий нет
+        """
+        with self._lock:
+            if not self._events:
+                return None
+            deadline = min(self._last + self.quiet, self._first + self.max_delay)
+        return max(0.0, deadline - self._clock())
+
+    def run_pending(self, force: bool = False) -> Optional[ReloadReport]:
+        """
+        Перезагрузить накопленную пачку, если изменения прекратились.
+
+        Модули, содержимое которых не изменилось с последней перезагрузки,
+        пропускаются. Если перезагрузка завершилась ошибкой, события пачки
+        войдут в следующую пачку.
+
+        Args:
+            force (bool): Перезагрузить пачку, не дожидаясь тишины
+
+        Returns:
+            Optional[ReloadReport]: Отчёт или None, если перезагружать нечего
+                или пачка ещё не готова
+        """
+        due_in = self.due_in()
+        if due_in is None or (due_in > 0 and not force):
+            return None
+        with self._lock:
+            events, self._events = self._events, []
+        store = get_fingerprint_store()
+        roots = sorted({name for names in events for name in names
+                        if name not in sys.modules or store.is_module_dirty(sys.modules[name])})
+        profiler = ReloadProfiler('scheduled_reload', ', '.join(roots))
+        try:
+            with profiler.discovery():
+                plan = plan_reload(roots) if roots else None
+            if plan is None:
+                profiler.skip()
+                return profiler.report
+            # Сколько модулей перезагрузилось бы, если бы каждое событие обрабатывалось отдельно
+            index = get_index()
+            naive = sum(len([name for name in dependency_closure(names, index) if name in sys.modules])
+                        for names in events)
+            try:
+                reloaded = execute_plan(plan, profiler, self.transactional, self.patch_references)
+            except Exception:
+                with self._lock:
+                    self._retry.extend(events)
+                raise
+            with self._lock:
+                self._counts[1] += 1
+                self._counts[2] += naive
+                self._counts[3] += len(reloaded)
+            watcher = get_watcher()
+            if watcher is not None:
+                watcher.mark_reloaded(reloaded)
+            saved = naive - len(reloaded)
+            print(f"Перезагружено {len(reloaded)} модулей по {len(events)} событиям"
+                  + (f", сэкономлено перезагрузок: {saved}" if saved > 0 else ""))
+        finally:
+            profiler.finish()
+        return profiler.report
+
+    def wait(self, timeout: Optional[float] = None, poll: float = 0.05) -> Optional[ReloadReport]:
+        """
+        Дождаться готовности пачки и перезагрузить её в текущем потоке.
+
+        Args:
+            timeout (float, optional): Наибольшее время ожидания, секунды
+            poll (float): Период проверки, секунды
+
+        Returns:
+            Optional[ReloadReport]: Отчёт или None, если пачка не готова за timeout
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            due_in = self.due_in()
+            if due_in == 0:
+                return self.run_pending()
+            remaining = None if deadline is None else deadline - self._clock()
+            if remaining is not None and remaining <= 0:
+                return None
+            delay = poll if due_in is None else due_in
+            time.sleep(delay if remaining is None else min(delay, remaining))
+
+    def stats(self) -> SchedulerStats:
+        """Счётчики событий и сэкономленных перезагрузок."""
+        with self._lock:
+            events, batches, naive, reloads = self._counts
+        return SchedulerStats(events, batches, naive, reloads, naive - reloads)
+
+
+_scheduler = None
+
+
+def get_scheduler() -> ReloadScheduler:
+    """
+    Получить общий для сеанса планировщик.
+
+    Returns:
+        ReloadScheduler: Планировщик
+    """
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ReloadScheduler()
+    return _scheduler
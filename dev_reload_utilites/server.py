@@ -0,0 +1,437 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        server
+# Purpose:     Локальный сервер команд перезагрузки для внешних редакторов
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Локальный сервер команд перезагрузки.
+
+Сервер слушает сокет на 127.0.0.1 и принимает команды в виде строк JSON,
+по одной команде на строку. На каждую команду отправляется одна строка
+JSON с ответом:
+
+    {"id": 1, "command": "reload", "module": "my_module"}
+    {"id": 1, "ok": true, "result": {...}}
+
+Команды:
+ - reload - перезагрузить модуль (module, strategy, force, transactional,
+   patch_references)
+ - plan - план и оценка времени перезагрузки (module, strategy, force)
+ - notify - сообщить об изменённых модулях (modules); они перезагружаются
+   одним планом, когда изменения прекратятся (scheduler)
+ - status - очередь, последний отчёт, изменённые модули, счётчики
+   планировщика и рост памяти за сеанс (если включён memory_guard)
+
+Сокет обслуживается фоновыми потоками, но reload и plan выполняются только
+в потоке, который вызывает process_pending (в mebel.exe - главный поток):
+так блокировка импорта и k3 используются из одного потока. Там же
+перезагружается готовая пачка планировщика. notify и status отвечают
+сразу.
+
+server = start_server()
+...
+server.process_pending()   # в главном потоке, например по таймеру
+
+client = ReloadClient(port=server.port)
+print(client.reload('my_module'))
+"""
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+from typing import Optional
+
+from dev_reload_utilites.memory_guard import get_memory_guard
+from dev_reload_utilites.profiler import last_report
+from dev_reload_utilites.scheduler import get_scheduler
+from dev_reload_utilites.watcher import get_watcher
+
+
+# Адрес сервера по умолчанию
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 50865
+
+# Сколько секунд поток сокета ждёт выполнения команды главным потоком
+REQUEST_TIMEOUT = 120.0
+
+# Функции перезагрузки, доступные команде reload
+STRATEGIES = ('auto_reload_module', 'reload_module_with_dependencies', 'selective_reload')
+
+# Команды, выполняемые в потоке process_pending
+QUEUED_COMMANDS = ('reload', 'plan')
+
+
+class _PendingRequest:
+    """Команда, ожидающая выполнения в главном потоке."""
+
+    def __init__(self, message: dict):
+        self.message = message
+        self.response: Optional[dict] = None
+        self.cancelled = False
+        self.done = threading.Event()
+
+
+def _report_data(report) -> dict:
+    return {
+        'strategy': report.strategy,
+        'target': report.target,
+        'ok': report.ok,
+        'skipped': report.skipped,
+        'rolled_back': report.rolled_back,
+        'modules': list(report.reloaded),
+        'errors': {timing.name: timing.error for timing in report.failures},
+        'total_seconds': report.total_seconds,
+        'summary': report.summary(),
+    }
+
+
+def _estimate_data(estimate) -> dict:
+    return {
+        'strategy': estimate.strategy,
+        'target': estimate.target,
+        'skipped': estimate.skipped,
+        'modules': list(estimate.modules),
+        'estimated_seconds': estimate.estimated_seconds,
+        'unmeasured': list(estimate.unmeasured),
+        'summary': estimate.summary(),
+    }
+
+
+def _strategy(message: dict):
+    strategy = message.get('strategy') or STRATEGIES[0]
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Неизвестная функция перезагрузки: {strategy}")
+    module_name = message.get('module')
+    if not isinstance(module_name, str) or not module_name:
+        raise ValueError("Не указано имя модуля (module)")
+    # Механизм перезагрузки импортируется при первой команде
+    from dev_reload_utilites import auto_reload_manager
+    return getattr(auto_reload_manager, strategy), module_name
+
+
+def execute_command(message: dict) -> dict:
+    """
+    Выполнить команду reload или plan в текущем потоке.
+
+    Args:
+        message (dict): Команда
+
+    Returns:
+        dict: Результат команды
+
+    Raises:
+        ValueError: Если команда или её параметры неверны
+    """
+    command = message.get('command')
+    function, module_name = _strategy(message)
+    force = bool(message.get('force', False))
+    if command == 'plan':
+        return _estimate_data(function(module_name, force, dry_run=True))
+    if command == 'reload':
+        report = function(module_name, force, log=bool(message.get('log', False)),
+                          transactional=bool(message.get('transactional', True)),
+                          patch_references=bool(message.get('patch_references', False)))
+        watcher = get_watcher()
+        if watcher is not None and report.reloaded:
+            watcher.mark_reloaded(report.reloaded)
+        return _report_data(report)
+    raise ValueError(f"Неизвестная команда: {command}")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Чтение команд из соединения, по одной строке JSON на команду."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.owner.handle_line(line)
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    # На Windows SO_REUSEADDR позволяет другому процессу занять тот же порт
+    # и перехватить команды перезагрузки, поэтому там порт занимается монопольно
+    allow_reuse_address = os.name != 'nt'
+
+    def server_bind(self):
+        if hasattr(socket, 'SO_EXCLUSIVEADDRUSE'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+        super(_TCPServer, self).server_bind()
+
+
+class ReloadServer:
+    """Локальный сервер команд перезагрузки
+    ________________________________________
+
+    Именованные аргументы:
+
+     - host - <str> адрес. По умолчанию только локальные подключения.
+     - port - <int> порт; 0 - любой свободный (см. атрибут port)
+     - request_timeout - <float> сколько секунд ждать выполнения команды
+       главным потоком
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 request_timeout: float = REQUEST_TIMEOUT):
+        self.request_timeout = request_timeout
+        self._queue: queue.Queue = queue.Queue()
+        self._server = _TCPServer((host, port), _Handler)
+        self._server.owner = self
+        self._thread: Optional[threading.Thread] = None
+        self.served = 0
+
+    @property
+    def address(self):
+        return self._server.server_address
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> 'ReloadServer':
+        """Начать приём подключений в фоновом потоке."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever,
+                                            name='dev_reload_utilites.server', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Остановить сервер; ожидающие команды получают ответ об ошибке."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            request.response = {'ok': False, 'error': 'Сервер остановлен'}
+            request.done.set()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def pending(self) -> int:
+        """Количество команд, ожидающих выполнения."""
+        return self._queue.qsize()
+
+    def status(self) -> dict:
+        """Состояние сервера для команды status."""
+        report = last_report()
+        watcher = get_watcher()
+        return {
+            'pending': self.pending(),
+            'served': self.served,
+            'last_report': None if report is None else _report_data(report),
+            'changed_modules': None if watcher is None else list(watcher.changed_modules()),
+            'scheduled': list(get_scheduler().pending()),
+            'scheduler': get_scheduler().stats()._asdict(),
+            'memory_growth': list(get_memory_guard().session_growth()),
+        }
+
+    def handle_line(self, line: bytes) -> dict:
+        """
+        Обработать одну строку запроса (вызывается потоком соединения).
+
+        Args:
+            line (bytes): Строка JSON
+
+        Returns:
+            dict: Ответ
+        """
+        try:
+            message = json.loads(line.decode('utf-8'))
+            if not isinstance(message, dict):
+                raise ValueError("Команда должна быть объектом JSON")
+        except ValueError as e:
+            return {'ok': False, 'error': f"Неверный запрос: {e}"}
+        response = self._dispatch(message)
+        if 'id' in message:
+            response['id'] = message['id']
+        return response
+
+    def _dispatch(self, message: dict) -> dict:
+        command = message.get('command')
+        if command == 'status':
+            return {'ok': True, 'result': self.status()}
+        if command == 'notify':
+            modules = message.get('modules')
+            if not isinstance(modules, list) or not all(isinstance(name, str) for name in modules):
+                return {'ok': False, 'error': "Не указан список имён модулей (modules)"}
+            scheduler = get_scheduler()
+            scheduler.notify(modules)
+            return {'ok': True, 'result': {'scheduled': list(scheduler.pending())}}
+        if command not in QUEUED_COMMANDS:
+            return {'ok': False, 'error': f"Неизвестная команда: {command}"}
+        request = _PendingRequest(message)
+        self._queue.put(request)
+        if not request.done.wait(self.request_timeout):
+            request.cancelled = True
+            return {'ok': False, 'error': f"Команда не выполнена за {self.request_timeout:g} с: "
+                                          f"главный поток не вызывает process_pending"}
+        return request.response
+
+    def process_pending(self, timeout: float = 0.0, limit: Optional[int] = None) -> int:
+        """
+        Выполнить ожидающие команды в текущем потоке.
+
+        Вызывается главным потоком приложения (например, по таймеру или
+        из цикла serve). Затем перезагружается пачка планировщика, если
+        изменения прекратились.
+
+        Args:
+            timeout (float): Сколько секунд ждать первую команду
+            limit (int, optional): Выполнить не больше limit команд
+
+        Returns:
+            int: Количество выполненных команд
+        """
+        count = 0
+        block = timeout > 0
+        while limit is None or count < limit:
+            try:
+                request = self._queue.get(block, timeout if block else None)
+            except queue.Empty:
+                break
+            block = False
+            if request.cancelled:
+                continue
+            try:
+                request.response = {'ok': True, 'result': execute_command(request.message)}
+            except Exception as e:
+                request.response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            self.served += 1
+            count += 1
+            request.done.set()
+        try:
+            get_scheduler().run_pending()
+        except Exception as e:
+            print(f"Ошибка отложенной перезагрузки: {e}")
+        return count
+
+    def serve(self, stop_event: Optional[threading.Event] = None, poll: float = 0.1) -> None:
+        """
+        Выполнять команды в текущем потоке до остановки сервера или события stop_event.
+
+        Args:
+            stop_event (threading.Event, optional): Событие остановки
+            poll (float): Период проверки события остановки, секунды
+        """
+        self.start()
+        while self.is_running() and (stop_event is None or not stop_event.is_set()):
+            self.process_pending(timeout=poll)
+
+
+class ReloadClient:
+    """Клиент локального сервера команд перезагрузки
+    _________________________________________________
+
+    client = ReloadClient()
+    print(client.plan('my_module')['summary'])
+    print(client.reload('my_module')['summary'])
+
+    Именованные аргументы:
+
+     - timeout - <float> ожидание ответа в секундах
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 timeout: float = REQUEST_TIMEOUT + 5):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._counter = 0
+
+    def request(self, command: str, **params) -> dict:
+        """
+        Отправить команду и дождаться ответа.
+
+        Args:
+            command (str): 'reload', 'plan' или 'status'
+            **params: Параметры команды
+
+        Returns:
+            dict: Результат команды
+
+        Raises:
+            RuntimeError: Если сервер вернул ошибку
+        """
+        self._counter += 1
+        message = dict(params, command=command, id=self._counter)
+        with socket.create_connection((self.host, self.port), self.timeout) as sock:
+            sock.sendall(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as f:
+                line = f.readline()
+        if not line:
+            raise RuntimeError("Сервер закрыл соединение без ответа")
+        response = json.loads(line.decode('utf-8'))
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error', 'Ошибка сервера'))
+        return response['result']
+
+    def reload(self, module: str, strategy: str = STRATEGIES[0], **params) -> dict:
+        """Перезагрузить модуль выбранной функцией перезагрузки."""
+        return self.request('reload', module=module, strategy=strategy, **params)
+
+    def plan(self, module: str, strategy: str = STRATEGIES[0], **params) -> dict:
+        """План и оценка времени перезагрузки без перезагрузки."""
+        return self.request('plan', module=module, strategy=strategy, **params)
+
+    def notify(self, modules) -> dict:
+        """Сообщить об изменённых модулях для отложенной перезагрузки."""
+        return self.request('notify', modules=list(modules))
+
+    def status(self) -> dict:
+        """Состояние сервера."""
+        return self.request('status')
+
+
+_server = None
+
+
+def start_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ReloadServer:
+    """
+    Запустить общий для сеанса сервер, если он ещё не запущен.
+
+    Args:
+        host (str): Адрес. По умолчанию 127.0.0.1.
+        port (int): Порт
+
+    Returns:
+        ReloadServer: Запущенный сервер
+    """
+    global _server
+    if _server is None or not _server.is_running():
+        _server = ReloadServer(host, port).start()
+    return _server
+
+
+def get_server() -> Optional[ReloadServer]:
+    """Получить работающий сервер или None."""
+    if _server is not None and _server.is_running():
+        return _server
+    return None
+
+
+def stop_server() -> None:
+    """Остановить общий сервер."""
+    global _server
+    if _server is not None:
+        _server.stop()
+        _server = None
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        source_reader
+# Purpose:     Чтение исходных файлов с определением и кэшированием кодировки
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Чтение исходных файлов модулей.
+
+Файл читается один раз в виде байтов. Кодировка определяется по BOM и
+объявлению кодировки (PEP 263) через tokenize.detect_encoding. Скрипты K3
+часто сохранены в cp1251 без объявления кодировки: если байты не являются
+корректным utf-8, используется cp1251 (и latin1 как последний вариант).
+
+Найденная кодировка запоминается по (путь, mtime, размер), поэтому проверка
+всего файла на корректность utf-8 выполняется только после его изменения.
+Для поиска импортов декодирование не требуется: см. may_import.
+
+source = read_source(path)
+text = decode_source(source)
+"""
+
+import io
+import os
+import threading
+import tokenize
+from collections import namedtuple
+from typing import Dict, Optional, Tuple
+
+
+SourceFile = namedtuple('SourceFile', 'data encoding fallback')
+SourceFile.__doc__ = """Прочитанный исходный файл.
+
+ - data - <bytes> содержимое файла
+ - encoding - <str> кодировка содержимого
+ - fallback - <bool> кодировка подобрана, сам Python файл с такими байтами не прочитает
+"""
+
+FALLBACK_ENCODINGS = ('cp1251', 'latin1')
+
+_lock = threading.Lock()
+# Кэш кодировок: путь -> (mtime, размер, кодировка, подобрана ли кодировка)
+_encoding_cache: Dict[str, Tuple[float, int, str, bool]] = {}
+
+
+def detect_encoding(data: bytes) -> Tuple[str, bool]:
+    """
+    Определить кодировку исходного кода.
+
+    Args:
+        data (bytes): Содержимое файла
+
+    Returns:
+        Tuple[str, bool]: Кодировка и признак того, что она подобрана
+            (объявление кодировки отсутствует или не соответствует байтам)
+    """
+    try:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+    except SyntaxError:
+        # Неизвестная кодировка в объявлении или BOM вместе с другой кодировкой
+        encoding = 'utf-8'
+    try:
+        data.decode(encoding)
+        return encoding, False
+    except (UnicodeDecodeError, LookupError):
+        pass
+    for fallback in FALLBACK_ENCODINGS:
+        try:
+            data.decode(fallback)
+            return fallback, True
+        except UnicodeDecodeError:
+            continue
+    return 'latin1', True
+
+
+def read_source(path: str, stat: Optional[os.stat_result] = None) -> SourceFile:
+    """
+    Прочитать исходный файл, используя кэш кодировок.
+
+    Args:
+        path (str): Путь к файлу
+        stat (os.stat_result, optional): Уже полученный результат os.stat
+
+    Returns:
+        SourceFile: Байты файла и их кодировка
+
+    Raises:
+        OSError: Если файл не удалось прочитать
+    """
+    if stat is None:
+        stat = os.stat(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    with _lock:
+        cached = _encoding_cache.get(path)
+    if cached is not None and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        return SourceFile(data, cached[2], cached[3])
+    encoding, fallback = detect_encoding(data)
+    with _lock:
+        _encoding_cache[path] = (stat.st_mtime, stat.st_size, encoding, fallback)
+    return SourceFile(data, encoding, fallback)
+
+
+def decode_source(source: SourceFile) -> str:
+    """Декодировать содержимое файла в найденной кодировке."""
+    return source.data.decode(source.encoding)
+
+
+def may_import(data: bytes) -> bool:
+    """
+    Быстрая проверка по байтам: может ли файл содержать оператор импорта.
+
+    Ключевое слово import в кодировках utf-8, cp1251 и latin1 записывается
+    одинаково, поэтому файл без этих байтов можно не разбирать.
+    """
+    return b'import' in data
+
+
+def cached_encoding(path: str) -> Optional[str]:
+    """Кодировка файла из кэша или None."""
+    with _lock:
+        cached = _encoding_cache.get(path)
+    return cached[2] if cached is not None else None
+
+
+def clear_cache() -> None:
+    """Очистить кэш кодировок."""
+    with _lock:
+        _encoding_cache.clear()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        transaction
+# Purpose:     Транзакционная перезагрузка: откат пространств имён модулей
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Транзакционная перезагрузка пакета модулей.
+
+Если тело модуля падает при importlib.reload, модуль остаётся
+наполовину инициализированным, и все зависимые модули ломаются до
+перезапуска mebel.exe. Перед перезагрузкой пакета транзакция запоминает
+поверхностные копии __dict__ всех модулей пакета. При ошибке все
+пространства имён восстанавливаются, при успехе копии отбрасываются.
+
+with ReloadTransaction(modules):
+    for module in modules:
+        importlib.reload(module)
+"""
+
+import contextlib
+import sys
+import types
+from typing import Dict, Iterable, List, Tuple
+
+from dev_reload_utilites.fingerprint import get_fingerprint_store, module_source_path
+from dev_reload_utilites.module_graph import get_module_graph
+
+
+class ReloadTransaction:
+    """Снимок пространств имён модулей пакета перезагрузки
+    _______________________________________________________
+
+    transaction = ReloadTransaction(modules)
+    try:
+        ...
+    except Exception:
+        transaction.rollback()
+        raise
+    transaction.commit()
+
+    Именованные аргументы:
+
+     - profiler - <ReloadProfiler> профилировщик, в отчёте которого отмечается откат
+    """
+
+    def __init__(self, modules: Iterable[types.ModuleType], profiler=None):
+        self.profiler = profiler
+        # (модуль, копия __dict__) в порядке перезагрузки
+        self._snapshots: List[Tuple[types.ModuleType, Dict[str, object]]] = [
+            (module, dict(module.__dict__)) for module in modules]
+        self.rolled_back = False
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def rollback(self) -> None:
+        """
+        Восстановить пространства имён всех модулей пакета.
+
+        Восстановленные модули считаются изменёнными: отпечатки их файлов
+        сбрасываются, узлы графа модулей - тоже.
+        """
+        store = get_fingerprint_store()
+        graph = get_module_graph()
+        # Сначала восстанавливаются все пространства имён, затем служебные данные
+        for module, snapshot in self._snapshots:
+            namespace = module.__dict__
+            namespace.clear()
+            namespace.update(snapshot)
+            name = snapshot.get('__name__')
+            if isinstance(name, str) and sys.modules.get(name) is not module:
+                sys.modules[name] = module
+        for module, snapshot in self._snapshots:
+            path = module_source_path(module)
+            if path is not None:
+                store.forget(path)
+            graph.invalidate(module.__name__)
+        self._snapshots = []
+        self.rolled_back = True
+        if self.profiler is not None:
+            self.profiler.report.rolled_back = True
+
+    def commit(self) -> None:
+        """Отбросить снимки после успешной перезагрузки."""
+        self._snapshots = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+            print(f"Перезагрузка отменена, восстановлено состояние модулей: {exc}")
+        return False
+
+
+def reload_transaction(modules: Iterable[types.ModuleType], transactional: bool = True, profiler=None):
+    """
+    Контекст перезагрузки пакета: транзакция или пустой контекст.
+
+    Args:
+        modules (Iterable[types.ModuleType]): Модули пакета перезагрузки
+        transactional (bool): Откатывать пространства имён при ошибке
+        profiler (ReloadProfiler, optional): Профилировщик, в отчёте которого отмечается откат
+
+    Returns:
+        Контекстный менеджер
+    """
+    if not transactional:
+        return contextlib.nullcontext()
+    return ReloadTransaction(modules, profiler)
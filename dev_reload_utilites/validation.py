@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        validation
+# Purpose:     Проверка синтаксиса модулей перед перезагрузкой
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Проверка синтаксиса всех модулей пакета до начала перезагрузки.
+
+Синтаксическая ошибка в третьем модуле пакета раньше оставляла первые два
+перезагруженными, а остальные - устаревшими. Теперь перед перезагрузкой
+проверяются все модули пакета, и при ошибках пакет отклоняется целиком
+одним исключением ReloadValidationError со списком всех ошибок. Модули,
+уже разобранные при поиске импортов, повторно не разбираются.
+
+try:
+    validate_batch(modules)
+except ReloadValidationError as e:
+    print(e)
+"""
+
+import types
+from typing import Dict, Iterable
+
+from dev_reload_utilites.fingerprint import module_source_path
+from dev_reload_utilites.import_parser import check_syntax
+
+
+class ReloadValidationError(Exception):
+    """Синтаксические ошибки в модулях пакета перезагрузки
+    ________________________________________________________
+
+     - errors - <dict> имя модуля -> текст ошибки
+    """
+
+    def __init__(self, errors: Dict[str, str]):
+        self.errors = dict(errors)
+        lines = [f"Перезагрузка отменена, синтаксические ошибки в {len(self.errors)} модулях:"]
+        lines.extend(f"  {name}: {error}" for name, error in self.errors.items())
+        super(ReloadValidationError, self).__init__('\n'.join(lines))
+
+
+def validate_modules(modules: Iterable[types.ModuleType]) -> Dict[str, str]:
+    """
+    Проверить синтаксис исходных файлов модулей.
+
+    Модули без исходного .py файла пропускаются.
+
+    Args:
+        modules (Iterable[types.ModuleType]): Модули
+
+    Returns:
+        Dict[str, str]: Имя модуля -> текст синтаксической ошибки
+    """
+    errors = {}
+    for module in modules:
+        path = module_source_path(module)
+        if path is None:
+            continue
+        try:
+            error = check_syntax(path)
+        except OSError as e:
+            error = f"{path}: {e}"
+        if error is not None:
+            errors[module.__name__] = error
+    return errors
+
+
+def validate_batch(modules: Iterable[types.ModuleType], profiler=None) -> None:
+    """
+    Стадия перезагрузки: отклонить пакет целиком, если хотя бы один модуль содержит ошибку.
+
+    Args:
+        modules (Iterable[types.ModuleType]): Модули пакета перезагрузки
+        profiler (ReloadProfiler, optional): Профилировщик; время проверки
+            учитывается как поиск зависимостей
+
+    Raises:
+        ReloadValidationError: Если найдены синтаксические ошибки
+    """
+    if profiler is not None:
+        with profiler.discovery():
+            errors = validate_modules(modules)
+    else:
+        errors = validate_modules(modules)
+    if errors:
+        raise ReloadValidationError(errors)
@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+__author__ = 'Aleksandr Dragunkin --<alexandr69@gmail.com>'
+__created__= '17.10.2026'
+__version__ = '0.1.00'
+# -------------------------------------------------------------------------------
+# Name:        watcher
+# Purpose:     Фоновое отслеживание изменённых модулей внутри mebel.exe
+# Copyright:   (c) GEOS 2012-2025 http://k3info.ru/
+# Licence:     FREE
+# ------------------------------------------------------------------------------
+
+"""
+Фоновый поток, отслеживающий изменения .py файлов в директории Proto.
+
+Пока разработчик редактирует файлы, поток поддерживает актуальный набор
+изменённых модулей и план их перезагрузки (транзитивное замыкание
+зависимых модулей). При открытии диалога или запуске перезагрузки обход
+директории уже не нужен.
+
+На Linux используется inotify, на остальных системах - периодический опрос
+времени модификации файлов.
+
+from dev_reload_utilites.watcher import start_watcher
+watcher = start_watcher()
+...
+print(watcher.recent_import_names(minutes=30))
+print(watcher.reload_plan().modules)
+"""
+
+import ctypes
+import ctypes.util
+import datetime
+import heapq
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from dev_reload_utilites.fingerprint import get_fingerprint_store
+from dev_reload_utilites.find_recent_py_files import (
+    DEFAULT_EXCLUDE,
+    DirSnapshot,
+    _is_excluded,
+    find_proto_path,
+    path_to_module_name,
+    scan_py_files,
+)
+from dev_reload_utilites.import_index import ImportIndex, iter_loaded_modules
+from dev_reload_utilites.reload_planner import ReloadPlan, plan_reload
+
+
+class PollingBackend:
+    """Переносимое отслеживание изменений опросом времени модификации файлов."""
+
+    name = 'polling'
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self._snapshot: Optional[DirSnapshot] = None
+
+    def start(self) -> Dict[str, float]:
+        """Выполнить начальный обход и вернуть mtime всех .py файлов."""
+        self._snapshot, _ = scan_py_files(self.root_dir)
+        return dict(self._snapshot.files)
+
+    def wait(self, timeout: float) -> Dict[str, Optional[float]]:
+        """
+        Дождаться изменений.
+
+        Returns:
+            Dict[str, Optional[float]]: путь -> новый mtime (None для удалённых файлов)
+        """
+        time.sleep(timeout)
+        self._snapshot, diff = scan_py_files(self.root_dir, self._snapshot)
+        changes: Dict[str, Optional[float]] = {}
+        for path in diff.added + diff.modified:
+            changes[path] = self._snapshot.files[path]
+        for path in diff.removed:
+            changes[path] = None
+        return changes
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyBackend(PollingBackend):
+    """Отслеживание изменений через inotify (только Linux).
+
+    Директории DEFAULT_EXCLUDE (.git, venv и т. п.) не отслеживаются, как и
+    при обходе scan_py_files. Если очередь событий ядра переполнилась
+    (IN_Q_OVERFLOW), часть событий потеряна, и дерево обходится заново.
+    """
+
+    name = 'inotify'
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    _EVENT = struct.Struct('iIII')
+
+    def __init__(self, root_dir: str):
+        super(InotifyBackend, self).__init__(root_dir)
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | getattr(os, 'O_CLOEXEC', 0))
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        self._dirs: Dict[int, str] = {}
+
+    @classmethod
+    def available(cls) -> bool:
+        return sys.platform.startswith('linux')
+
+    def _add_watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.MASK)
+        if wd >= 0:
+            self._dirs[wd] = directory
+
+    def _add_watches(self, top: str) -> None:
+        """Отслеживать директорию top и её поддиректории, кроме исключённых."""
+        for root, dirs, _ in os.walk(top):
+            dirs[:] = [name for name in dirs if not _is_excluded(name, DEFAULT_EXCLUDE)]
+            self._add_watch(root)
+
+    def start(self) -> Dict[str, float]:
+        self._add_watches(self.root_dir)
+        return super(InotifyBackend, self).start()
+
+    def wait(self, timeout: float) -> Dict[str, Optional[float]]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return {}
+        # Небольшая пауза, чтобы собрать события одного сохранения в одну пачку
+        time.sleep(0.01)
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return {}
+        return self._parse_events(data)
+
+    def _parse_events(self, data: bytes) -> Dict[str, Optional[float]]:
+        """Разобрать прочитанные события inotify в изменения файлов."""
+        changes: Dict[str, Optional[float]] = {}
+        overflow = False
+        offset = 0
+        while offset + self._EVENT.size <= len(data):
+            wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and not _is_excluded(name, DEFAULT_EXCLUDE):
+                    self._add_watches(path)
+                    snapshot, _ = scan_py_files(path)
+                    changes.update(snapshot.files)
+                continue
+            if not name.endswith('.py'):
+                continue
+            try:
+                changes[path] = os.stat(path).st_mtime
+            except OSError:
+                changes[path] = None
+        if overflow:
+            print("Очередь событий inotify переполнена, директория обходится заново")
+            # Директории, созданные во время потери событий, тоже должны отслеживаться
+            self._add_watches(self.root_dir)
+            changes.update(super(InotifyBackend, self).wait(0))
+        return changes
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def _make_backend(root_dir: str, backend: str) -> PollingBackend:
+    if backend in ('auto', 'inotify') and InotifyBackend.available():
+        try:
+            return InotifyBackend(root_dir)
+        except (OSError, AttributeError) as e:
+            if backend == 'inotify':
+                raise
+            print(f"inotify недоступен, используется опрос: {e}")
+    return PollingBackend(root_dir)
+
+
+class ModuleWatcher(threading.Thread):
+    """Фоновый поток отслеживания изменённых модулей
+    __________________________________________________
+
+    Именованные аргументы:
+
+     - root_dir - <str> корневая директория. По умолчанию директория Proto.
+     - interval - <float> период опроса в секундах
+     - minutes - <int> файлы, изменённые за это число минут до запуска,
+       сразу считаются изменёнными
+     - backend - <'auto', 'inotify', 'polling'> способ отслеживания
+    """
+
+    def __init__(self, root_dir: str = None, interval: float = 1.0, minutes: int = 30,
+                 backend: str = 'auto'):
+        super(ModuleWatcher, self).__init__(name='dev_reload_utilites.watcher', daemon=True)
+        if root_dir is None:
+            root_dir = find_proto_path()
+        self.root_dir = os.path.abspath(root_dir)
+        self.interval = interval
+        self.minutes = minutes
+        self._backend = _make_backend(self.root_dir, backend)
+        self._index = ImportIndex()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._ready = threading.Event()
+        self._replan = threading.Event()
+        # имя модуля -> (mtime, путь)
+        self._changed: Dict[str, Tuple[float, str]] = {}
+        self._plan = ReloadPlan((), ())
+        self._listeners: List[Callable[[Tuple[str, ...]], None]] = []
+
+    def add_listener(self, callback: Callable[[Tuple[str, ...]], None]) -> None:
+        """
+        Вызывать callback из потока отслеживания с именами модулей при каждом изменении.
+
+        Args:
+            callback (Callable): Функция, принимающая кортеж имён изменённых модулей
+                (например, ReloadScheduler.notify)
+        """
+        self._listeners.append(callback)
+
+    @property
+    def backend(self) -> str:
+        """Имя используемого способа отслеживания."""
+        return self._backend.name
+
+    def _module_name(self, path: str) -> Optional[str]:
+        return path_to_module_name(os.path.relpath(path, self.root_dir))
+
+    def _apply(self, changes: Dict[str, Optional[float]]) -> None:
+        store = get_fingerprint_store()
+        dirty = []
+        with self._lock:
+            for path, mtime in changes.items():
+                name = self._module_name(path)
+                if name is None:
+                    continue
+                # Файл, у которого изменилось только время модификации, не считается изменённым
+                if mtime is None or not store.is_dirty(path):
+                    self._changed.pop(name, None)
+                else:
+                    self._changed[name] = (mtime, path)
+                    dirty.append(name)
+            roots = tuple(self._changed)
+        if dirty and self._ready.is_set():
+            for callback in self._listeners:
+                try:
+                    callback(tuple(dirty))
+                except Exception as e:
+                    print(f"Ошибка обработчика изменений: {e}")
+        # План строится вне блокировки: индекс принадлежит только этому потоку
+        self._index.refresh(iter_loaded_modules())
+        plan = plan_reload(roots, self._index) if roots else ReloadPlan((), ())
+        with self._lock:
+            self._plan = plan
+
+    def run(self) -> None:
+        try:
+            self._index.load()
+            mtimes = self._backend.start()
+            threshold = time.time() - self.minutes * 60
+            self._apply({path: mtime for path, mtime in mtimes.items() if mtime > threshold})
+            self._ready.set()
+            while not self._stop_event.is_set():
+                changes = self._backend.wait(self.interval)
+                if changes or self._replan.is_set():
+                    self._replan.clear()
+                    self._apply(changes)
+        except Exception as e:
+            print(f"Ошибка в потоке отслеживания изменений: {e}")
+        finally:
+            self._ready.set()
+            self._backend.close()
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Дождаться окончания начального обхода."""
+        return self._ready.wait(timeout)
+
+    def stop(self, timeout: float = None) -> None:
+        """Остановить поток."""
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+    def changed_modules(self) -> Tuple[str, ...]:
+        """Имена изменённых модулей, самые "молодые" первыми."""
+        with self._lock:
+            items = sorted(self._changed.items(), key=lambda item: item[1][0], reverse=True)
+        return tuple(name for name, _ in items)
+
+    def recent_import_names(self, minutes: int = 30, limit: int = None) -> Tuple[str, ...]:
+        """
+        Аналог get_import_names без обхода директории.
+
+        Args:
+            minutes (int): Количество минут для поиска. По умолчанию 30.
+            limit (int, optional): Вернуть не более limit самых "молодых" модулей
+
+        Returns:
+            Tuple[str, ...]: Имена модулей, отсортированные по времени изменения
+        """
+        threshold = (datetime.datetime.now() - datetime.timedelta(minutes=minutes)).timestamp()
+        with self._lock:
+            items = [(mtime, name) for name, (mtime, _) in self._changed.items() if mtime > threshold]
+        if limit is not None:
+            items = heapq.nlargest(limit, items)
+        else:
+            items.sort(reverse=True)
+        return tuple(name for _, name in items)
+
+    def reload_plan(self) -> ReloadPlan:
+        """Заранее вычисленный план перезагрузки всех изменённых модулей."""
+        with self._lock:
+            return self._plan
+
+    def mark_reloaded(self, module_names: Iterable[str]) -> None:
+        """
+        Исключить перезагруженные модули из набора изменённых.
+
+        План перезагрузки пересчитывается потоком на следующем шаге опроса.
+
+        Args:
+            module_names (Iterable[str]): Имена перезагруженных модулей
+        """
+        with self._lock:
+            for name in module_names:
+                self._changed.pop(name, None)
+            if not self._changed:
+                self._plan = ReloadPlan((), ())
+        self._replan.set()
+
+
+_watcher = None
+
+
+def start_watcher(root_dir: str = None, interval: float = 1.0, minutes: int = 30,
+                  backend: str = 'auto') -> ModuleWatcher:
+    """
+    Запустить общий для сеанса поток отслеживания, если он ещё не запущен.
+
+    Args:
+        root_dir (str): Корневая директория. По умолчанию директория Proto.
+        interval (float): Период опроса в секундах
+        minutes (int): Файлы, изменённые за это число минут, сразу считаются изменёнными
+        backend (str): 'auto', 'inotify' или 'polling'
+
+    Returns:
+        ModuleWatcher: Запущенный поток
+    """
+    global _watcher
+    if _watcher is None or not _watcher.is_alive():
+        _watcher = ModuleWatcher(root_dir, interval, minutes, backend)
+        _watcher.start()
+    return _watcher
+
+
+def get_watcher() -> Optional[ModuleWatcher]:
+    """Получить работающий поток отслеживания или None."""
+    if _watcher is not None and _watcher.is_alive():
+        return _watcher
+    return None
+
+
+def stop_watcher() -> None:
+    """Остановить общий поток отслеживания."""
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
@@ -37,4 +37,65 @@ k3_mock.Var = MockVar
 k3_mock.setvar = mock.MagicMock(return_value=[True])
 
 # Подменяем модуль k3 в sys.modules
-sys.modules['k3'] = k3_mock
\ No newline at end of file
+sys.modules['k3'] = k3_mock
+
+import importlib
+import os
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites import cli, import_index, journal
+
+# Пакет экспортирует одноимённую функцию, поэтому модуль берём через importlib
+frp = importlib.import_module('dev_reload_utilites.find_recent_py_files')
+
+
+@pytest.fixture(autouse=True)
+def _temp_reload_journal(tmp_path, monkeypatch):
+    """Журнал перезагрузок тестов пишется во временный каталог"""
+    monkeypatch.setattr(journal, '_journal', journal.ReloadJournal(str(tmp_path / '.reload_journal')))
+
+
+@pytest.fixture(autouse=True)
+def _temp_state_files(tmp_path, monkeypatch):
+    """Индекс импортов и снимки директорий тестов пишутся во временный каталог"""
+    monkeypatch.setattr(import_index, 'INDEX_FILE', str(tmp_path / '.import_index'))
+    monkeypatch.setattr(import_index, '_index', None)
+    monkeypatch.setattr(cli, 'CLI_INDEX_FILE', str(tmp_path / '.import_index_cli'))
+    monkeypatch.setattr(frp, 'SNAPSHOT_FILE', str(tmp_path / '.dir_snapshot'))
+    monkeypatch.setattr(frp, '_snapshots', {})
+
+
+class ModuleDir:
+    """Временный каталог модулей, добавленный в начало sys.path"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def join(self, *parts):
+        return os.path.join(self.path, *parts)
+
+    def write(self, relpath, text):
+        """Записать файл относительно каталога (подкаталоги создаются) и вернуть его путь"""
+        path = self.join(relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+
+@pytest.fixture
+def module_dir(tmp_path):
+    """Каталог модулей теста; после теста его модули удаляются из sys.modules"""
+    root = str(tmp_path)
+    sys.path.insert(0, root)
+    importlib.invalidate_caches()
+    try:
+        yield ModuleDir(root)
+    finally:
+        sys.path.remove(root)
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, '__file__', None)
+            if isinstance(path, str) and path.startswith(root + os.sep):
+                sys.modules.pop(name, None)
@@ -0,0 +1,47 @@
+import sys
+import os
+import tempfile
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_reload
+from dev_reload_utilites import fingerprint, journal
+
+
+def test_generate_tree_mixed_encodings():
+    """Тест: генератор создаёт модули в utf-8 и cp1251 с объявлением кодировки и без него"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        names = bench_reload.generate_tree(temp_dir, modules=24, cp1251_share=0.5, depth=2)
+        assert len(names) == 24
+        cookies = no_cookies = 0
+        for name in names:
+            path = os.path.join(temp_dir, *name.split('.')) + '.py'
+            with open(path, 'rb') as f:
+                data = f.read()
+            if data.startswith(b'# -*- coding: cp1251'):
+                cookies += 1
+            else:
+                try:
+                    data.decode('utf-8')
+                except UnicodeDecodeError:
+                    no_cookies += 1
+                    assert not bench_reload.is_importable(name)
+        assert cookies > 0 and no_cookies > 0
+        assert cookies + no_cookies < len(names)
+
+
+def test_run_benchmarks_smoke():
+    """Тест: замеры выполняются на маленьком дереве и не оставляют следов в сеансе"""
+    store = fingerprint.get_fingerprint_store()
+    reads = store.reads
+    results = bench_reload.run_benchmarks(modules=15, fan_out=2, cycles=2, memory=False)
+    names = [result.name for result in results]
+    assert 'selective_reload' in names
+    assert all(result.seconds >= 0 for result in results)
+    assert not any(name.startswith(bench_reload.PACKAGE) for name in sys.modules)
+    assert bench_reload.format_results(results).count('\n') == len(results)
+    # Журнал и отпечатки замеров велись отдельно и не попали в общие хранилища
+    assert not os.path.exists(journal.get_journal().path)
+    assert fingerprint.get_fingerprint_store() is store and store.reads == reads
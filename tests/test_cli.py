@@ -0,0 +1,97 @@
+import sys
+import os
+import json
+import threading
+import time
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.cli import main, watch_changes
+
+
+def _make_tree(module_dir):
+    module_dir.write(os.path.join('pkg', '__init__.py'), '')
+    module_dir.write(os.path.join('pkg', 'core.py'), 'X = 1\n')
+    module_dir.write(os.path.join('pkg', 'user.py'), 'from pkg import core\n')
+    module_dir.write('app.py', 'import pkg.user\n')
+    return module_dir.path
+
+
+def test_scan_graph_plan(module_dir, capsys):
+    """Тест: команды scan, graph и plan строят результат по файлам без импорта модулей"""
+    root = _make_tree(module_dir)
+
+    assert main(['scan', '--root', root, '--json']) == 0
+    assert sorted(json.loads(capsys.readouterr().out)['modules']) == ['app', 'pkg', 'pkg.core', 'pkg.user']
+
+    main(['graph', 'pkg.core', '--root', root, '--json'])
+    assert json.loads(capsys.readouterr().out)['modules'] == ['app', 'pkg.core', 'pkg.user']
+
+    main(['plan', 'pkg.core', '--root', root, '--json'])
+    data = json.loads(capsys.readouterr().out)
+    assert data['groups'] == [['pkg.core'], ['pkg.user'], ['app']]
+    assert 'pkg.core' not in sys.modules
+
+
+def test_watch_changes_reports_dirty_modules(module_dir):
+    """Тест: watch отдаёт изменённые модули и план их перезагрузки"""
+    root = _make_tree(module_dir)
+    stop = threading.Event()
+    batches = []
+
+    def consume():
+        for batch in watch_changes(root, interval=0.02, backend='polling', with_plan=True,
+                                   stop_event=stop):
+            batches.append(batch)
+            stop.set()
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    time.sleep(0.3)
+    module_dir.write(os.path.join('pkg', 'extra.py'), 'from pkg import core\n')
+    thread.join(5)
+
+    assert len(batches) == 1
+    batch = batches[0]
+    assert batch.changed == ('pkg.extra',) and batch.dirty == ('pkg.extra',)
+    assert batch.plan.modules == ('pkg.extra',)
+    assert batch.latency < 5
+
+
+def test_watch_changes_skips_touch(module_dir):
+    """Тест: watch не отдаёт пачку, если у файла изменилось только время модификации"""
+    root = _make_tree(module_dir)
+    stop = threading.Event()
+    batches = []
+
+    def consume():
+        for batch in watch_changes(root, interval=0.02, backend='polling', stop_event=stop):
+            batches.append(batch)
+            stop.set()
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    time.sleep(0.3)
+    stamp = time.time() + 10
+    os.utime(module_dir.join('pkg', 'core.py'), (stamp, stamp))
+    time.sleep(0.3)
+    module_dir.write('app.py', 'import pkg.user\nimport pkg.core\n')
+    thread.join(5)
+
+    assert len(batches) == 1
+    assert batches[0].changed == ('app',)
+
+
+def test_cli_keeps_its_own_index_file(module_dir):
+    """Тест: командная строка не перезаписывает индекс импортов сеанса mebel.exe"""
+    from dev_reload_utilites import cli, import_index
+    root = _make_tree(module_dir)
+
+    main(['plan', 'pkg.core', '--root', root, '--json'])
+    assert os.path.exists(cli.CLI_INDEX_FILE)
+    assert not os.path.exists(import_index.INDEX_FILE)
+
+    index_file = module_dir.join('custom_index')
+    main(['graph', 'pkg.core', '--root', root, '--index-file', index_file])
+    assert os.path.exists(index_file)
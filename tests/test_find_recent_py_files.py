@@ -0,0 +1,119 @@
+import sys
+import os
+import importlib
+import time
+import pytest
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.find_recent_py_files import (
+    find_recent_py_files,
+    get_import_names,
+    iter_import_names,
+    iter_py_files,
+    iter_recent_py_files,
+    scan_py_files,
+)
+
+# Пакет экспортирует одноимённую функцию, поэтому модуль берём через importlib
+frp = importlib.import_module('dev_reload_utilites.find_recent_py_files')
+
+
+@pytest.fixture
+def tree(module_dir):
+    """Временное дерево: a.py, pkg/__init__.py, pkg/b.py, старый old.py"""
+    module_dir.write(os.path.join('Proto', 'a.py'), "A = 1\n")
+    module_dir.write(os.path.join('Proto', 'pkg', '__init__.py'), "")
+    module_dir.write(os.path.join('Proto', 'pkg', 'b.py'), "B = 1\n")
+    module_dir.write(os.path.join('Proto', 'notes.txt'), "")
+    old = module_dir.write(os.path.join('Proto', 'old.py'), "")
+    os.utime(old, (time.time() - 3600, time.time() - 3600))
+    return module_dir.join('Proto')
+
+
+def test_scan_diff(tree):
+    """Тест: изменения между снимками"""
+    snapshot, diff = scan_py_files(tree)
+    assert len(snapshot) == 4
+    assert len(diff.added) == 4 and diff.modified == () and diff.removed == ()
+
+    b_file = os.path.join(tree, 'pkg', 'b.py')
+    os.utime(b_file, (time.time() + 5, time.time() + 5))
+    os.remove(os.path.join(tree, 'a.py'))
+    snapshot, diff = scan_py_files(tree, snapshot)
+    assert diff.added == ()
+    assert diff.modified == (b_file,)
+    assert diff.removed == (os.path.join(tree, 'a.py'),)
+
+
+def test_unchanged_dirs_are_not_listed(tree, module_dir, monkeypatch):
+    """Тест: с trust_dir_mtime неизменённые директории повторно не читаются"""
+    snapshot, _ = scan_py_files(tree)
+
+    listed = []
+    original = frp._list_dir
+
+    def spy(directory, exclude):
+        listed.append(directory)
+        return original(directory, exclude)
+
+    monkeypatch.setattr(frp, '_list_dir', spy)
+    module_dir.write(os.path.join(tree, 'pkg', 'c.py'), "")
+    snapshot, diff = scan_py_files(tree, snapshot, trust_dir_mtime=True)
+    assert listed == [os.path.join(tree, 'pkg')]
+    assert diff.added == (os.path.join(tree, 'pkg', 'c.py'),)
+
+    # Без trust_dir_mtime директории перечитываются: снимок не экономит обращений к диску
+    del listed[:]
+    snapshot, diff = scan_py_files(tree, snapshot)
+    assert sorted(listed) == [tree, os.path.join(tree, 'pkg')]
+    assert not any(diff)
+
+
+def test_parallel_scan_matches_sequential(tree, module_dir):
+    """Тест: параллельное сканирование даёт тот же результат и пропускает исключённые директории"""
+    for i in range(5):
+        module_dir.write(os.path.join(tree, 'pkg', f'sub{i}', 'm.py'), "")
+    module_dir.write(os.path.join(tree, '__pycache__', 'cached.py'), "")
+
+    sequential, _ = scan_py_files(tree)
+    parallel, _ = scan_py_files(tree, workers=4)
+    assert parallel.files == sequential.files
+    assert parallel.dirs == sequential.dirs
+    assert len(sequential) == 9
+    assert dict(iter_py_files(tree, workers=4)) == sequential.files
+
+    parallel, diff = scan_py_files(tree, parallel, workers=4)
+    assert parallel.files == sequential.files
+    assert not any(diff)
+
+
+def test_find_recent_and_import_names(tree):
+    """Тест: поиск недавно изменённых файлов и имён модулей"""
+    recent = sorted(path for path, _ in find_recent_py_files(tree, minutes=30))
+    assert recent == ['a.py', os.path.join('pkg', '__init__.py'), os.path.join('pkg', 'b.py')]
+    assert sorted(get_import_names(tree, minutes=30)) == ['a', 'pkg', 'pkg.b']
+    # Без trust_dir_mtime снимок не нужен и не сохраняется
+    assert not os.path.exists(frp.SNAPSHOT_FILE)
+
+    assert sorted(get_import_names(tree, minutes=30, trust_dir_mtime=True)) == ['a', 'pkg', 'pkg.b']
+    # Снимок сохранён и переиспользуется следующим сеансом
+    assert os.path.exists(frp.SNAPSHOT_FILE)
+    assert list(frp.load_snapshots()) == [tree]
+
+
+def test_top_k_and_streaming(tree):
+    """Тест: top-k отбирает самые молодые модули, поток можно прервать"""
+    now = time.time()
+    for i, name in enumerate(('a.py', os.path.join('pkg', '__init__.py'), os.path.join('pkg', 'b.py'))):
+        os.utime(os.path.join(tree, name), (now - 60 * i, now - 60 * i))
+
+    assert get_import_names(tree, minutes=30, limit=2) == ('a', 'pkg')
+    assert list(iter_import_names(tree, minutes=30, limit=1)) == ['a']
+    assert sorted(iter_import_names(tree, minutes=30)) == ['a', 'pkg', 'pkg.b']
+
+    stream = iter_recent_py_files(tree, minutes=30)
+    first = next(stream)
+    stream.close()
+    assert first[0] in ('a.py', os.path.join('pkg', '__init__.py'), os.path.join('pkg', 'b.py'))
@@ -0,0 +1,83 @@
+import sys
+import os
+import importlib
+import time
+from unittest import mock
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.fingerprint import FingerprintStore, get_fingerprint_store
+
+
+def _touch(path, delta):
+    stamp = time.time() + delta
+    os.utime(path, (stamp, stamp))
+
+
+def test_touch_is_not_dirty(module_dir):
+    """Тест: изменение только времени модификации не делает файл изменённым"""
+    path = module_dir.write('mod.py', "X = 1\n")
+    store = FingerprintStore()
+
+    # Отпечаток не записан - файл считается изменённым
+    assert store.is_dirty(path)
+    store.mark_clean(path)
+    assert not store.is_dirty(path)
+    reads = store.reads
+
+    _touch(path, 10)
+    assert not store.is_dirty(path)
+    assert store.reads == reads + 1
+    # Повторная проверка без изменений не читает файл
+    assert not store.is_dirty(path)
+    assert store.reads == reads + 1
+
+    module_dir.write('mod.py', "X = 2\n")
+    _touch(path, 20)
+    assert store.is_dirty(path)
+
+
+def test_auto_reload_skips_touched_module(module_dir):
+    """Тест: auto_reload_module не перезагружает модуль после touch"""
+    from dev_reload_utilites.auto_reload_manager import auto_reload_module
+
+    path = module_dir.write('fp_mod.py', "X = 1\n")
+    try:
+        module = importlib.import_module('fp_mod')
+        get_fingerprint_store().mark_modules_clean([module])
+
+        _touch(path, 10)
+        with mock.patch('dev_reload_utilites.auto_reload_manager.execute_plan') as execute:
+            auto_reload_module('fp_mod')
+            assert execute.call_count == 0
+            auto_reload_module('fp_mod', force=True)
+            assert execute.call_count == 1
+    finally:
+        get_fingerprint_store().forget(os.path.abspath(path))
+
+
+def test_index_refresh_records_baseline_of_loaded_modules(module_dir, monkeypatch):
+    """Тест: первое обновление индекса записывает отпечаток, и первый touch не вызывает перезагрузку"""
+    from dev_reload_utilites.auto_reload_manager import selective_reload
+    from dev_reload_utilites.import_index import get_index
+
+    path = module_dir.write('fo_kept.py', "X = 1\n")
+    edited = module_dir.write('fo_edited.py', "Y = 1\n")
+    store = get_fingerprint_store()
+    # Отпечаток записывается по байт-коду модуля, как при обычном импорте в mebel.exe
+    monkeypatch.setattr(sys, 'dont_write_bytecode', False)
+    try:
+        importlib.import_module('fo_kept')
+        importlib.import_module('fo_edited')
+        # Файл изменён после загрузки: он новее байт-кода, отпечаток не записывается
+        _touch(edited, 10)
+        get_index().refresh()
+        assert not store.is_dirty(os.path.abspath(path))
+        assert store.is_dirty(os.path.abspath(edited))
+
+        _touch(path, 20)
+        assert selective_reload('fo_kept', order='graph').skipped
+    finally:
+        store.forget(os.path.abspath(path))
+        store.forget(os.path.abspath(edited))
@@ -0,0 +1,65 @@
+import sys
+import os
+import subprocess
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Предельное время импорта механизма перезагрузки, миллисекунды (-X importtime)
+IMPORT_BUDGET_MS = 500
+
+PROBE = """
+import sys
+import dev_reload_utilites.auto_reload_manager as manager
+print(','.join(name for name in ('k3', 'loguru', 'dev_reload_utilites.dialogs') if name in sys.modules))
+print('defModuleName' in vars(manager))
+print(','.join(name for name in ('concurrent.futures', 'ctypes', 'select') if name in sys.modules))
+"""
+
+
+def _run(*args):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True, check=True)
+
+
+def test_reload_engine_import_is_lazy():
+    """Тест: импорт механизма перезагрузки не загружает k3, loguru, диалоги, сохранённое имя модуля,
+    concurrent.futures и модули потока отслеживания (ctypes, select)"""
+    lines = _run('-c', PROBE).stdout.splitlines()
+    assert lines == ['', 'False', '']
+
+
+def test_reload_engine_import_budget():
+    """Тест: суммарное время импорта механизма перезагрузки укладывается в бюджет"""
+    stderr = _run('-X', 'importtime', '-c', 'import dev_reload_utilites.auto_reload_manager').stderr
+    cumulative = {}
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, total, name = line.split('|')
+            if total.strip().isdigit():
+                cumulative[name.strip()] = int(total) / 1000.0
+    total_ms = cumulative['dev_reload_utilites'] + cumulative['dev_reload_utilites.auto_reload_manager']
+    assert total_ms < IMPORT_BUDGET_MS, f"импорт занял {total_ms:.0f} мс"
+
+
+def test_dialogs_load_on_first_access():
+    """Тест: классы диалогов и defModuleName доступны через ленивые атрибуты"""
+    import dev_reload_utilites
+    from dev_reload_utilites import auto_reload_manager, dialogs
+
+    assert dev_reload_utilites.SetVar is dialogs.SetVar
+    assert auto_reload_manager.WString is dialogs.WString
+    assert auto_reload_manager.defModuleName == auto_reload_manager.defModuleData[0]
+
+
+def test_find_recent_py_files_is_not_shadowed_by_submodule():
+    """Тест: функция find_recent_py_files пакета не заменяется одноимённым модулем"""
+    probe = ("from dev_reload_utilites import get_import_names\n"
+             "import dev_reload_utilites.auto_reload_manager\n"
+             "from dev_reload_utilites import find_recent_py_files\n"
+             "print(callable(find_recent_py_files))\n")
+    assert _run('-c', probe).stdout.split() == ['True']
@@ -0,0 +1,57 @@
+import sys
+import os
+import pytest
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.import_index import ImportIndex
+
+
+@pytest.fixture
+def tree(module_dir):
+    """Временное дерево из трёх модулей: base <- mid <- top"""
+    files = {
+        'base': module_dir.write('base.py', "X = 1\n"),
+        'mid': module_dir.write('mid.py', "import os, base\n"),
+        'top': module_dir.write('top.py', "from mid import something\n"),
+    }
+    return module_dir, files
+
+
+def test_dependents(tree):
+    """Тест поиска импортёров через обратный индекс"""
+    module_dir, files = tree
+    index = ImportIndex(module_dir.join('.import_index'))
+    index.refresh(files.items())
+
+    assert index.dependents('base') == ['mid']
+    assert index.dependents('mid') == ['top']
+    assert index.dependents('top') == []
+
+
+def test_warm_refresh_reads_nothing(tree):
+    """Тест повторного обновления без изменений файлов"""
+    module_dir, files = tree
+    index = ImportIndex(module_dir.join('.import_index'))
+    assert index.refresh(files.items()) == 3
+    assert index.refresh(files.items()) == 0
+
+    module_dir.write('top.py', "import base\n# changed\n")
+    assert index.refresh(files.items()) == 1
+    assert index.dependents('base') == ['mid', 'top']
+    assert index.dependents('mid') == []
+
+
+def test_save_and_load(tree):
+    """Тест сохранения индекса на диск и загрузки в новом сеансе"""
+    module_dir, files = tree
+    index_file = module_dir.join('.import_index')
+    index = ImportIndex(index_file)
+    index.refresh(files.items())
+    index.save()
+
+    restored = ImportIndex(index_file)
+    assert restored.load()
+    assert restored.refresh(files.items()) == 0
+    assert restored.dependents('base') == ['mid']
@@ -0,0 +1,73 @@
+import sys
+import os
+import tempfile
+import pytest
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites import import_parser
+from dev_reload_utilites.import_parser import extract_imports, parse_imports
+
+
+@pytest.fixture
+def source_file():
+    """Фабрика временных .py файлов"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        def make(text, name='mod.py', encoding='utf-8'):
+            path = os.path.join(temp_dir, name)
+            with open(path, 'w', encoding=encoding) as f:
+                f.write(text)
+            return path
+        yield make
+
+
+def test_no_false_positives(source_file):
+    """Тест: комментарии, строки и похожие имена не дают рёбер"""
+    path = source_file(
+        "import foo_bar\n"
+        "# import foo\n"
+        "s = 'from foo import x'\n"
+    )
+    assert extract_imports(path) == ('foo_bar',)
+
+
+def test_all_import_forms(source_file):
+    """Тест: список импортов, from-импорт и импорт внутри функции"""
+    path = source_file(
+        "import a, foo\n"
+        "from x import y\n"
+        "def f():\n"
+        "    import inner.mod\n"
+    )
+    assert extract_imports(path) == ('a', 'foo', 'inner.mod', 'x', 'x.y')
+
+
+def test_relative_imports(source_file):
+    """Тест разрешения относительных импортов"""
+    path = source_file(
+        "from . import sibling\n"
+        "from ..up import thing\n"
+    )
+    assert extract_imports(path, package='pkg.sub') == (
+        'pkg.sub', 'pkg.sub.sibling', 'pkg.up', 'pkg.up.thing')
+    # Выход за пределы пакета верхнего уровня игнорируется
+    assert extract_imports(path, package='') == ()
+
+
+def test_cp1251_source(source_file):
+    """Тест файла в cp1251 без объявления кодировки"""
+    path = source_file("s = 'Привет'\nimport foo\n", encoding='cp1251')
+    assert extract_imports(path) == ('foo',)
+
+
+def test_parse_cache(source_file, monkeypatch):
+    """Тест: неизменённый файл повторно не разбирается"""
+    path = source_file("import foo\n")
+    parse_imports(path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('файл разобран повторно')
+
+    monkeypatch.setattr(import_parser, '_parse_source', fail)
+    assert parse_imports(path)[0].module == 'foo'
@@ -0,0 +1,63 @@
+import sys
+import os
+import tempfile
+import time
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.journal import ReloadJournal
+from dev_reload_utilites.profiler import ModuleTiming, ReloadReport
+
+
+def _report(strategy, timings, started=None):
+    report = ReloadReport(strategy, timings[0][0], started or time.time())
+    report.modules = [ModuleTiming(*timing) for timing in timings]
+    report.total_seconds = sum(timing[1] for timing in timings)
+    return report
+
+
+def test_append_and_query():
+    """Тест: записи журнала и запросы по медленным и частым модулям"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        journal = ReloadJournal(os.path.join(temp_dir, '.reload_journal'))
+        journal.append(_report('auto_reload_module', [('slow', 0.5, None), ('fast', 0.01, None)]))
+        journal.append(_report('selective_reload', [('fast', 0.03, None), ('broken', 0.1, 'boom')]))
+        journal.append(_report('auto_reload_module', [('old', 9.0, None)], started=time.time() - 30 * 86400))
+
+        entries = list(journal.iter_entries())
+        assert [entry.outcome for entry in entries] == ['ok', 'error', 'ok']
+        assert journal.most_reloaded(2, days=7) == [('fast', 2), ('slow', 1)]
+        top = journal.top_slow_modules(2, days=7)
+        assert [name for name, _, _ in top] == ['slow', 'fast']
+        assert abs(top[1][1] - 0.02) < 1e-9 and top[1][2] == 2
+        assert journal.top_slow_modules(1)[0][0] == 'old'
+
+
+def test_rotation_keeps_backups():
+    """Тест: при превышении размера файл ротируется, хранится не больше backups копий"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, '.reload_journal')
+        journal = ReloadJournal(path, max_bytes=300, backups=2)
+        for i in range(20):
+            journal.append(_report('auto_reload_module', [(f'module_{i}', 0.01, None)]))
+        assert os.path.exists(path + '.1') and os.path.exists(path + '.2')
+        assert not os.path.exists(path + '.3')
+        assert os.path.getsize(path) <= 300
+        names = [entry.modules[0][0] for entry in journal.iter_entries()]
+        assert names == sorted(names, key=lambda name: int(name.split('_')[1]))
+        assert names[-1] == 'module_19'
+
+
+def test_profiler_finish_appends_entry():
+    """Тест: завершение профилировщика дописывает отчёт в журнал сеанса"""
+    from dev_reload_utilites.journal import get_journal
+    from dev_reload_utilites.profiler import ReloadProfiler
+
+    profiler = ReloadProfiler('auto_reload_module', 'json')
+    profiler.skip()
+    profiler.finish()
+    entries = list(get_journal().iter_entries())
+    assert len(entries) == 1
+    assert entries[0].strategy == 'auto_reload_module' and entries[0].target == 'json'
+    assert entries[0].outcome == 'skipped'
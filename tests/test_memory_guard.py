@@ -0,0 +1,75 @@
+import sys
+import os
+import importlib
+import tracemalloc
+import pytest
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites import memory_guard
+from dev_reload_utilites.auto_reload_manager import auto_reload_module
+from dev_reload_utilites.memory_guard import MemoryGuard, configure_memory_guard
+
+
+@pytest.fixture
+def cached_module(module_dir, monkeypatch):
+    """Временный модуль mg_cached с функцией и методом под lru_cache"""
+    module_dir.write('mg_cached.py',
+                     "import functools\n\n"
+                     "@functools.lru_cache(maxsize=None)\n"
+                     "def square(x):\n    return [x] * 1000\n\n"
+                     "class Table:\n"
+                     "    @staticmethod\n"
+                     "    @functools.lru_cache(maxsize=None)\n"
+                     "    def row(x):\n        return (x,)\n")
+    monkeypatch.setattr(memory_guard, '_guard', None)
+    return importlib.import_module('mg_cached')
+
+
+def test_reload_clears_old_caches_and_reports_memory(cached_module):
+    """Тест: кэши lru_cache старых функций очищаются, отчёт содержит замер памяти"""
+    configure_memory_guard(collect=True, clear_caches=True)
+    old_square, old_row = cached_module.square, cached_module.Table.row
+    for i in range(50):
+        old_square(i)
+    old_row(1)
+
+    report = auto_reload_module('mg_cached', force=True)
+    assert old_square.cache_info().currsize == 0 and old_row.cache_info().currsize == 0
+    assert report.memory is not None and report.memory.caches_cleared == 2
+    assert report.memory.traced_before is None
+    assert 'память:' in report.summary()
+
+
+def test_per_module_growth_with_tracemalloc(cached_module):
+    """Тест: при включённом tracemalloc замеряется прирост памяти по модулям"""
+    guard = configure_memory_guard(trace=True)
+    was_tracing = tracemalloc.is_tracing()
+    try:
+        auto_reload_module('mg_cached', force=True)
+        report = auto_reload_module('mg_cached', force=True)
+        assert 'mg_cached' in report.memory_growth
+        assert report.memory.traced_after is not None
+        objects, traced = guard.session_growth()
+        assert traced is not None
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def test_guard_is_disabled_by_default(cached_module):
+    """Тест: без настройки контроль памяти выключен, configure_memory_guard его включает"""
+    assert not memory_guard.get_memory_guard().enabled
+    report = auto_reload_module('mg_cached', force=True)
+    assert report.memory is None
+    # Явная настройка включает контроль памяти
+    assert configure_memory_guard(collect=True).enabled
+
+
+def test_disabled_guard_measures_nothing():
+    """Тест: выключенный контроль памяти не выполняет замеров"""
+    guard = MemoryGuard(enabled=False)
+    with guard.batch([]) as context:
+        assert context is None
+    assert guard.session_growth() == (0, None)
@@ -0,0 +1,88 @@
+import sys
+import os
+import importlib
+import pytest
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.module_graph import ModuleGraph
+
+
+@pytest.fixture
+def package(module_dir):
+    """Временный пакет: mg_pkg -> a -> b, mg_pkg -> b, b -> mg_pkg (цикл)"""
+    module_dir.write(os.path.join('mg_pkg', '__init__.py'), "from . import b\nfrom . import a\n")
+    module_dir.write(os.path.join('mg_pkg', 'a.py'), "from . import b\nfrom .b import value\n")
+    module_dir.write(os.path.join('mg_pkg', 'b.py'), "import mg_pkg\nvalue = 1\n")
+    return importlib.import_module('mg_pkg')
+
+
+def _depths(node_depth_dict):
+    return {os.path.basename(fn): d for fn, d in node_depth_dict.items()}
+
+
+def test_package_depths(package):
+    """Тест: глубина - самый длинный путь, цикл не зацикливает обход"""
+    graph = ModuleGraph()
+    node_pkg_dict, node_depth_dict = graph.package_dependencies(package)
+
+    assert _depths(node_depth_dict) == {'__init__.py': 0, 'a.py': 1, 'b.py': 2}
+    assert set(m.__name__ for m in node_pkg_dict.values()) == {'mg_pkg', 'mg_pkg.a', 'mg_pkg.b'}
+
+
+def test_traversal_is_cached(package, monkeypatch):
+    """Тест: повторный вызов не обходит пространства имён заново"""
+    graph = ModuleGraph()
+    first = graph.package_dependencies(package)
+
+    def fail(module):
+        raise AssertionError(f'повторный обход {module.__name__}')
+
+    monkeypatch.setattr(graph, '_walk', fail)
+    assert graph.package_dependencies(package) is first
+
+
+def test_invalidate_rewalks_only_node(package, monkeypatch):
+    """Тест: после сброса узла обходится только он"""
+    graph = ModuleGraph()
+    graph.package_dependencies(package)
+    graph.invalidate('mg_pkg.a')
+
+    walked = []
+    original = graph._walk
+
+    def spy(module):
+        walked.append(module.__name__)
+        return original(module)
+
+    monkeypatch.setattr(graph, '_walk', spy)
+    _, node_depth_dict = graph.package_dependencies(package)
+    assert walked == ['mg_pkg.a']
+    assert _depths(node_depth_dict)['b.py'] == 2
+
+
+def test_reload_functions_invalidate_shared_graph(module_dir, monkeypatch):
+    """Тест: после auto_reload_module и selective_reload граф видит новые импорты"""
+    from dev_reload_utilites import module_graph
+    from dev_reload_utilites.auto_reload_manager import (
+        auto_reload_module,
+        reload_module_with_dependencies,
+        selective_reload,
+    )
+    monkeypatch.setattr(module_graph, '_graph', None)
+    module_dir.write(os.path.join('gr_pkg', '__init__.py'), "from . import a\n")
+    module_dir.write(os.path.join('gr_pkg', 'a.py'), "X = 1\n")
+    module_dir.write(os.path.join('gr_pkg', 'c.py'), "Y = 2\n")
+    module_dir.write(os.path.join('gr_pkg', 'd.py'), "Z = 3\n")
+    importlib.import_module('gr_pkg')
+    # Оценка (как в диалоге) заполняет граф, ничего не перезагружая
+    assert reload_module_with_dependencies('gr_pkg', force=True, dry_run=True).modules == ('gr_pkg.a', 'gr_pkg')
+
+    module_dir.write(os.path.join('gr_pkg', 'a.py'), "from . import c\nX = 1\n")
+    auto_reload_module('gr_pkg.a', force=True)
+    assert 'gr_pkg.c' in reload_module_with_dependencies('gr_pkg', force=True, dry_run=True).modules
+
+    module_dir.write(os.path.join('gr_pkg', 'a.py'), "from . import c, d\nX = 1\n")
+    selective_reload('gr_pkg.a', force=True)
+    assert 'gr_pkg.d' in reload_module_with_dependencies('gr_pkg', force=True, dry_run=True).modules
@@ -0,0 +1,58 @@
+import sys
+import os
+import importlib
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.auto_reload_manager import auto_reload_module
+from dev_reload_utilites.patcher import ReferencePatcher, register_instance
+
+
+def test_patch_functions_and_instances(module_dir):
+    """Тест: старые функции выполняют новый код, экземпляры получают новый класс"""
+    module_dir.write('pt_mod.py',
+                     "def handler():\n    return 1\n\n"
+                     "class Dialog:\n    def value(self):\n        return 1\n")
+    module = importlib.import_module('pt_mod')
+    callback = module.handler
+    dialog = module.Dialog()
+    bound = dialog.value
+    old_class = module.Dialog
+
+    module_dir.write('pt_mod.py',
+                     "def handler():\n    return 2\n\n"
+                     "class Dialog:\n    def value(self):\n        return 2\n")
+    # Экземпляр хранится только в локальной переменной - его находит лишь обход сборщика мусора
+    patcher = ReferencePatcher([module], scan='gc')
+    importlib.reload(module)
+    stats = patcher.apply()
+
+    assert callback() == 2
+    assert bound() == 2
+    assert type(dialog) is module.Dialog and type(dialog) is not old_class
+    assert stats.instances == 1 and stats.failures == 0
+
+
+def test_registry_scan_and_entry_point(module_dir):
+    """Тест: поиск по реестру, по модулям (по умолчанию) и включение прохода через auto_reload_module"""
+    module_dir.write('pt_mod.py', "class Item:\n    pass\n")
+    module_dir.write('pt_holder.py', "import pt_mod\n\nITEM = pt_mod.Item()\n\n"
+                                     "class Holder:\n    item = pt_mod.Item()\n")
+    module = importlib.import_module('pt_mod')
+    holder = importlib.import_module('pt_holder')
+    registered = register_instance(module.Item())
+    unregistered = module.Item()
+
+    patcher = ReferencePatcher([module], scan='registry')
+    importlib.reload(module)
+    patcher.apply()
+    assert type(registered) is module.Item
+    assert type(unregistered) is not module.Item
+    assert type(holder.ITEM) is not module.Item
+
+    # По умолчанию просматриваются пространства имён модулей и атрибуты классов, но не весь gc
+    auto_reload_module('pt_mod', force=True, patch_references=True)
+    assert type(registered) is module.Item
+    assert type(holder.ITEM) is module.Item and type(holder.Holder.item) is module.Item
+    assert type(unregistered) is not module.Item
@@ -0,0 +1,49 @@
+import sys
+import os
+import importlib
+import pytest
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.auto_reload_manager import selective_reload
+from dev_reload_utilites.profiler import ReloadProfiler, last_reload_time, last_report
+
+
+@pytest.fixture
+def modules(module_dir):
+    """Временные модули prof_ok и prof_bad (второй падает при перезагрузке)"""
+    module_dir.write('prof_ok.py', "X = 1\n")
+    module_dir.write('prof_bad.py', "X = 1\n")
+    importlib.import_module('prof_ok')
+    importlib.import_module('prof_bad')
+    return module_dir
+
+
+def test_profiler_records_timings_and_failures(modules):
+    """Тест: отчёт содержит время, ошибки и время поиска зависимостей"""
+    profiler = ReloadProfiler('test', 'prof')
+    with profiler.discovery():
+        pass
+    profiler.reload(sys.modules['prof_ok'])
+
+    modules.write('prof_bad.py', "raise RuntimeError('boom')\n")
+    with pytest.raises(RuntimeError):
+        profiler.reload(sys.modules['prof_bad'])
+    report = profiler.finish()
+
+    assert report.reloaded == ('prof_ok',)
+    assert [timing.name for timing in report.failures] == ['prof_bad']
+    assert 'boom' in report.failures[0].error
+    assert report.total_seconds >= report.reload_seconds + report.discovery_seconds - 1e-6
+    assert last_reload_time('prof_ok') is not None
+    assert last_report() is report
+    assert 'prof_bad' in report.summary()
+
+
+def test_selective_reload_returns_report(modules):
+    """Тест: selective_reload возвращает отчёт"""
+    report = selective_reload('prof_', force=True)
+    assert report.strategy == 'selective_reload'
+    assert sorted(report.reloaded) == ['prof_bad', 'prof_ok']
+    assert not report.skipped
@@ -0,0 +1,155 @@
+import sys
+import os
+import importlib
+import types
+import pytest
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.import_index import ImportIndex
+from dev_reload_utilites.reload_planner import (
+    dependency_closure,
+    execute_plan,
+    plan_reload,
+    strongly_connected_components,
+)
+
+
+@pytest.fixture
+def make_tree(module_dir):
+    """Фабрика временных деревьев модулей с уникальным префиксом имён"""
+    def make(sources):
+        files = {name: module_dir.write(name + '.py', text) for name, text in sources.items()}
+        index = ImportIndex(module_dir.join('.import_index'))
+        index.refresh(files.items())
+        return files, index
+    return make
+
+
+def test_transitive_closure(make_tree):
+    """Тест: в замыкание попадают и косвенные импортёры"""
+    _, index = make_tree({
+        'p_base': "X = 1\n",
+        'p_mid': "import p_base\n",
+        'p_top': "import p_mid\n",
+        'p_other': "import os\n",
+    })
+    assert dependency_closure('p_base', index) == {'p_base', 'p_mid', 'p_top'}
+
+
+def test_topological_order_with_cycle(make_tree):
+    """Тест: поставщики раньше потребителей, цикл - один шаг"""
+    _, index = make_tree({
+        'c_base': "X = 1\n",
+        'c_a': "import c_base\nimport c_b\n",
+        'c_b': "import c_a\n",
+        'c_top': "import c_b\nimport c_base\n",
+    })
+    plan = plan_reload('c_base', index)
+    assert plan.groups == (('c_base',), ('c_a', 'c_b'), ('c_top',))
+    assert plan.cycles == (('c_a', 'c_b'),)
+    assert len(plan) == 4
+
+
+def test_scc_order():
+    """Тест: компоненты возвращаются после всех достижимых из них"""
+    edges = {'a': ['b'], 'b': ['c'], 'c': ['b'], 'd': []}
+    assert strongly_connected_components(['a', 'b', 'c', 'd'], edges) == [
+        ('b', 'c'), ('a',), ('d',)]
+
+
+def test_execute_plan_updates_grand_dependents(make_tree, module_dir):
+    """Тест: после выполнения плана косвенный импортёр видит новое значение"""
+    files, index = make_tree({
+        'g_base': "X = 1\n",
+        'g_mid': "import g_base\nY = g_base.X\n",
+        'g_top': "import g_mid\nZ = g_mid.Y\n",
+    })
+    top = importlib.import_module('g_top')
+    assert top.Z == 1
+
+    module_dir.write('g_base.py', "X = 200\n")
+    index.refresh(files.items())
+    reloaded = execute_plan(plan_reload('g_base', index))
+
+    assert reloaded == ['g_base', 'g_mid', 'g_top']
+    assert top.Z == 200
+
+
+def test_selective_reload_graph_order(module_dir):
+    """Тест: selective_reload перезагружает поставщика раньше потребителя и пропускает неизменённые модули"""
+    from dev_reload_utilites.auto_reload_manager import selective_reload
+    module_dir.write('sg_a.py', "import sg_z\nX = sg_z.X\n")
+    module_dir.write('sg_m.py', "Y = 1\n")
+    module_dir.write('sg_z.py', "X = 1\n")
+    importlib.import_module('sg_a')
+    importlib.import_module('sg_m')
+    report = selective_reload('sg_', force=True, order='graph')
+    assert sorted(report.reloaded) == ['sg_a', 'sg_m', 'sg_z']
+    assert report.reloaded.index('sg_z') < report.reloaded.index('sg_a')
+
+    module_dir.write('sg_z.py', "X = 22\n")
+    report = selective_reload('sg_', order='graph')
+    assert report.reloaded == ('sg_z', 'sg_a')
+    assert sys.modules['sg_a'].X == 22
+
+    assert selective_reload('sg_', order='graph').skipped
+    # По умолчанию - все модули набора в алфавитном порядке
+    report = selective_reload('sg_', force=True)
+    assert report.reloaded == ('sg_a', 'sg_m', 'sg_z')
+
+
+def test_dry_run_estimates(module_dir):
+    """Тест: dry_run возвращает план с оценкой времени и ничего не перезагружает"""
+    from dev_reload_utilites.auto_reload_manager import auto_reload_module, estimate_strategies
+    module_dir.write('dr_base.py', "X = 1\n")
+    module_dir.write('dr_user.py', "import dr_base\n")
+    importlib.import_module('dr_user')
+    base = sys.modules['dr_base']
+    estimate = auto_reload_module('dr_base', force=True, dry_run=True)
+    assert estimate.modules == ('dr_base', 'dr_user')
+    assert estimate.unmeasured == ('dr_base', 'dr_user')
+    assert sys.modules['dr_base'] is base
+
+    auto_reload_module('dr_base', force=True)
+    estimate = auto_reload_module('dr_base', force=True, dry_run=True)
+    assert not estimate.unmeasured and estimate.estimated_seconds > 0
+    assert 'dr_user' in estimate.summary()
+
+    estimates = estimate_strategies('dr_base')
+    assert [e.strategy for e in estimates] == [
+        'auto_reload_module', 'reload_module_with_dependencies', 'selective_reload']
+    assert all(e.skipped for e in estimates)
+
+
+def test_package_reexport_does_not_link_consumers(module_dir):
+    """Тест: изменение подмодуля, реэкспортируемого пакетом, не затрагивает потребителей других подмодулей"""
+    files = {
+        'rx_pkg': module_dir.write(os.path.join('rx_pkg', '__init__.py'), "from . import a, b\n"),
+        'rx_pkg.a': module_dir.write(os.path.join('rx_pkg', 'a.py'), "X = 1\n"),
+        'rx_pkg.b': module_dir.write(os.path.join('rx_pkg', 'b.py'), "Y = 2\n"),
+        'rx_c': module_dir.write('rx_c.py', "from rx_pkg.b import Y\n"),
+        'rx_d': module_dir.write('rx_d.py', "import rx_pkg.b\n"),
+    }
+    index = ImportIndex(module_dir.join('.import_index'))
+    index.refresh(files.items())
+
+    assert plan_reload('rx_pkg.a', index).groups == (('rx_pkg.a',), ('rx_pkg',))
+    assert dependency_closure('rx_pkg.b', index) == {'rx_pkg.b', 'rx_pkg', 'rx_c', 'rx_d'}
+
+
+def test_main_script_is_not_planned(module_dir, monkeypatch):
+    """Тест: скрипт, запущенный как __main__, не попадает в план, хотя импортирует модуль"""
+    from dev_reload_utilites.auto_reload_manager import auto_reload_module
+    module_dir.write('ms_tgt.py', "X = 1\n")
+    script = module_dir.write('ms_script.py', "import ms_tgt\n")
+    main = types.ModuleType('__main__')
+    main.__file__ = script
+    main.__spec__ = None
+    monkeypatch.setitem(sys.modules, '__main__', main)
+    exec(compile("import ms_tgt\n", script, 'exec'), main.__dict__)
+
+    assert plan_reload('ms_tgt').modules == ('ms_tgt',)
+    report = auto_reload_module('ms_tgt', force=True, transactional=True)
+    assert report.reloaded == ('ms_tgt',)
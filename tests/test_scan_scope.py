@@ -0,0 +1,41 @@
+import sys
+import os
+import json
+import tempfile
+import types
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.import_index import iter_loaded_modules
+from dev_reload_utilites.scan_scope import COMPILED, PROTO, SITE, STDLIB, USER, ScanScope
+
+
+def test_classify_modules():
+    """Тест: стандартная библиотека, site-packages, скомпилированные модули и Proto"""
+    import pytest
+    with tempfile.TemporaryDirectory() as proto_dir:
+        scope = ScanScope(proto_dir=proto_dir)
+        assert scope.classify(json) == STDLIB
+        assert scope.classify(pytest) == SITE
+        assert scope.classify(sys) == COMPILED
+        assert scope.classify_path(os.path.join(proto_dir, 'pkg', 'mod.py')) == PROTO
+        assert scope.classify(types.ModuleType('no_file')) == COMPILED
+        assert scope.is_included_path(os.path.join(proto_dir, 'mod.py'))
+        assert not scope.is_included(json)
+
+
+def test_user_code_outside_proto():
+    """Тест: код вне Proto и библиотек относится к USER и может быть исключён"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'script.py')
+        assert ScanScope(proto_dir=os.path.join(temp_dir, 'Proto')).classify_path(path) == USER
+        only_proto = ScanScope(proto_dir=os.path.join(temp_dir, 'Proto'), include=(PROTO,))
+        assert not only_proto.is_included_path(path)
+
+
+def test_iter_loaded_modules_skips_libraries():
+    """Тест: индекс импортов не просматривает стандартную библиотеку"""
+    names = {name for name, _ in iter_loaded_modules()}
+    assert 'json' not in names and 'os' not in names
+    assert 'dev_reload_utilites.import_index' in names
@@ -0,0 +1,68 @@
+import sys
+import os
+import importlib
+import pytest
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.scheduler import ReloadScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def package(module_dir):
+    """Временные модули sch_base, sch_u1, sch_u2 (оба импортируют sch_base)"""
+    module_dir.write('sch_base.py', "X = 1\n")
+    module_dir.write('sch_u1.py', "import sch_base\n")
+    module_dir.write('sch_u2.py', "import sch_base\n")
+    for name in ('sch_u1', 'sch_u2'):
+        importlib.import_module(name)
+    return module_dir
+
+
+def test_quiet_window_and_max_delay():
+    """Тест: пачка готова после quiet секунд тишины, но не позже max_delay от первого события"""
+    clock = FakeClock()
+    scheduler = ReloadScheduler(quiet=0.3, max_delay=1.0, clock=clock)
+    assert scheduler.due_in() is None and scheduler.run_pending() is None
+
+    scheduler.notify(['a'])
+    clock.now = 0.1
+    scheduler.notify(['b', 'a'])
+    clock.now = 0.2
+    assert abs(scheduler.due_in() - 0.2) < 1e-9
+    assert scheduler.run_pending() is None
+    assert scheduler.pending() == ('a', 'b')
+
+    # События непрерывно продлевают тишину, но max_delay ограничивает ожидание
+    while clock.now < 1.0:
+        clock.now += 0.2
+        scheduler.notify(['c'])
+    assert scheduler.due_in() == 0
+
+
+def test_burst_reloads_each_module_once(package):
+    """Тест: пачка событий перезагружается одним планом, считаются сэкономленные перезагрузки"""
+    clock = FakeClock()
+    scheduler = ReloadScheduler(quiet=0.3, clock=clock)
+    scheduler.notify(['sch_base'])
+    scheduler.notify(['sch_u1'])
+    scheduler.notify(['sch_base', 'sch_u2'])
+    clock.now = 0.5
+
+    report = scheduler.run_pending()
+    names = [timing.name for timing in report.modules]
+    assert sorted(names) == ['sch_base', 'sch_u1', 'sch_u2']
+    assert names[0] == 'sch_base'
+    stats = scheduler.stats()
+    assert (stats.events, stats.batches, stats.reloads) == (3, 1, 3)
+    assert stats.naive_reloads == 7 and stats.saved == 4
+    assert scheduler.pending() == ()
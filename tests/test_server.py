@@ -0,0 +1,111 @@
+import sys
+import os
+import importlib
+import threading
+import pytest
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.server import ReloadClient, ReloadServer
+
+
+@pytest.fixture
+def server():
+    """Сервер на свободном порту"""
+    server = ReloadServer(port=0, request_timeout=5).start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+@pytest.fixture
+def target(module_dir):
+    """Временный модуль ipc_target, запоминающий поток, в котором выполнено его тело"""
+    module_dir.write('ipc_target.py',
+                     "import threading\nTHREAD = threading.current_thread().name\nVERSION = 1\n")
+    importlib.import_module('ipc_target')
+    return module_dir
+
+
+def _in_thread(func, *args, **kwargs):
+    result = {}
+
+    def target():
+        try:
+            result['value'] = func(*args, **kwargs)
+        except Exception as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread, result
+
+
+def test_status_answers_without_main_thread(server):
+    """Тест: status отвечает сразу, неизвестная команда возвращает ошибку"""
+    client = ReloadClient(port=server.port, timeout=5)
+    status = client.status()
+    assert status['pending'] == 0 and status['served'] == 0
+    with pytest.raises(RuntimeError):
+        client.request('shutdown')
+
+
+def test_reload_runs_in_process_pending_thread(server, target):
+    """Тест: reload и plan из клиента выполняются в потоке, вызвавшем process_pending"""
+    target.write('ipc_target.py',
+                 "import threading\nTHREAD = threading.current_thread().name\nVERSION = 2\n")
+    client = ReloadClient(port=server.port, timeout=5)
+
+    thread, result = _in_thread(client.plan, 'ipc_target', force=True)
+    assert server.process_pending(timeout=5) == 1
+    thread.join(5)
+    assert result['value']['modules'] == ['ipc_target']
+    assert sys.modules['ipc_target'].VERSION == 1
+
+    thread, result = _in_thread(client.reload, 'ipc_target', force=True)
+    worker = threading.current_thread().name
+    assert server.process_pending(timeout=5) == 1
+    thread.join(5)
+    assert result['value']['ok'] and result['value']['modules'] == ['ipc_target']
+    module = sys.modules['ipc_target']
+    assert module.VERSION == 2 and module.THREAD == worker
+    assert client.status()['served'] == 2
+
+
+def test_unprocessed_request_times_out(target):
+    """Тест: команда, которую главный поток не выполнил вовремя, отменяется"""
+    server = ReloadServer(port=0, request_timeout=0.1).start()
+    try:
+        with pytest.raises(RuntimeError):
+            ReloadClient(port=server.port, timeout=5).reload('ipc_target')
+        assert server.process_pending() == 0
+        assert sys.modules['ipc_target'].VERSION == 1
+    finally:
+        server.stop()
+
+
+def test_cli_send_status(server, capsys):
+    """Тест: команда send командной строки получает состояние сервера"""
+    from dev_reload_utilites.cli import main
+
+    assert main(['send', 'status', '--port', str(server.port), '--json']) == 0
+    assert '"pending": 0' in capsys.readouterr().out
+    assert main(['send', 'reload', '--port', str(server.port)]) == 2
+
+
+def test_notify_schedules_reload(server, target):
+    """Тест: notify ставит модули в пачку планировщика, process_pending перезагружает готовую пачку"""
+    from dev_reload_utilites import scheduler
+
+    scheduler._scheduler = scheduler.ReloadScheduler(quiet=0)
+    try:
+        client = ReloadClient(port=server.port, timeout=5)
+        assert client.notify(['ipc_target'])['scheduled'] == ['ipc_target']
+        assert client.status()['scheduled'] == ['ipc_target']
+        server.process_pending()
+        assert client.status()['scheduler']['batches'] == 1
+        assert client.status()['scheduled'] == []
+    finally:
+        scheduler._scheduler = None
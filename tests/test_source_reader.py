@@ -0,0 +1,34 @@
+import sys
+import os
+import tempfile
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites import source_reader
+from dev_reload_utilites.source_reader import decode_source, detect_encoding, may_import, read_source
+
+
+def test_detect_encoding():
+    """Тест: объявление кодировки, BOM и cp1251 без объявления"""
+    text = 'X = "Привет"\n'
+    assert detect_encoding(text.encode('utf-8')) == ('utf-8', False)
+    assert detect_encoding(b'\xef\xbb\xbf' + text.encode('utf-8')) == ('utf-8-sig', False)
+    declared = ('# -*- coding: cp1251 -*-\n' + text).encode('cp1251')
+    assert detect_encoding(declared) == ('cp1251', False)
+    assert detect_encoding(text.encode('cp1251')) == ('cp1251', True)
+
+
+def test_read_source_caches_encoding():
+    """Тест: кодировка запоминается по mtime и размеру файла"""
+    source_reader.clear_cache()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'legacy.py')
+        with open(path, 'wb') as f:
+            f.write('import os  # Комментарий\n'.encode('cp1251'))
+        source = read_source(path)
+        assert source.encoding == 'cp1251' and source.fallback
+        assert decode_source(source) == 'import os  # Комментарий\n'
+        assert source_reader.cached_encoding(path) == 'cp1251'
+        assert may_import(source.data)
+        assert not may_import(b'X = 1\n')
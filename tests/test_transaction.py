@@ -0,0 +1,46 @@
+import sys
+import os
+import importlib
+import pytest
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.auto_reload_manager import auto_reload_module, selective_reload
+from dev_reload_utilites.fingerprint import get_fingerprint_store
+from dev_reload_utilites.profiler import last_report
+from dev_reload_utilites.transaction import ReloadTransaction
+
+
+@pytest.fixture
+def package(module_dir):
+    """Временные модули tr_base и tr_user (tr_user импортирует tr_base)"""
+    module_dir.write('tr_base.py', "X = 1\n")
+    module_dir.write('tr_user.py', "from tr_base import X\nY = X\n")
+    importlib.import_module('tr_user')
+    return module_dir
+
+
+def test_failure_rolls_back_all_modules(package):
+    """Тест: ошибка в теле зависимого модуля восстанавливает и уже перезагруженный поставщик"""
+    package.write('tr_base.py', "X = 2\nZ = 3\n")
+    package.write('tr_user.py', "from tr_base import X\nY = X\nraise RuntimeError('boom')\n")
+    with pytest.raises(RuntimeError):
+        auto_reload_module('tr_base', force=True, transactional=True)
+    base, user = sys.modules['tr_base'], sys.modules['tr_user']
+    assert base.X == 1 and not hasattr(base, 'Z')
+    assert user.Y == 1
+    # Восстановленные модули снова считаются изменёнными
+    assert get_fingerprint_store().is_module_dirty(base)
+
+    with pytest.raises(RuntimeError):
+        selective_reload('tr_', force=True, transactional=True)
+    assert sys.modules['tr_base'].X == 1
+    assert last_report().rolled_back
+
+
+def test_commit_discards_snapshots(package):
+    """Тест: при успехе снимки отбрасываются"""
+    with ReloadTransaction([sys.modules['tr_base']]) as transaction:
+        assert len(transaction) == 1
+    assert len(transaction) == 0 and not transaction.rolled_back
@@ -0,0 +1,47 @@
+import sys
+import os
+import importlib
+import pytest
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites import import_parser
+from dev_reload_utilites.auto_reload_manager import auto_reload_module, selective_reload
+from dev_reload_utilites.validation import ReloadValidationError, validate_modules
+
+
+@pytest.fixture
+def package(module_dir):
+    """Временные модули vl_base, vl_mid, vl_top (vl_top импортирует vl_mid, тот - vl_base)"""
+    module_dir.write('vl_base.py', "X = 1\n")
+    module_dir.write('vl_mid.py', "import vl_base\nX = vl_base.X\n")
+    module_dir.write('vl_top.py', "import vl_mid\nX = vl_mid.X\n")
+    importlib.import_module('vl_top')
+    return module_dir
+
+
+def test_syntax_error_rejects_whole_batch(package):
+    """Тест: ошибка в последнем модуле плана отменяет перезагрузку всех модулей"""
+    package.write('vl_base.py', "X = 2\n")
+    package.write('vl_top.py', "import vl_mid\nX = (\n")
+    with pytest.raises(ReloadValidationError) as info:
+        auto_reload_module('vl_base', force=True)
+    assert list(info.value.errors) == ['vl_top']
+    assert 'vl_top.py:2' in str(info.value)
+    assert sys.modules['vl_base'].X == 1
+
+    with pytest.raises(ReloadValidationError):
+        selective_reload('vl_', force=True)
+    assert sys.modules['vl_mid'].X == 1
+
+
+def test_validation_reuses_parse_cache(package, monkeypatch):
+    """Тест: модули, уже разобранные при поиске импортов, повторно не разбираются"""
+    modules = [sys.modules[name] for name in ('vl_mid', 'vl_top')]
+    for module in modules:
+        import_parser.parse_imports(module.__file__)
+    calls = []
+    monkeypatch.setattr(import_parser, '_parse_source', lambda *args: calls.append(args))
+    assert validate_modules(modules) == {}
+    assert calls == []
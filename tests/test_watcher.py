@@ -0,0 +1,74 @@
+import sys
+import os
+import time
+import pytest
+
+# Добавляем путь к пакету
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dev_reload_utilites.watcher import InotifyBackend, ModuleWatcher
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+BACKENDS = ['polling']
+if InotifyBackend.available():
+    BACKENDS.append('inotify')
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_watcher_tracks_changes(backend, module_dir):
+    """Тест: поток замечает изменённые и новые модули"""
+    os.mkdir(module_dir.join('pkg'))
+    old_file = module_dir.write('old.py', "X = 1\n")
+    # Файл изменён давно и не должен считаться изменённым
+    os.utime(old_file, (time.time() - 3600, time.time() - 3600))
+
+    watcher = ModuleWatcher(module_dir.path, interval=0.05, backend=backend)
+    watcher.start()
+    try:
+        assert watcher.wait_ready(5)
+        assert watcher.backend == backend
+        assert watcher.changed_modules() == ()
+
+        module_dir.write(os.path.join('pkg', 'mod.py'), "import old\n")
+        assert _wait_for(lambda: watcher.changed_modules() == ('pkg.mod',))
+        assert watcher.recent_import_names(minutes=30) == ('pkg.mod',)
+        assert _wait_for(lambda: watcher.reload_plan().roots == ('pkg.mod',))
+
+        watcher.mark_reloaded(['pkg.mod'])
+        assert watcher.changed_modules() == ()
+    finally:
+        watcher.stop(5)
+    assert not watcher.is_alive()
+
+
+@pytest.mark.skipif(not InotifyBackend.available(), reason='inotify есть только на Linux')
+def test_inotify_skips_excluded_dirs_and_rescans_on_overflow(module_dir):
+    """Тест: inotify не отслеживает исключённые директории и обходит дерево после переполнения очереди"""
+    module_dir.write(os.path.join('pkg', 'mod.py'), "X = 1\n")
+    module_dir.write(os.path.join('.git', 'hooks', 'hook.py'), "")
+    module_dir.write(os.path.join('venv', 'lib', 'site.py'), "")
+
+    backend = InotifyBackend(module_dir.path)
+    try:
+        files = backend.start()
+        watched = {os.path.relpath(path, module_dir.path) for path in backend._dirs.values()}
+        assert watched == {'.', 'pkg'}
+        assert list(files) == [module_dir.join('pkg', 'mod.py')]
+
+        # События потеряны: новый файл находится повторным обходом дерева
+        new_file = module_dir.write(os.path.join('pkg', 'sub', 'new.py'), "")
+        overflow = InotifyBackend._EVENT.pack(-1, InotifyBackend.IN_Q_OVERFLOW, 0, 0)
+        changes = backend._parse_events(overflow)
+        assert new_file in changes
+        assert module_dir.join('pkg', 'sub') in backend._dirs.values()
+    finally:
+        backend.close()